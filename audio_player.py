@@ -0,0 +1,196 @@
+import asyncio
+import io
+import queue
+import threading
+
+MIXER_FREQUENCY = 24000  # gTTS renders 24 kHz mono mp3
+MIXER_CHANNELS = 1
+MIXER_BUFFER = 512
+
+
+class SpeechHandle:
+    """Result of a non-blocking speak(): wait on it, await it, or cancel it."""
+
+    def __init__(self, data: bytes = b""):
+        self.data = data
+        self.error = None
+        self._started = threading.Event()
+        self._done = threading.Event()
+        self._cancelled = threading.Event()
+
+    @classmethod
+    def finished(cls, error=None):
+        handle = cls()
+        handle.error = error
+        handle._started.set()
+        handle._done.set()
+        return handle
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def wait(self, timeout=None) -> bool:
+        return self._done.wait(timeout)
+
+    def wait_started(self, timeout=None) -> bool:
+        """Block until playback has begun (also released if the handle finishes without playing)."""
+        return self._started.wait(timeout)
+
+    def __await__(self):
+        return asyncio.get_running_loop().run_in_executor(None, self._done.wait).__await__()
+
+
+class StreamHandle(SpeechHandle):
+    """A SpeechHandle whose audio arrives as chunks, fed in order while earlier ones play."""
+
+    def __init__(self):
+        super().__init__()
+        self.underruns = 0           # chunks that arrived after the previous one had finished
+        self._chunks = queue.Queue()
+
+    def feed(self, data: bytes):
+        self._chunks.put(data)
+
+    def end(self):
+        self._chunks.put(None)
+
+    def chunks(self):
+        while not self.cancelled:
+            try:
+                data = self._chunks.get(timeout=0.05)
+            except queue.Empty:
+                continue
+            if data is None:
+                return
+            yield data
+
+
+class PlaybackEngine:
+    """Single long-lived playback thread fed by a queue of in-memory audio buffers."""
+
+    def __init__(self, frequency=MIXER_FREQUENCY, channels=MIXER_CHANNELS, buffer=MIXER_BUFFER):
+        self.frequency = frequency
+        self.channels = channels
+        self.buffer = buffer
+        self._queue = queue.Queue()
+        self._current = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="playback", daemon=True)
+                self._thread.start()
+
+    def play(self, data: bytes) -> SpeechHandle:
+        """Queue an encoded buffer (mp3/ogg/wav) and return immediately."""
+        handle = SpeechHandle(data)
+        self._ensure_started()
+        self._queue.put(handle)
+        return handle
+
+    def play_stream(self) -> StreamHandle:
+        """Queue a chunked stream and return it; feed() chunks in order, then end() it."""
+        handle = StreamHandle()
+        self._ensure_started()
+        self._queue.put(handle)
+        return handle
+
+    @property
+    def busy(self) -> bool:
+        return self._current is not None or not self._queue.empty()
+
+    def stop_all(self):
+        """Cancel everything queued plus whatever is currently playing."""
+        while True:
+            try:
+                handle = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if handle is not None:
+                handle.cancel()
+                handle._started.set()
+                handle._done.set()
+        current = self._current
+        if current is not None:
+            current.cancel()
+
+    def close(self):
+        self.stop_all()
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout=1.0)
+
+    def _run(self):
+        import pygame
+
+        pygame.mixer.init(frequency=self.frequency, channels=self.channels, buffer=self.buffer)
+        try:
+            while True:
+                handle = self._queue.get()
+                if handle is None:
+                    return
+                self._current = handle
+                try:
+                    if not handle.cancelled:
+                        play = self._play_stream if isinstance(handle, StreamHandle) else self._play_one
+                        play(handle)
+                except Exception as e:
+                    handle.error = e
+                    print(f"[TTS error: {e}]")
+                finally:
+                    self._current = None
+                    handle._started.set()
+                    handle._done.set()
+        finally:
+            pygame.mixer.quit()
+
+    def _play_one(self, handle: SpeechHandle):
+        import pygame
+
+        sound = pygame.mixer.Sound(file=io.BytesIO(handle.data))
+        channel = sound.play()
+        handle._started.set()
+        if channel is None:
+            return
+        # Sleep for the known clip length instead of polling; cancel() wakes us early.
+        if handle._cancelled.wait(sound.get_length()):
+            channel.stop()
+            return
+        while channel.get_busy() and not handle._cancelled.wait(0.01):
+            pass
+        channel.stop()
+
+    def _play_stream(self, handle: StreamHandle):
+        import pygame
+
+        channel = None
+        for data in handle.chunks():
+            sound = pygame.mixer.Sound(file=io.BytesIO(data))
+            if channel is None:
+                channel = sound.play()
+                handle._started.set()
+                if channel is None:
+                    return
+                continue
+            # A channel holds one queued sound, which SDL starts the moment the current one
+            # ends; hand the next chunk over as soon as that slot is free.
+            while channel.get_queue() is not None and not handle._cancelled.wait(0.005):
+                pass
+            if handle.cancelled:
+                break
+            if not channel.get_busy():
+                handle.underruns += 1
+            channel.queue(sound)
+        while channel is not None and channel.get_busy() and not handle._cancelled.wait(0.01):
+            pass
+        if channel is not None:
+            channel.stop()
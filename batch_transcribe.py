@@ -0,0 +1,224 @@
+"""Headless batch recognition over archived kiosk recordings.
+
+    python batch_transcribe.py recordings/ -o results.jsonl [--backend whisper|vosk] [--lang en|hi|auto] [-j 8]
+                               [--routes path]
+    python batch_transcribe.py manifest.jsonl -o results.jsonl   # lines of {"path": ..., "lang": ...}
+
+Files are decoded across a process pool with one model per worker, and each result
+goes through the same language-choice and match_tab post-processing as the live
+assistant, against the same routes catalog (OXLAND_ROUTES, or --routes). Results
+are appended to the output as they finish; re-running with the same output skips
+files already decoded (--retry-errors also redoes failed ones).
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import wave
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+from intents import IntentEngine
+from routes_catalog import ROUTES_PATH, RoutesCatalog
+from vad import as_float32, normalize_audio
+from whisper_decode import DECODE_MODE, build_prompt, decode
+
+VOSK_MODEL_PATH = "vosk-model-small-en-us-0.15"
+SAMPLE_RATE = 16000
+AUDIO_EXTS = (".wav", ".mp3", ".flac", ".ogg", ".m4a")
+
+# Per-worker state, filled in by _init_worker.
+_worker = {}
+
+
+# ------------------ Inputs ------------------
+def collect_inputs(source):
+    """[(path, lang or None)] from a directory, a JSONL manifest or a plain list of paths."""
+    if os.path.isdir(source):
+        found = []
+        for dirpath, _, files in os.walk(source):
+            found += [os.path.join(dirpath, f) for f in files if f.lower().endswith(AUDIO_EXTS)]
+        return [(p, None) for p in sorted(found)]
+    base = os.path.dirname(os.path.abspath(source))
+    items = []
+    with open(source, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            entry = json.loads(line) if line.startswith("{") else {"path": line}
+            path = entry["path"] if os.path.isabs(entry["path"]) else os.path.join(base, entry["path"])
+            items.append((path, entry.get("lang")))
+    return items
+
+
+def completed_paths(output, retry_errors=False):
+    """Paths already present in an existing results file."""
+    done = set()
+    if not os.path.exists(output):
+        return done
+    with open(output, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                row = json.loads(line)
+            except ValueError:
+                continue  # partial last line from an interrupted run
+            if retry_errors and "error" in row:
+                continue
+            done.add(row["path"])
+    return done
+
+
+def read_audio(path):
+    """int16 mono at SAMPLE_RATE; WAV natively, anything else through faster-whisper's decoder."""
+    if path.lower().endswith(".wav"):
+        with wave.open(path, "rb") as w:
+            if w.getsampwidth() != 2:
+                raise ValueError("expected 16-bit WAV")
+            rate, channels = w.getframerate(), w.getnchannels()
+            pcm = np.frombuffer(w.readframes(w.getnframes()), dtype=np.int16)
+        if channels > 1:
+            pcm = pcm.reshape(-1, channels).mean(axis=1).astype(np.int16)
+        if rate != SAMPLE_RATE:
+            n = int(len(pcm) * SAMPLE_RATE / rate)
+            pcm = np.interp(np.linspace(0, len(pcm) - 1, n), np.arange(len(pcm)), pcm).astype(np.int16)
+        return pcm
+    from faster_whisper.audio import decode_audio
+    return (decode_audio(path, sampling_rate=SAMPLE_RATE) * 32767).astype(np.int16)
+
+
+# ------------------ Workers ------------------
+def load_routes(paths):
+    catalog = RoutesCatalog(paths)
+    catalog.reload()
+    return catalog.index
+
+
+def _init_worker(backend, model, compute_type, threads, tab_cutoff, decode_mode, routes_path):
+    os.environ.setdefault("OMP_NUM_THREADS", str(threads))
+    if backend == "whisper":
+        from faster_whisper import WhisperModel
+        _worker["model"] = WhisperModel(model, device="cpu", compute_type=compute_type, cpu_threads=threads)
+    else:
+        from vosk_pool import VoskPool
+        pool = VoskPool(model)
+        pool.model
+        _worker["model"] = pool
+    _worker["routes"] = load_routes(routes_path)
+    _worker["intents"] = IntentEngine()
+    _worker["backend"] = backend
+    _worker["decode_mode"] = decode_mode
+    _worker["prompt"] = build_prompt(["English", "Hindi", *_worker["routes"].names()])
+    _worker["tab_cutoff"] = tab_cutoff
+
+
+def _decode(path, lang):
+    model, backend = _worker["model"], _worker["backend"]
+    pcm = read_audio(path)
+    t0 = time.perf_counter()
+    if backend == "whisper":
+        audio = normalize_audio(as_float32(pcm))
+        text, lang, _ = decode(model, audio, None if lang == "auto" else lang, _worker["prompt"],
+                               _worker["decode_mode"])
+    else:
+        text = model.transcribe(pcm.tobytes())
+    decode_s = time.perf_counter() - t0
+
+    # Post-processing as in ree.py: language choice and the tab match.
+    choice = _worker["intents"].classify(text).best(["lang_en", "lang_hi"])
+    hits = _worker["routes"].search(text, limit=1) if text else []
+    tab, score = hits[0] if hits else (None, 0.0)
+    return {
+        "path": path,
+        "backend": backend,
+        "lang": lang,
+        "text": text,
+        "duration_s": round(len(pcm) / SAMPLE_RATE, 3),
+        "decode_s": round(decode_s, 3),
+        "language_choice": {"lang_en": "en", "lang_hi": "hi"}.get(choice),
+        "tab": tab if score >= _worker["tab_cutoff"] else None,
+        "tab_score": score,
+        "worker": os.getpid(),
+    }
+
+
+def decode_file(path, lang):
+    try:
+        return _decode(path, lang)
+    except Exception as e:
+        return {"path": path, "error": f"{type(e).__name__}: {e}"}
+
+
+# ------------------ Main ------------------
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("source", help="directory of recordings, or a manifest (JSONL or one path per line)")
+    parser.add_argument("-o", "--output", required=True)
+    parser.add_argument("--backend", choices=("whisper", "vosk"), default="whisper")
+    parser.add_argument("--model", help="Whisper size or Vosk model path")
+    parser.add_argument("--compute-type", default="int8")
+    parser.add_argument("--decode", choices=("adaptive", "greedy", "beam"), default=DECODE_MODE)
+    parser.add_argument("--lang", default="en", help="en, hi, or auto (Whisper detects it); manifest entries override")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--threads-per-worker", type=int, default=1)
+    parser.add_argument("--tab-cutoff", type=float, default=0.5)
+    parser.add_argument("--routes", default=ROUTES_PATH, help="routes file(s), directory or glob, as for the kiosk")
+    parser.add_argument("--retry-errors", action="store_true")
+    args = parser.parse_args()
+
+    model = args.model or ("small" if args.backend == "whisper" else VOSK_MODEL_PATH)
+    try:
+        # A worker whose initializer fails only surfaces as BrokenProcessPool, so check up front.
+        __import__("faster_whisper" if args.backend == "whisper" else "vosk")
+    except ImportError as e:
+        sys.exit(f"{args.backend} backend unavailable: {e}")
+    try:
+        routes = load_routes(args.routes)
+    except Exception as e:
+        sys.exit(f"Error loading routes from {args.routes}: {e}")
+    print(f"{len(routes)} routes from {args.routes}", file=sys.stderr)
+    done = completed_paths(args.output, args.retry_errors)
+    todo = [(p, lang or args.lang) for p, lang in collect_inputs(args.source) if p not in done]
+    print(f"{len(todo)} to decode, {len(done)} already in {args.output}", file=sys.stderr)
+    if not todo:
+        return
+
+    t0 = time.perf_counter()
+    audio_s = 0.0
+    finished = errors = 0
+    max_inflight = args.workers * 4
+    with open(args.output, "a", encoding="utf-8") as out, \
+            ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker,
+                                initargs=(args.backend, model, args.compute_type,
+                                          args.threads_per_worker, args.tab_cutoff, args.decode,
+                                          args.routes)) as pool:
+        pending = set()
+        queue = iter(todo)
+        while True:
+            # Keep a bounded number of files in flight so results stream out in steady order.
+            for path, lang in queue:
+                pending.add(pool.submit(decode_file, path, lang))
+                if len(pending) >= max_inflight:
+                    break
+            if not pending:
+                break
+            ready, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in ready:
+                row = future.result()
+                out.write(json.dumps(row, ensure_ascii=False) + "\n")
+                finished += 1
+                if "error" in row:
+                    errors += 1
+                else:
+                    audio_s += row["duration_s"]
+            out.flush()
+            wall = time.perf_counter() - t0
+            print(f"\r{finished}/{len(todo)} files, {errors} errors, {audio_s / wall:.1f}x realtime",
+                  end="", file=sys.stderr)
+    print(file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
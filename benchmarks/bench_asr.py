@@ -0,0 +1,321 @@
+"""Replay a labelled WAV corpus through every recognizer backend and report speed, accuracy and memory.
+
+    python benchmarks/bench_asr.py corpus/ [--backends whisper,vosk,google] [--whisper small:int8:beam:noprompt,small:int8:adaptive]
+                                   [--vosk vosk-model-small-en-us-0.15] [--google-latency-ms 250] [--out asr.json]
+
+corpus/ holds 16-bit mono WAV files and a labels.json describing them:
+
+    {"open_dashboard.wav": {"text": "open dashboard", "lang": "en", "tab": "Dashboard", "step": "select_tab"},
+     "haan.wav": {"text": "हाँ", "lang": "hi", "step": "yes_no"}}
+
+"step" names the dialog step (language, yes_no, select_tab) for grammar-constrained configs.
+
+Google is served by a local stand-in for the speech-api endpoint that answers with the
+label after --google-latency-ms, so its numbers cover the client side (FLAC encoding,
+HTTP round trip, parsing) and its WER is 0 by construction. Pass --google-live to hit
+the real endpoint instead.
+
+Each backend configuration runs in its own process so peak RSS is attributable to it.
+"""
+import argparse
+import json
+import os
+import resource
+import sys
+import threading
+import time
+import urllib.request
+import wave
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from multiprocessing import get_context
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from route_index import RouteIndex, load_aliases, normalize  # noqa: E402
+from vad import as_float32, normalize_audio  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# match_tab cutoff each app uses with that backend (ree.py: 0.5, new1.py / wishper_model.py: 0.6).
+TAB_CUTOFFS = {"whisper": 0.5, "vosk": 0.6, "google": 0.6}
+GOOGLE_LANGS = {"en": "en-US", "hi": "hi-IN"}
+WHISPER_RATE = 16000
+
+
+# ------------------ Corpus ------------------
+def load_corpus(directory):
+    with open(os.path.join(directory, "labels.json"), "r", encoding="utf-8") as f:
+        labels = json.load(f)
+    items = []
+    for name in sorted(labels):
+        path = os.path.join(directory, name)
+        with wave.open(path, "rb") as w:
+            if w.getsampwidth() != 2 or w.getnchannels() != 1:
+                raise ValueError(f"{path}: expected 16-bit mono WAV")
+            duration = w.getnframes() / w.getframerate()
+        items.append({"file": name, "path": path, "duration": duration, **labels[name]})
+    return items
+
+
+def read_pcm(path):
+    with wave.open(path, "rb") as w:
+        return w.getframerate(), np.frombuffer(w.readframes(w.getnframes()), dtype=np.int16)
+
+
+def resample(pcm, rate, target):
+    """Linear resample, as batch_transcribe.read_audio does; Whisper assumes 16 kHz input."""
+    if rate == target:
+        return pcm
+    n = int(len(pcm) * target / rate)
+    return np.interp(np.linspace(0, len(pcm) - 1, n), np.arange(len(pcm)), pcm).astype(np.int16)
+
+
+def word_errors(reference, hypothesis):
+    """(edit distance, reference length) over normalized words."""
+    ref, hyp = normalize(reference).split(), normalize(hypothesis or "").split()
+    prev = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        cur = [i] + [0] * len(hyp)
+        for j, h in enumerate(hyp, 1):
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (r != h))
+        prev = cur
+    return prev[-1], len(ref)
+
+
+# ------------------ Local Google stand-in ------------------
+class _GoogleStandIn(BaseHTTPRequestHandler):
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        time.sleep(self.server.latency)
+        best = {"alternative": [{"transcript": self.server.transcript, "confidence": 0.95}], "final": True}
+        body = json.dumps({"result": []}) + "\n" + json.dumps({"result": [best], "result_index": 0}) + "\n"
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.end_headers()
+        self.wfile.write(body.encode("utf-8"))
+
+    def log_message(self, *args):
+        pass
+
+
+class _RedirectGoogle(urllib.request.BaseHandler):
+    """Rewrites speech-api requests to the stand-in before the HTTP handler sees them."""
+
+    handler_order = 100
+
+    def __init__(self, base):
+        self.base = base
+
+    def http_request(self, req):
+        if "/speech-api/" in req.full_url:
+            req.full_url = self.base + req.full_url[req.full_url.index("/speech-api/"):]
+        return req
+
+    https_request = http_request
+
+
+def start_google_stand_in(latency):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _GoogleStandIn)
+    server.latency = latency
+    server.transcript = ""
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    # speech_recognition calls urllib's module-level urlopen, which goes through the installed opener.
+    urllib.request.install_opener(urllib.request.build_opener(_RedirectGoogle(f"http://127.0.0.1:{server.server_port}")))
+    return server
+
+
+# ------------------ Backends ------------------
+def whisper_backend(config):
+    """config is size:compute_type:mode[:noprompt], mode one of greedy, beam, adaptive."""
+    from faster_whisper import WhisperModel
+    from whisper_decode import build_prompt, decode
+    size, compute_type, mode, *flags = (config.split(":") + ["int8", "adaptive"])[:4]
+    model = WhisperModel(size, device="cpu", compute_type=compute_type)
+    decode_prompts = {}
+    if "noprompt" not in flags:
+        # The same initial prompts ree.set_decode_vocabulary builds.
+        from dialog import decode_vocabulary
+        with open(os.path.join(ROOT, "modules_routes.json"), "r", encoding="utf-8") as f:
+            route_names = list(json.load(f))
+        for lang in ("en", "hi"):
+            decode_prompts[lang] = build_prompt(*decode_vocabulary(route_names, lang))
+
+    def recognize(item):
+        samplerate, pcm = read_pcm(item["path"])
+        audio = normalize_audio(as_float32(resample(pcm, samplerate, WHISPER_RATE)))
+        lang = item.get("lang", "en")
+        text, _, passes = decode(model, audio, lang, decode_prompts.get(lang), mode)
+        return text, {"passes": len(passes)}
+
+    return recognize, lambda item: item.get("lang", "en") in ("en", "hi")
+
+
+def vosk_backend(config):
+    """config is a model path, optionally suffixed :grammar to decode items with a "step" label constrained."""
+    from vosk_pool import VoskPool
+    from grammars import DialogGrammars, strip_unknown
+    model_path, _, mode = config.partition(":")
+    pool = VoskPool(model_path)
+    pool.model
+    grammars = DialogGrammars()
+    if mode == "grammar":
+        with open(os.path.join(ROOT, "modules_routes.json"), "r", encoding="utf-8") as f:
+            grammars.rebuild(RouteIndex(json.load(f), load_aliases(os.path.join(ROOT, "route_aliases.json"))))
+
+    def recognize(item):
+        samplerate, pcm = read_pcm(item["path"])
+        if samplerate != pool.samplerate:
+            raise ValueError(f"{item['file']}: expected {pool.samplerate} Hz")
+        grammar = grammars.grammar(item.get("step")) if mode == "grammar" else None
+        return strip_unknown(pool.transcribe(pcm.tobytes(), grammar)), {"grammar": grammar is not None}
+
+    # The bundled model is English only.
+    return recognize, lambda item: item.get("lang", "en") == "en"
+
+
+def google_backend(config, latency=0.25):
+    import speech_recognition as sr
+    server = None if config == "live" else start_google_stand_in(latency)
+    recognizer = sr.Recognizer()
+
+    def recognize(item):
+        if server is not None:
+            server.transcript = item.get("text", "")
+        with sr.AudioFile(item["path"]) as source:
+            audio = recognizer.record(source)
+        try:
+            return recognizer.recognize_google(audio, language=GOOGLE_LANGS.get(item.get("lang", "en"), "en-US"))
+        except sr.UnknownValueError:
+            return ""
+
+    return recognize, lambda item: True
+
+
+BACKENDS = {"whisper": whisper_backend, "vosk": vosk_backend, "google": google_backend}
+
+
+def percentile(values, q):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+def run_config(backend, config, items, google_latency):
+    """Runs in a fresh process: load the backend, decode every item, summarize."""
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    t0 = time.perf_counter()
+    if backend == "google":
+        recognize, supports = google_backend(config, google_latency)
+    else:
+        recognize, supports = BACKENDS[backend](config)
+    load_s = time.perf_counter() - t0
+
+    route_index = RouteIndex(json.load(open(os.path.join(ROOT, "modules_routes.json"), encoding="utf-8")),
+                             load_aliases(os.path.join(ROOT, "route_aliases.json")))
+    latencies, audio_s, errors, ref_words = [], 0.0, 0, 0
+    tab_hits = tab_n = skipped = failures = escalated = 0
+    rows = []
+    for item in items:
+        if not supports(item):
+            skipped += 1
+            continue
+        t0 = time.perf_counter()
+        try:
+            text, extra = recognize(item), {}
+            if isinstance(text, tuple):
+                text, extra = text
+        except Exception as e:
+            failures += 1
+            rows.append({"file": item["file"], "error": str(e)})
+            continue
+        elapsed = time.perf_counter() - t0
+        latencies.append(elapsed)
+        audio_s += item["duration"]
+        row = {"file": item["file"], "text": text, "latency_ms": round(elapsed * 1000, 2), **extra}
+        escalated += extra.get("passes", 1) > 1
+        if "text" in item:
+            e, n = word_errors(item["text"], text)
+            errors += e
+            ref_words += n
+        if item.get("tab"):
+            tab_n += 1
+            matched = route_index.best(text, cutoff=TAB_CUTOFFS[backend]) if text else None
+            tab_hits += matched == item["tab"]
+            row["tab"] = matched
+        rows.append(row)
+
+    # ru_maxrss is KiB on Linux and bytes on macOS.
+    scale = 1 / 1024 if sys.platform != "darwin" else 1 / (1024 * 1024)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {
+        "backend": backend,
+        "config": config,
+        "n": len(latencies),
+        "skipped": skipped,
+        "failures": failures,
+        "load_s": round(load_s, 3),
+        "rtf": round(sum(latencies) / audio_s, 4) if audio_s else None,
+        "p50_ms": round(percentile(latencies, 0.5) * 1000, 2) if latencies else None,
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2) if latencies else None,
+        "peak_rss_mb": round(peak * scale, 1),
+        "model_rss_mb": round((peak - rss_before) * scale, 1),
+        "wer": round(errors / ref_words, 4) if ref_words else None,
+        "tab_accuracy": round(tab_hits / tab_n, 4) if tab_n else None,
+        "tab_n": tab_n,
+        "escalation_rate": round(escalated / len(latencies), 4) if latencies else None,
+        "items": rows,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("corpus")
+    parser.add_argument("--backends", default="whisper,vosk,google")
+    parser.add_argument("--whisper", default="small:int8:beam:noprompt,small:int8:adaptive",
+                        help="comma-separated size:compute_type:mode[:noprompt] configs")
+    parser.add_argument("--vosk", default="vosk-model-small-en-us-0.15,vosk-model-small-en-us-0.15:grammar",
+                        help="comma-separated model paths; suffix :grammar to use the dialog-step grammars")
+    parser.add_argument("--google-latency-ms", type=float, default=250.0)
+    parser.add_argument("--google-live", action="store_true")
+    parser.add_argument("--out", help="also write the JSON report here")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    items = load_corpus(args.corpus)
+    configs = {"whisper": args.whisper.split(","), "vosk": args.vosk.split(","),
+               "google": ["live" if args.google_live else "local"]}
+    runs = []
+    for backend in args.backends.split(","):
+        for config in configs[backend]:
+            with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as ex:
+                try:
+                    runs.append(ex.submit(run_config, backend, config, items, args.google_latency_ms / 1000).result())
+                except Exception as e:
+                    runs.append({"backend": backend, "config": config, "error": f"{type(e).__name__}: {e}"})
+
+    report = {
+        "corpus": os.path.abspath(args.corpus),
+        "items": len(items),
+        "audio_s": round(sum(i["duration"] for i in items), 3),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "runs": runs,
+    }
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+        return
+    for r in runs:
+        if "error" in r:
+            print(f"{r['backend']:<8} {r['config']:<32} ERROR {r['error']}")
+            continue
+        print(f"{r['backend']:<8} {r['config']:<32} n={r['n']:<4} rtf={r['rtf']} p50={r['p50_ms']}ms "
+              f"p95={r['p95_ms']}ms rss={r['peak_rss_mb']}MB wer={r['wer']} tab_acc={r['tab_accuracy']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""Per-utterance cost of the capture -> normalize -> Whisper/Vosk hand-off, int16 path vs float32 path.
+
+    python benchmarks/bench_audio_path.py [-n 200] [--seconds 3] [--json]
+
+Reports time and traced peak memory (tracemalloc, which sees numpy buffers) per step,
+plus the RMS error of each normalizer on loud input, where squaring int16 overflows.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vad import Endpointer, normalize_audio, to_pcm16  # noqa: E402
+
+SAMPLE_RATE = 16000
+BLOCK = 480
+
+
+def synthetic_utterance(seconds, rng, amplitude):
+    """Silence, a noisy voiced burst, silence: enough for the endpointer to trigger and close."""
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    voiced = np.sin(2 * np.pi * 180 * t) * (0.6 + 0.4 * np.sin(2 * np.pi * 3 * t)) + rng.normal(0, 0.2, t.size)
+    voiced = np.clip(voiced * amplitude, -1, 1)
+    quiet = rng.normal(0, 0.001, SAMPLE_RATE // 2)
+    return np.concatenate((quiet, voiced, quiet, quiet)).astype(np.float32)
+
+
+def legacy_preprocess(audio, target_db=-20.0):
+    """ree.preprocess_audio before the float32 path (int16 in, int16 out)."""
+    rms = np.sqrt(np.mean(audio**2))
+    scalar = 10 ** (target_db / 20) / (rms + 1e-6)
+    return np.clip(audio * scalar, -32768, 32767).astype(np.int16)
+
+
+def legacy_path(blocks):
+    steps = {}
+    t0 = time.perf_counter()
+    frames = [b.copy() for b in blocks]              # Endpointer kept a list of int16 frames
+    audio = np.concatenate(frames)
+    steps["assemble"] = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    with np.errstate(invalid="ignore", over="ignore"):
+        audio = legacy_preprocess(audio)
+    steps["normalize"] = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    whisper_in = audio.astype(np.float32) / 32768.0
+    steps["to_whisper"] = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    vosk_in = audio.tobytes()
+    steps["to_vosk"] = time.perf_counter() - t0
+    return steps, whisper_in, vosk_in
+
+
+def float_path(blocks, endpointer):
+    endpointer.reset()
+    steps = {}
+    t0 = time.perf_counter()
+    for block in blocks:
+        endpointer._append(block)                   # the copy Endpointer.feed makes per frame
+    audio = endpointer.audio()
+    steps["assemble"] = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    normalize_audio(audio)
+    steps["normalize"] = time.perf_counter() - t0
+    steps["to_whisper"] = 0.0                        # the same buffer is passed to Whisper
+    t0 = time.perf_counter()
+    vosk_in = to_pcm16(audio).tobytes()
+    steps["to_vosk"] = time.perf_counter() - t0
+    return steps, audio, vosk_in
+
+
+def measure(fn, n):
+    timings = {}
+    peaks = []
+    for i in range(n):
+        tracemalloc.start()
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        steps = fn(i)
+        peaks.append(tracemalloc.get_traced_memory()[1] - base)
+        tracemalloc.stop()
+        for k, v in steps.items():
+            timings.setdefault(k, []).append(v)
+    out = {k: round(statistics.median(v) * 1e6, 1) for k, v in timings.items()}
+    out["total_us"] = round(sum(out.values()), 1)
+    out["peak_traced_kib"] = round(statistics.median(peaks) / 1024, 1)
+    return out
+
+
+def normalize_error(amplitude, rng):
+    """Relative RMS error vs a float64 reference after normalizing to -20 dBFS."""
+    audio = synthetic_utterance(1.0, rng, amplitude)
+    target = 10 ** (-20 / 20)
+    with np.errstate(invalid="ignore", over="ignore"):
+        legacy = legacy_preprocess((audio * 32767).astype(np.int16)).astype(np.float64) / 32768.0
+    current = normalize_audio(audio.copy()).astype(np.float64)
+
+    def err(x):
+        rms = np.sqrt(np.mean(x**2))
+        return None if not np.isfinite(rms) else round(abs(rms - target) / target, 4)
+
+    return {"legacy": err(legacy), "float32": err(current),
+            "float32_peak": round(float(np.abs(current).max()), 4)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", type=int, default=200)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    utterance = synthetic_utterance(args.seconds, rng, 0.5)
+    n_frames = len(utterance) // BLOCK
+    float_blocks = [utterance[i * BLOCK:(i + 1) * BLOCK] for i in range(n_frames)]
+    int_blocks = [(b * 32767).astype(np.int16) for b in float_blocks]
+    endpointer = Endpointer(samplerate=SAMPLE_RATE, max_duration=args.seconds + 2)
+
+    report = {
+        "utterance_s": round(n_frames * BLOCK / SAMPLE_RATE, 2),
+        "int16_path": measure(lambda i: legacy_path(int_blocks)[0], args.n),
+        "float32_path": measure(lambda i: float_path(float_blocks, endpointer)[0], args.n),
+        "normalize_error": {f"amplitude_{a}": normalize_error(a, rng) for a in (0.05, 0.5, 1.0)},
+    }
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    print(f"utterance: {report['utterance_s']}s, median per utterance (us):")
+    for name in ("int16_path", "float32_path"):
+        print(f"  {name:<13} " + " ".join(f"{k}={v}" for k, v in report[name].items()))
+    for k, v in report["normalize_error"].items():
+        print(f"  rms error {k}: legacy={v['legacy']} float32={v['float32']} (peak {v['float32_peak']})")
+
+
+if __name__ == "__main__":
+    main()
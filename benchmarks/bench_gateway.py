@@ -0,0 +1,170 @@
+"""Load generator for gateway.py: many concurrent simulated kiosks on one box.
+
+    python benchmarks/bench_gateway.py script.json [--clients 20] [--sessions 100] [--url ws://127.0.0.1:8765]
+                                       [--speed 1.0] [--text] [--tts] [--json]
+
+script.json answers each dialog step with a 16-bit mono 16 kHz WAV (streamed as a
+microphone would) or with literal text:
+
+    {"language": "english.wav", "name": "name.wav", "yes_no": "no.wav", "select_tab": "dashboard.wav"}
+
+--speed 1 streams in real time, 0 as fast as the socket allows. --text sends each
+step's "text" label instead of audio (keys "<step>_text"), isolating session handling
+from ASR. Reports sessions/s and per-turn latency from end of speech to transcript.
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+import wave
+
+import numpy as np
+
+BLOCK_MS = 30
+TRAILING_SILENCE_S = 1.0   # lets the server-side endpointer hear the speaker stop
+
+
+def load_script(path, text_only):
+    base = os.path.dirname(os.path.abspath(path))
+    with open(path, "r", encoding="utf-8") as f:
+        spec = json.load(f)
+    answers = {}
+    for step, value in spec.items():
+        if step.endswith("_text"):
+            continue
+        if text_only:
+            answers[step] = spec.get(f"{step}_text", value if not value.endswith(".wav") else "")
+        elif value.endswith(".wav"):
+            with wave.open(os.path.join(base, value), "rb") as w:
+                if (w.getsampwidth(), w.getnchannels(), w.getframerate()) != (2, 1, 16000):
+                    raise ValueError(f"{value}: expected 16-bit mono 16 kHz WAV")
+                pcm = np.frombuffer(w.readframes(w.getnframes()), dtype="<i2")
+            silence = np.zeros(int(16000 * TRAILING_SILENCE_S), dtype="<i2")
+            answers[step] = np.concatenate((pcm, silence))
+        else:
+            answers[step] = value
+    return answers
+
+
+async def stream(ws, answer, speed):
+    """Send one answer; returns the monotonic time the speech itself ended."""
+    if isinstance(answer, str):
+        await ws.send(json.dumps({"type": "text", "text": answer}))
+        return time.monotonic()
+    block = 16000 * BLOCK_MS // 1000
+    speech_end = len(answer) - int(16000 * TRAILING_SILENCE_S)
+    ended = None
+    for i in range(0, len(answer), block):
+        await ws.send(answer[i:i + block].tobytes())
+        if ended is None and i + block >= speech_end:
+            ended = time.monotonic()
+        if speed:
+            await asyncio.sleep(BLOCK_MS / 1000 / speed)
+    return ended or time.monotonic()
+
+
+async def run_session(url, answers, speed, tts, turns):
+    import websockets
+
+    t0 = time.monotonic()
+    async with websockets.connect(url, max_size=2 ** 22) as ws:
+        await ws.send(json.dumps({"type": "hello", "tts": tts}))
+        speech_end = None
+        sender = None
+        async for message in ws:
+            if isinstance(message, bytes):
+                continue
+            msg = json.loads(message)
+            kind = msg["type"]
+            if kind == "listen":
+                answer = answers.get(msg["step"])
+                if answer is None:
+                    raise RuntimeError(f"script has no answer for step {msg['step']!r}")
+                speech_end = None
+                sender = asyncio.ensure_future(stream(ws, answer, speed))
+            elif kind == "transcript":
+                if sender is not None:
+                    speech_end = await sender
+                    sender.cancel()
+                    sender = None
+                turns.append({"step": msg["step"], "latency_s": time.monotonic() - (speech_end or time.monotonic()),
+                              "asr_ms": msg.get("asr_ms")})
+            elif kind == "end":
+                return msg.get("reason"), time.monotonic() - t0
+    return "closed", time.monotonic() - t0
+
+
+async def run(args):
+    answers = load_script(args.script, args.text)
+    turns, outcomes, durations, errors = [], {}, [], []
+    remaining = args.sessions
+    lock = asyncio.Lock()
+
+    async def client():
+        nonlocal remaining
+        while True:
+            async with lock:
+                if remaining <= 0:
+                    return
+                remaining -= 1
+            try:
+                reason, duration = await run_session(args.url, answers, args.speed, args.tts, turns)
+                outcomes[reason] = outcomes.get(reason, 0) + 1
+                durations.append(duration)
+            except Exception as e:
+                errors.append(f"{type(e).__name__}: {e}")
+
+    t0 = time.monotonic()
+    await asyncio.gather(*(client() for _ in range(args.clients)))
+    wall = time.monotonic() - t0
+
+    latencies = sorted(t["latency_s"] for t in turns)
+
+    def pct(q):
+        return round(latencies[min(len(latencies) - 1, int(len(latencies) * q))] * 1000, 1) if latencies else None
+
+    return {
+        "url": args.url,
+        "clients": args.clients,
+        "sessions": args.sessions,
+        "mode": "text" if args.text else f"audio x{args.speed}",
+        "wall_s": round(wall, 2),
+        "sessions_per_s": round(len(durations) / wall, 3) if wall else None,
+        "outcomes": outcomes,
+        "errors": len(errors),
+        "first_errors": errors[:5],
+        "session_s_p50": round(statistics.median(durations), 2) if durations else None,
+        "turns": len(turns),
+        "turn_latency_ms_p50": pct(0.5),
+        "turn_latency_ms_p95": pct(0.95),
+        "asr_ms_p50": round(statistics.median(t["asr_ms"] for t in turns), 1) if turns else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("script")
+    parser.add_argument("--url", default="ws://127.0.0.1:8765")
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--speed", type=float, default=1.0)
+    parser.add_argument("--text", action="store_true")
+    parser.add_argument("--tts", action="store_true", help="also receive mp3 frames")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    for k, v in report.items():
+        print(f"{k:<22} {v}")
+    if report["errors"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""Tab matching on Hindi and accented transcripts: legacy difflib vs RouteIndex with and without phonetic keys.
+
+    python benchmarks/bench_hindi_match.py [samples.jsonl] [--model small] [--cutoff 0.5] [--json]
+
+samples.jsonl has one {"tab": "<route name>", "audio": "clip.wav"} or
+{"tab": ..., "text": "<transcript>"} per line (paths relative to the file). Audio is
+transcribed once with Whisper (language "hi", the route vocabulary as prompt) and
+every matcher sees the same transcript. Without a file a built-in set of Devanagari,
+mixed-script and misheard transcripts is used, plus dialog answers ("yes", "reset")
+whose tab is null: any tab for them counts as wrong.
+
+A miss (no tab at --cutoff) is a retry: the user hears "I didn't match that" and goes
+through capture, decode and TTS again. Reports accuracy, retry rate, wrong-tab rate
+and lookup latency per matcher.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from batch_transcribe import read_audio  # noqa: E402
+from bench_match_tab import legacy_match_tab  # noqa: E402
+from dialog import decode_vocabulary  # noqa: E402
+from route_index import RouteIndex, load_aliases  # noqa: E402
+from vad import as_float32, normalize_audio  # noqa: E402
+from whisper_decode import build_prompt, decode  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BUILTIN = [
+    ("Land Acquisition", "लैंड एक्विजिशन"), ("Land Acquisition", "लैंड एक्विज़िशन खोलो"),
+    ("Land Acquisition", "land एक्विजिशन"), ("Land Acquisition", "lend acuisition"),
+    ("Dashboard", "डैशबोर्ड"), ("Dashboard", "डैशबोर्ड पर जाओ"), ("Dashboard", "dash bord"),
+    ("Master Data", "मास्टर डेटा"), ("Master Data", "मास्टर डाटा दिखाओ"), ("Master Data", "mastar deta"),
+    ("Analytics", "एनालिटिक्स"), ("Analytics", "मुझे एनालिटिक्स दिखाओ"), ("Analytics", "enalitiks"),
+    ("Settings", "सेटिंग्स"), ("Settings", "सेटिंग"), ("Projects", "प्रोजेक्ट्स"), ("Projects", "प्रोजेक्ट"),
+    ("Locations", "लोकेशन्स"), ("Locations", "लोकेशन"), ("Imports", "इंपोर्ट्स"), ("Imports", "इम्पोर्ट"),
+    ("Plot Management", "प्लॉट मैनेजमेंट"), ("Plot Management", "प्लाट मेनेजमेंट"),
+    ("Document Search", "डॉक्यूमेंट सर्च"), ("Document Search", "डाक्यूमेंट सर्च करो"),
+    ("Forest Land", "फॉरेस्ट लैंड"), ("Forest Land", "फारेस्ट लैंड"), ("Agriculture", "एग्रीकल्चर"),
+    ("Land Aggregator", "लैंड एग्रीगेटर"), ("Land Use & Land Cover", "लैंड यूज़ लैंड कवर"),
+    ("Litigation & Court Cases", "लिटिगेशन"), ("Litigation & Court Cases", "कोर्ट केसेस"),
+    ("FAQs", "एफ ए क्यू"), ("FAQs", "हेल्प"), ("Locations", "locate"),
+    # Dialog answers that must not open a tab.
+    (None, "yes"), (None, "is"), (None, "start"), (None, "reset"), (None, "हाँ"), (None, "नहीं"),
+    (None, "hello"), (None, "hello there"), (None, "again"), (None, "house"), (None, "course"), (None, "lunch"),
+]
+
+
+def load_samples(path):
+    base = os.path.dirname(os.path.abspath(path))
+    samples = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                item = json.loads(line)
+                if "audio" in item:
+                    item["audio"] = os.path.join(base, item["audio"])
+                samples.append(item)
+    return samples
+
+
+def transcribe_all(samples, model_size, routes):
+    if not any("audio" in s for s in samples):
+        return
+    from faster_whisper import WhisperModel
+
+    model = WhisperModel(model_size, device="cpu", compute_type="int8")
+    prompt = build_prompt(*decode_vocabulary(routes, "hi"))
+    for s in samples:
+        if "audio" in s:
+            text, _, _ = decode(model, normalize_audio(as_float32(read_audio(s["audio"]))), "hi", prompt)
+            s["text"] = text
+
+
+def evaluate(match, samples):
+    correct = retries = wrong = 0
+    times = []
+    for s in samples:
+        t0 = time.perf_counter()
+        tab = match(s["text"])
+        times.append(time.perf_counter() - t0)
+        if tab == s["tab"]:
+            correct += 1
+        elif tab is None:
+            retries += 1
+        else:
+            wrong += 1
+    times.sort()
+    n = len(samples)
+    return {
+        "accuracy": round(correct / n, 3),
+        "retry_rate": round(retries / n, 3),
+        "wrong_tab_rate": round(wrong / n, 3),
+        "p50_us": round(statistics.median(times) * 1e6, 1),
+        "p95_us": round(times[min(n - 1, int(n * 0.95))] * 1e6, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("samples", nargs="?")
+    parser.add_argument("--model", default="small")
+    parser.add_argument("--cutoff", type=float, default=0.5, help="ree.match_tab's cutoff")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    with open(os.path.join(ROOT, "modules_routes.json"), encoding="utf-8") as f:
+        routes = json.load(f)
+    aliases = load_aliases(os.path.join(ROOT, "route_aliases.json"))
+    samples = load_samples(args.samples) if args.samples else [{"tab": t, "text": x} for t, x in BUILTIN]
+    transcribe_all(samples, args.model, list(routes))
+
+    names = list(routes)
+    plain = RouteIndex(routes, aliases, phonetic=False)
+    phonetic = RouteIndex(routes, aliases)
+    report = {
+        "samples": len(samples),
+        "legacy_difflib": evaluate(lambda t: legacy_match_tab(t, names), samples),
+        "route_index": evaluate(lambda t: plain.best(t, args.cutoff), samples),
+        "route_index_phonetic": evaluate(lambda t: phonetic.best(t, args.cutoff), samples),
+    }
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    print(f"samples: {report['samples']}")
+    for name in ("legacy_difflib", "route_index", "route_index_phonetic"):
+        print(f"  {name:<21} " + " ".join(f"{k}={v}" for k, v in report[name].items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Microbenchmarks for the compiled intent engine against the legacy per-check code in ree.py.
+
+    python benchmarks/bench_intents.py [--repeat 2000] [--json]
+
+Also times classify() as synthetic intents are added to the table, to show the
+per-utterance cost stays flat as the table grows.
+"""
+import argparse
+import difflib
+import json
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from intents import INTENT_TABLE, IntentEngine  # noqa: E402
+from route_index import RouteIndex  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+UTTERANCES = ["yes", "yeah sure", "nope", "I know", "english", "inglish", "hindi please", "हिंदी", "हाँ",
+              "what is your name", "who are you", "which company", "exit", "quit now", "what is my name",
+              "analytics", "open land acquisition", "forest land", "master data", "something else entirely"]
+
+
+# ---- legacy code paths, as they were in ree.py ----
+def legacy_detect_language_choice(t):
+    t = t.lower().strip()
+    english_keywords = ["english", "eng", "इंग्लिश", "अंग्रेजी"]
+    hindi_keywords = ["hindi", "हिंदी", "हिन्दी"]
+    for word in english_keywords:
+        if word in t:
+            return "en"
+    for word in hindi_keywords:
+        if word in t:
+            return "hi"
+    matches = difflib.get_close_matches(t, english_keywords + hindi_keywords, n=1, cutoff=0.5)
+    if matches:
+        return "en" if matches[0] in english_keywords else "hi"
+    return None
+
+
+def legacy_ask_yes_no(t):
+    t = t.lower()
+    if "yes" in t or "yeah" in t or "yep" in t:
+        return "yes"
+    if "no" in t or "nah" in t or "nope" in t:
+        return "no"
+    matches = difflib.get_close_matches(t, ["yes", "no", "yeah", "nah", "nope", "yep"], n=1, cutoff=0.5)
+    if matches:
+        return "yes" if matches[0] in ["yes", "yeah", "yep"] else "no"
+    return None
+
+
+def legacy_identity(t):
+    t = t.lower()
+    for key, phrases in {"name": ["your name", "assistant name", "who are you"],
+                         "company": ["company", "which company", "where do you work"]}.items():
+        if difflib.get_close_matches(t, phrases, n=1, cutoff=0.5):
+            return key
+    return None
+
+
+def legacy_select_tab_checks(t, tab_names):
+    low = t.lower()
+    if "exit" in low or "quit" in low:
+        return "exit"
+    if "my name" in low:
+        return "my_name"
+    if legacy_identity(t):
+        return "identity"
+    for name in tab_names:
+        if name.lower() in low or low in name.lower():
+            return name
+    matches = difflib.get_close_matches(low, [n.lower() for n in tab_names], n=1, cutoff=0.5)
+    return matches[0] if matches else None
+
+
+def legacy_all(t, tab_names):
+    return legacy_select_tab_checks(t, tab_names), legacy_ask_yes_no(t), legacy_detect_language_choice(t)
+
+
+# ---- harness ----
+def per_call_us(fn, repeat):
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        for u in UTTERANCES:
+            fn(u)
+    return round((time.perf_counter() - t0) / (repeat * len(UTTERANCES)) * 1e6, 2)
+
+
+def synthetic_table(extra, rng):
+    table = dict(INTENT_TABLE)
+    for i in range(extra):
+        words = ["".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 9))) for _ in range(3)]
+        table[f"synthetic_{i}"] = {"keywords": [" ".join(words[:2])], "fuzzy": [" ".join(words)]}
+    return table
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=2000)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    with open(os.path.join(ROOT, "modules_routes.json"), encoding="utf-8") as f:
+        routes = json.load(f)
+    tab_names = list(routes)
+    route_index = RouteIndex(routes)
+    engine = IntentEngine()
+
+    report = {
+        "legacy_select_tab_checks_us": per_call_us(lambda u: legacy_select_tab_checks(u, tab_names), args.repeat),
+        "legacy_ask_yes_no_us": per_call_us(legacy_ask_yes_no, args.repeat),
+        "legacy_detect_language_choice_us": per_call_us(legacy_detect_language_choice, args.repeat),
+        "legacy_all_three_us": per_call_us(lambda u: legacy_all(u, tab_names), args.repeat),
+        "engine_classify_us": per_call_us(engine.classify, args.repeat),
+        "engine_classify_with_routes_us": per_call_us(lambda u: engine.classify(u, route_index), args.repeat),
+        "scaling": {},
+    }
+    rng = random.Random(3)
+    for extra in (0, 100, 1000, 5000):
+        scaled = IntentEngine(synthetic_table(extra, rng))
+        report["scaling"][len(INTENT_TABLE) + extra] = per_call_us(scaled.classify, max(1, args.repeat // 10))
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    for k, v in report.items():
+        print(f"{k:>34}: {v}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Compare the legacy difflib match_tab with RouteIndex lookups on a synthetic route catalog.
+
+    python benchmarks/bench_match_tab.py [--routes 10000] [--queries 500] [--json]
+"""
+import argparse
+import difflib
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from route_index import RouteIndex  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SECTIONS = ("documents plots owners surveys mutations leases maps reports approvals payments notices "
+            "hearings boundaries registry history").split()
+SYLLABLES = "ra ma pur ga nj kot bad na ha li sar ve la dh ur an pa ti ko ri de".split()
+
+
+def legacy_match_tab(user_text, tab_names):
+    """ree.match_tab before the route index (cutoff 0.5)."""
+    if not user_text:
+        return None
+    user_text = user_text.lower()
+    for name in tab_names:
+        if name.lower() in user_text or user_text in name.lower():
+            return name
+    matches = difflib.get_close_matches(user_text, [t.lower() for t in tab_names], n=1, cutoff=0.5)
+    if matches:
+        for name in tab_names:
+            if name.lower() == matches[0]:
+                return name
+    return None
+
+
+def synthetic_routes(n, rng):
+    with open(os.path.join(ROOT, "modules_routes.json"), encoding="utf-8") as f:
+        routes = json.load(f)
+    modules = list(routes)
+    # Deep links look like "<module> <place> <section>", e.g. "Land Acquisition Ramapur Plots".
+    while len(routes) < n:
+        place = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).title()
+        name = f"{rng.choice(modules)} {place} {rng.choice(SECTIONS).title()}"
+        routes.setdefault(name, f"http://localhost/{len(routes)}")
+    return routes
+
+
+def mishear(name, rng):
+    chars = list(name.lower())
+    for _ in range(rng.randint(0, 2)):
+        i = rng.randrange(len(chars))
+        chars[i] = rng.choice("abcdefghijklmnopqrstuvwxyz ")
+    return rng.choice(["", "open ", "go to "]) + "".join(chars)
+
+
+def time_calls(fn, queries):
+    lat = []
+    out = []
+    for q in queries:
+        t0 = time.perf_counter()
+        out.append(fn(q))
+        lat.append(time.perf_counter() - t0)
+    lat.sort()
+    return out, {
+        "mean_us": round(statistics.mean(lat) * 1e6, 1),
+        "p50_us": round(lat[len(lat) // 2] * 1e6, 1),
+        "p95_us": round(lat[int(len(lat) * 0.95)] * 1e6, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--routes", type=int, default=10000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    routes = synthetic_routes(args.routes, rng)
+    names = list(routes)
+    targets = [rng.choice(names) for _ in range(args.queries)]
+    queries = [mishear(t, rng) for t in targets]
+
+    t0 = time.perf_counter()
+    index = RouteIndex(routes)
+    build_ms = (time.perf_counter() - t0) * 1000
+
+    legacy_out, legacy_stats = time_calls(lambda q: legacy_match_tab(q, names), queries)
+    index_out, index_stats = time_calls(index.best, queries)
+    report = {
+        "routes": len(routes),
+        "queries": len(queries),
+        "index_build_ms": round(build_ms, 1),
+        "difflib": dict(legacy_stats, accuracy=round(sum(o == t for o, t in zip(legacy_out, targets)) / len(targets), 3)),
+        "route_index": dict(index_stats, accuracy=round(sum(o == t for o, t in zip(index_out, targets)) / len(targets), 3)),
+    }
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        for k, v in report.items():
+            print(f"{k:>16}: {v}")
+
+
+if __name__ == "__main__":
+    main()
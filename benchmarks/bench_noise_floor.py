@@ -0,0 +1,219 @@
+"""Background noise-floor tracking vs speech_recognition's per-listen adjust_for_ambient_noise.
+
+    python benchmarks/bench_noise_floor.py [noise.wav ...] [--turns 20] [--listens 8] [--json]
+
+Each recording (16-bit mono WAV of the idle room; synthetic fan/hum noise with a step
+change halfway when none are given) is fed through vad.NoiseFloorTracker as the
+background thread would, and through a numpy port of adjust_for_ambient_noise over
+0.8 s before each of --turns evenly spaced listens. Reports the threshold each gives,
+the share of noise chunks that would falsely start a recording and how long the
+tracker takes to settle.
+
+The delay before a listen starts is then measured in real time on a stand-in for an
+exclusive capture device (a second open fails, as on ALSA hw:): --listens times, the
+tracker runs on the device in the background and the listen waits for paused() to
+release it; without the tracker the listen opens the device and reads 0.8 s of
+calibration audio first. Reports both delays, the difference (latency saved per turn)
+and how many listens found the device still held.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+import wave
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vad import NoiseFloorTracker, as_float32  # noqa: E402
+
+SAMPLE_RATE = 16000
+CHUNK = 1024               # speech_recognition.Microphone default
+CALIBRATION_S = 0.8
+BLOCK = 480
+
+
+def synthetic_noise(seconds, rng):
+    """Quiet room hum, then a fan switching on halfway through."""
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    hum = 0.004 * np.sin(2 * np.pi * 50 * t) + rng.normal(0, 0.003, t.size)
+    fan = np.where(t > seconds / 2, rng.normal(0, 0.02, t.size), 0.0)
+    return np.clip(hum + fan, -1, 1).astype(np.float32)
+
+
+def load(path):
+    with wave.open(path, "rb") as w:
+        if w.getsampwidth() != 2 or w.getnchannels() != 1 or w.getframerate() != SAMPLE_RATE:
+            raise ValueError(f"{path}: expected 16-bit mono {SAMPLE_RATE} Hz WAV")
+        return as_float32(np.frombuffer(w.readframes(w.getnframes()), dtype=np.int16))
+
+
+def chunk_rms(audio):
+    n = len(audio) // CHUNK
+    chunks = audio[:n * CHUNK].reshape(n, CHUNK).astype(np.float64)
+    return 32768.0 * np.sqrt((chunks ** 2).mean(axis=1))
+
+
+def sr_calibrate(rms, start, threshold=300.0, damping=0.15, ratio=1.5):
+    """speech_recognition.Recognizer.adjust_for_ambient_noise over CALIBRATION_S from chunk start."""
+    d = damping ** (CHUNK / SAMPLE_RATE)
+    for energy in rms[start:start + int(CALIBRATION_S * SAMPLE_RATE / CHUNK)]:
+        threshold = threshold * d + energy * ratio * (1 - d)
+    return threshold
+
+
+class ExclusiveDevice:
+    """A capture device only one stream can hold at a time."""
+
+    def __init__(self):
+        self.holder = None
+        self.conflicts = 0
+        self._lock = threading.Lock()
+
+    def open(self, who):
+        with self._lock:
+            if self.holder is not None:
+                self.conflicts += 1
+                raise OSError(f"device busy (held by {self.holder})")
+            self.holder = who
+
+    def close(self, who):
+        with self._lock:
+            if self.holder == who:
+                self.holder = None
+
+
+class RealtimeSource:
+    """Loops audio block by block in real time through an ExclusiveDevice (vad source interface)."""
+
+    samplerate = SAMPLE_RATE
+
+    def __init__(self, audio, device, name):
+        self.audio = audio
+        self.device = device
+        self.name = name
+        self._pos = 0
+
+    def __enter__(self):
+        self.device.open(self.name)
+        return self
+
+    def __exit__(self, *exc):
+        self.device.close(self.name)
+
+    def blocks(self):
+        while True:
+            time.sleep(BLOCK / SAMPLE_RATE)
+            if self._pos + BLOCK > len(self.audio):
+                self._pos = 0
+            self._pos += BLOCK
+            yield self.audio[self._pos - BLOCK:self._pos]
+
+
+def listen_delays(audio, listens, gap_s=1.0, hold_s=0.3):
+    """Seconds from asking to listen until the listen has the device and a threshold."""
+    hold = int(hold_s * SAMPLE_RATE / BLOCK)
+    calibrate = int(CALIBRATION_S * SAMPLE_RATE / BLOCK)
+
+    def listen(source, calibration_blocks, t0):
+        try:
+            with source:
+                blocks = source.blocks()
+                for _ in range(calibration_blocks):
+                    next(blocks)
+                delay = time.perf_counter() - t0
+                for _ in range(hold):
+                    next(blocks)
+        except OSError:
+            return None
+        return delay
+
+    device = ExclusiveDevice()
+    tracker = NoiseFloorTracker(source=RealtimeSource(audio, device, "tracker")).start()
+    tracked = []
+    for _ in range(listens):
+        time.sleep(gap_s)
+        t0 = time.perf_counter()
+        with tracker.paused():
+            tracked.append(listen(RealtimeSource(audio, device, "listen"), 0, t0))
+    tracker.stop()
+    conflicts = device.conflicts
+
+    device = ExclusiveDevice()
+    calibrated = [listen(RealtimeSource(audio, device, "listen"), calibrate, time.perf_counter())
+                  for _ in range(listens)]
+    ok = [d for d in tracked if d is not None]
+    return {
+        "listen_delay_ms_tracker": round(statistics.median(ok) * 1000, 2) if ok else None,
+        "listen_delay_ms_tracker_max": round(max(ok) * 1000, 2) if ok else None,
+        "listen_delay_ms_calibration": round(statistics.median(calibrated) * 1000, 2),
+        "latency_saved_ms_per_turn": round((statistics.median(calibrated) - statistics.median(ok)) * 1000, 2)
+        if ok else None,
+        "device_busy_listens": conflicts,
+    }
+
+
+def run(audio, turns):
+    rms = chunk_rms(audio)
+    tracker = NoiseFloorTracker()
+    turn_chunks = np.linspace(len(rms) // turns, len(rms) - 1, turns).astype(int)
+    sr_thresholds, tracker_thresholds, false_sr, false_tracker = [], [], [], []
+    feed_s, settle_s, blocks_fed = 0.0, None, 0
+    done = 0
+    for turn, end in enumerate(turn_chunks):
+        # Everything up to this listen is idle room audio the background thread has seen.
+        while done < end * CHUNK:
+            block = audio[done:done + BLOCK]
+            t0 = time.perf_counter()
+            tracker.feed(block)
+            feed_s += time.perf_counter() - t0
+            blocks_fed += 1
+            done += BLOCK
+            if settle_s is None and tracker.ready:
+                settle_s = done / SAMPLE_RATE
+        window = rms[end:end + int(2 * SAMPLE_RATE / CHUNK)]   # the 2 s after the listen starts
+        sr_t = sr_calibrate(rms, max(0, end - int(CALIBRATION_S * SAMPLE_RATE / CHUNK)))
+        sr_thresholds.append(sr_t)
+        false_sr.append(float((window > sr_t).mean()) if window.size else 0.0)
+        if tracker.ready:
+            tracker_thresholds.append(tracker.threshold)
+            false_tracker.append(float((window > tracker.threshold).mean()) if window.size else 0.0)
+    return {
+        "seconds": round(len(audio) / SAMPLE_RATE, 1),
+        "sr_threshold_median": round(float(np.median(sr_thresholds)), 1),
+        "tracker_threshold_median": round(float(np.median(tracker_thresholds)), 1) if tracker_thresholds else None,
+        "false_start_rate_sr": round(float(np.mean(false_sr)), 4),
+        "false_start_rate_tracker": round(float(np.mean(false_tracker)), 4) if false_tracker else None,
+        "tracker_ready_after_s": settle_s,
+        "tracker_feed_us_per_block": round(feed_s / max(1, blocks_fed) * 1e6, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("files", nargs="*")
+    parser.add_argument("--turns", type=int, default=20)
+    parser.add_argument("--seconds", type=float, default=60.0, help="length of the synthetic recording")
+    parser.add_argument("--listens", type=int, default=8, help="real-time listens per recording for the delay")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    inputs = {path: load(path) for path in args.files}
+    if not inputs:
+        inputs["synthetic"] = synthetic_noise(args.seconds, np.random.default_rng(0))
+    report = {name: dict(run(audio, args.turns), **listen_delays(audio, args.listens)) for name, audio in inputs.items()}
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    for name, r in report.items():
+        print(name)
+        for k, v in r.items():
+            print(f"  {k:<28} {v}")
+
+
+if __name__ == "__main__":
+    main()
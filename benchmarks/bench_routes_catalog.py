@@ -0,0 +1,131 @@
+"""Load, memory and hot-reload cost of RoutesCatalog on a large sharded catalog.
+
+    python benchmarks/bench_routes_catalog.py [--routes 50000] [--shards 20] [--edits 200] [--json]
+
+Writes a synthetic catalog (as bench_match_tab builds it) split across --shards JSON
+files plus an aliases file, then measures the initial load (time, traced memory of
+the catalog and its index), a reload with nothing changed (stat calls only), a reload
+after one shard is edited (--edits URL changes, renames and additions), the full
+rebuild that edit would otherwise take, and search latency before and after.
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from routes_catalog import RoutesCatalog  # noqa: E402
+from bench_match_tab import synthetic_routes, mishear  # noqa: E402
+
+
+def write_shards(directory, routes, shards):
+    names = list(routes)
+    size = -(-len(names) // shards)
+    paths = []
+    for i in range(shards):
+        path = os.path.join(directory, f"routes_{i:03d}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({n: routes[n] for n in names[i * size:(i + 1) * size]}, f)
+        paths.append(path)
+    return paths
+
+
+def edit_shard(path, edits, rng):
+    with open(path, "r", encoding="utf-8") as f:
+        shard = json.load(f)
+    names = list(shard)
+    rng.shuffle(names)
+    third = edits // 3
+    for name in names[:third]:
+        shard[name] += "?v=2"
+    for name in names[third:2 * third]:
+        shard[name + " Archive"] = shard.pop(name)
+    for i in range(edits - 2 * third):
+        shard[f"New Module {i} Reports"] = f"http://localhost/new/{i}"
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(shard, f)
+
+
+def search_ms(catalog, queries):
+    times = []
+    for q in queries:
+        t0 = time.perf_counter()
+        catalog.index.best(q)
+        times.append(time.perf_counter() - t0)
+    return round(statistics.median(times) * 1000, 3)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--routes", type=int, default=50000)
+    parser.add_argument("--shards", type=int, default=20)
+    parser.add_argument("--edits", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    routes = synthetic_routes(args.routes, rng)
+    aliases = {name: [name.lower().replace(" ", "")] for name in rng.sample(list(routes), len(routes) // 20)}
+    queries = [mishear(rng.choice(list(routes)), rng) for _ in range(args.queries)]
+    directory = tempfile.mkdtemp(prefix="oxland_routes_")
+    try:
+        shards = write_shards(directory, routes, args.shards)
+        with open(os.path.join(directory, "route_aliases.json"), "w", encoding="utf-8") as f:
+            json.dump(aliases, f)
+
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        catalog = RoutesCatalog(directory)
+        catalog.reload()
+        load_s = time.perf_counter() - t0
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        search_before = search_ms(catalog, queries)
+
+        t0 = time.perf_counter()
+        catalog.reload()
+        noop_s = time.perf_counter() - t0
+
+        time.sleep(0.01)                      # a new mtime even on coarse-grained filesystems
+        edit_shard(shards[len(shards) // 2], args.edits, rng)
+        t0 = time.perf_counter()
+        diff = catalog.reload()
+        incremental_s = time.perf_counter() - t0
+        search_after = search_ms(catalog, queries)
+
+        t0 = time.perf_counter()
+        RoutesCatalog(directory).reload()
+        rebuild_s = time.perf_counter() - t0
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    report = {
+        "routes": len(routes),
+        "shards": args.shards,
+        "aliases": len(aliases),
+        "initial_load_s": round(load_s, 3),
+        "catalog_memory_mib": round(memory / 2 ** 20, 1),
+        "noop_reload_ms": round(noop_s * 1000, 2),
+        "edit": repr(diff),
+        "incremental_reload_ms": round(incremental_s * 1000, 1),
+        "full_rebuild_ms": round(rebuild_s * 1000, 1),
+        "search_ms_p50_before": search_before,
+        "search_ms_p50_after": search_after,
+    }
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    for k, v in report.items():
+        print(f"{k:<24} {v}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""Synthesis latency of each TTS backend on the dialog's prompts, and what the selector picks.
+
+    python benchmarks/bench_tts_backends.py [--backends gtts,piper,espeak,pyttsx3] [--reps 2] [--simulate] [--json]
+
+Renders every PROMPTS entry and fixed phrase (English and Hindi) with each installed
+backend, uncached, and reports availability, p50/p95 synthesis latency, audio size and
+real-time factor (synthesis time / audio length) per backend and language. Then runs
+the same phrases through a TTSSelector over those backends and reports which backend
+served each language and how often it fell back.
+
+--simulate swaps in stand-in backends (a slow online voice that drops one request in
+five, an English-only local neural voice, a fast formant voice) so the selection and
+fallback logic can be measured on a machine with no engines installed.
+"""
+import argparse
+import io
+import json
+import os
+import random
+import statistics
+import sys
+import time
+import wave
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dialog import PROMPTS, FIXED_PHRASES  # noqa: E402
+from tts_backends import BACKENDS, LATENCY_BUDGET_S, TTSBackend, TTSSelector  # noqa: E402
+
+
+def audio_seconds(data):
+    """Length of a WAV buffer, or an estimate for gTTS's 32 kbps mp3."""
+    if data[:4] == b"RIFF":
+        with wave.open(io.BytesIO(data)) as w:
+            return w.getnframes() / w.getframerate()
+    return len(data) * 8 / 32000
+
+
+class FakeBackend(TTSBackend):
+    def __init__(self, name, languages, latency_s, fail_rate=0.0, seed=0):
+        self.name = name
+        self.languages = frozenset(languages)
+        self.latency_s = latency_s
+        self.fail_rate = fail_rate
+        self._rng = random.Random(seed)
+
+    def available(self):
+        return True
+
+    def synthesize(self, text, lang="en"):
+        time.sleep(self.latency_s * self._rng.uniform(0.8, 1.2))
+        if self._rng.random() < self.fail_rate:
+            raise ConnectionError("simulated network error")
+        buf = io.BytesIO()
+        with wave.open(buf, "wb") as w:
+            w.setnchannels(1)
+            w.setsampwidth(2)
+            w.setframerate(16000)
+            w.writeframes(b"\0\0" * int(len(text) * 0.06 * 16000))
+        return buf.getvalue()
+
+
+def simulated_backends(scale):
+    return [
+        FakeBackend("gtts", ("en", "hi"), 0.9 * scale, fail_rate=0.2, seed=1),
+        FakeBackend("piper", ("en",), 0.12 * scale, seed=2),
+        FakeBackend("espeak", ("en", "hi"), 0.03 * scale, seed=3),
+    ]
+
+
+def phrases():
+    items = [(text, lang) for by_lang in PROMPTS.values() for lang, text in by_lang.items()]
+    items.extend(FIXED_PHRASES)
+    return items
+
+
+def measure(backend, items, reps):
+    out = {}
+    for lang in ("en", "hi"):
+        texts = [t for t, l in items if l == lang]
+        if lang not in backend.languages or not texts:
+            continue
+        times, sizes, audio_s, errors = [], [], 0.0, 0
+        for _ in range(reps):
+            for text in texts:
+                t0 = time.perf_counter()
+                try:
+                    data = backend.synthesize(text, lang)
+                except Exception:
+                    errors += 1
+                    continue
+                times.append(time.perf_counter() - t0)
+                sizes.append(len(data))
+                audio_s += audio_seconds(data)
+        if not times:
+            out[lang] = {"errors": errors}
+            continue
+        times.sort()
+        out[lang] = {
+            "p50_ms": round(statistics.median(times) * 1000, 1),
+            "p95_ms": round(times[min(len(times) - 1, int(len(times) * 0.95))] * 1000, 1),
+            "avg_kb": round(statistics.mean(sizes) / 1024, 1),
+            "rtf": round(sum(times) / audio_s, 3) if audio_s else None,
+            "errors": errors,
+        }
+    return out
+
+
+def run_selector(selector, items, reps):
+    served = {}
+    waits = []
+    for _ in range(reps):
+        for text, lang in items:
+            t0 = time.perf_counter()
+            try:
+                _, voice = selector(text, lang)
+            except RuntimeError:
+                voice = {"engine": "none"}
+            waits.append(time.perf_counter() - t0)
+            by_lang = served.setdefault(lang, {})
+            by_lang[voice["engine"]] = by_lang.get(voice["engine"], 0) + 1
+    waits.sort()
+    return {
+        "served": served,
+        "p50_ms": round(statistics.median(waits) * 1000, 1),
+        "p95_ms": round(waits[min(len(waits) - 1, int(len(waits) * 0.95))] * 1000, 1),
+        "health": selector.stats(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backends", default=",".join(BACKENDS))
+    parser.add_argument("--reps", type=int, default=2)
+    parser.add_argument("--budget-s", type=float, default=None,
+                        help="selector latency budget (in simulated seconds with --simulate)")
+    parser.add_argument("--simulate", action="store_true")
+    parser.add_argument("--time-scale", type=float, default=0.1, help="shrink simulated latencies")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    if args.simulate:
+        backends = simulated_backends(args.time_scale)
+    else:
+        backends = [BACKENDS[name]() for name in args.backends.split(",") if name in BACKENDS]
+    items = phrases()
+    report = {"phrases": len(items), "backends": {}}
+    for b in backends:
+        report["backends"][b.name] = ({"available": True, **measure(b, items, args.reps)} if b.available()
+                                      else {"available": False})
+    scale = args.time_scale if args.simulate else 1.0
+    budget_s = (args.budget_s or LATENCY_BUDGET_S) * scale
+    report["selector"] = run_selector(TTSSelector(backends, budget_s=budget_s), items, args.reps)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    print(f"phrases: {report['phrases']}")
+    for name, r in report["backends"].items():
+        if not r["available"]:
+            print(f"  {name:<8} not available")
+            continue
+        for lang in ("en", "hi"):
+            if lang in r:
+                print(f"  {name:<8} {lang}  " + " ".join(f"{k}={v}" for k, v in r[lang].items()))
+    sel = report["selector"]
+    print(f"selector: p50={sel['p50_ms']}ms p95={sel['p95_ms']}ms served={sel['served']}")
+    for key, h in sel["health"].items():
+        print(f"  {key:<12} " + " ".join(f"{k}={v}" for k, v in h.items()))
+
+
+if __name__ == "__main__":
+    main()
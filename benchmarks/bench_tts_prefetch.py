@@ -0,0 +1,112 @@
+"""Time the user waits for each prompt's audio in the ree.py dialog, with and without TTS prefetch.
+
+    python benchmarks/bench_tts_prefetch.py [--synth-ms 600] [--turn-s 3] [--sessions 5] [--warm] [--json]
+
+Walks the dialog as ree.main() does (welcome, language, name, greeting, address
+question, tab selection, goodbye) against a stand-in synthesizer that takes
+--synth-ms per phrase, with playback and user turns simulated by sleeps of their
+real-time length scaled by --time-scale. Every session uses a fresh name, so the
+greeting is always a new render. --warm pre-renders the static prompts first, as a
+kiosk that has run before would have them on disk. Reports the wait before each
+prompt can start playing and the prefetcher's hit/miss/wasted counts.
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dialog import PROMPTS, FIXED_PHRASES, get_time_based_greeting, next_prompts  # noqa: E402
+from tts_cache import TTSCache  # noqa: E402
+from tts_prefetch import TTSPrefetcher  # noqa: E402
+
+NAMES = ["Asha", "Ravi Kumar", "Meera", "John", "Priya Singh", "Arjun", "Neha", "Vikram", "Sara", "Imran"]
+
+
+def walk(cache, prefetcher, lang, name, args, waits):
+    scale = args.time_scale
+
+    def prefetch(step, **kw):
+        if prefetcher:
+            prefetcher.prefetch(next_prompts(step, lang=kw.get("lang", lang), name=kw.get("name")))
+
+    def say(label, text, tts_lang):
+        t0 = time.perf_counter()
+        data = prefetcher.take(text, tts_lang) if prefetcher else None
+        if data is None:
+            cache.load(text, tts_lang)
+        waits.setdefault(label, []).append(time.perf_counter() - t0)
+        time.sleep(len(text) * 0.06 * scale)            # playback, ~60 ms per character
+
+    def user_turn():
+        time.sleep(args.turn_s * scale)                  # user speaking, endpointing and ASR
+
+    prefetch("welcome")
+    say("welcome", PROMPTS["welcome"]["en"], "en")
+    prefetch("choose_language")
+    say("choose_lang", PROMPTS["choose_lang"]["en"], "en")
+    user_turn()
+    prefetch("capture_name")
+    say("ask_name", PROMPTS["ask_name"][lang], lang)
+    user_turn()
+    prefetch("name_known", name=name)
+    say("greeting", f"{get_time_based_greeting(lang)}, {name}", lang)
+    prefetch("ask_address")
+    say("ask_address_option", PROMPTS["ask_address_option"][lang], lang)
+    user_turn()
+    say("now_select_tab", PROMPTS["now_select_tab"][lang], lang)
+    prefetch("select_tab", name=name)
+    user_turn()
+    say("goodbye", PROMPTS["goodbye"][lang], lang)
+
+
+def run(args, use_prefetch):
+    waits = {}
+    stats = []
+    for i in range(args.sessions):
+        cache_dir = tempfile.mkdtemp(prefix="oxland_tts_")
+        try:
+            cache = TTSCache(cache_dir=cache_dir,
+                             synthesize=lambda text, lang, voice=None: time.sleep(args.synth_ms / 1000) or text.encode())
+            if args.warm:
+                cache.prewarm(PROMPTS, FIXED_PHRASES)
+            prefetcher = TTSPrefetcher(cache) if use_prefetch else None
+            walk(cache, prefetcher, "hi" if i % 2 else "en", NAMES[i % len(NAMES)], args, waits)
+            if prefetcher:
+                prefetcher.close()
+                stats.append(prefetcher.stats())
+        finally:
+            shutil.rmtree(cache_dir, ignore_errors=True)
+    out = {label: round(statistics.median(v) * 1000, 1) for label, v in waits.items()}
+    out["total_wait_ms"] = round(sum(sum(v) for v in waits.values()) / args.sessions * 1000, 1)
+    if stats:
+        out["prefetch"] = {k: sum(s[k] for s in stats) for k in ("scheduled", "hits", "late_hits", "misses", "wasted")}
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--synth-ms", type=float, default=600)
+    parser.add_argument("--turn-s", type=float, default=3.0)
+    parser.add_argument("--time-scale", type=float, default=0.25, help="shrink playback and user turns")
+    parser.add_argument("--sessions", type=int, default=4)
+    parser.add_argument("--warm", action="store_true")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    report = {"without_prefetch": run(args, False), "with_prefetch": run(args, True)}
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+        return
+    print("median wait before each prompt can play (ms):")
+    for name, r in report.items():
+        print(f"  {name:<17} " + " ".join(f"{k}={v}" for k, v in r.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""Time to first audio against text length, for whole-string TTS and sentence-chunked streaming.
+
+    python benchmarks/bench_tts_stream.py [--base-ms 300] [--per-char-ms 8] [--workers 2] [--json]
+
+Speaks the dialog's prompts and a set of "Opening Google Maps for {address}. Exiting
+now." lines through StreamingSpeaker and through a single whole-string render, each with
+an empty cache and a stand-in synthesizer that takes --base-ms plus --per-char-ms per
+character (a network TTS's shape). Playback is simulated at ~60 ms of audio per
+character from the moment each chunk reaches the player. Reports per phrase the time to
+first audio, the silence between chunks (underruns where the next chunk was not
+rendered before the previous one finished) and when speech ends.
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from audio_player import SpeechHandle, StreamHandle  # noqa: E402
+from dialog import PROMPTS  # noqa: E402
+from tts_cache import TTSCache  # noqa: E402
+from tts_stream import StreamingSpeaker, split_chunks  # noqa: E402
+
+CHAR_S = 0.06
+ADDRESSES = [
+    "Pune",
+    "MG Road, Bengaluru",
+    "221B Baker Street, Marylebone, London",
+    "Plot 14, Sector 62, Noida, Gautam Buddh Nagar, Uttar Pradesh 201309",
+    "Survey number 118, near the old water tank, Wagholi, Haveli taluka, Pune district, Maharashtra 412207",
+]
+
+
+class TimelinePlayer:
+    """Records when each clip reaches the player and derives the playback timeline from it."""
+
+    def __init__(self, t0, scale):
+        self.t0 = t0
+        self.scale = scale
+        self.first_audio = None
+        self.gaps = 0.0
+        self.underruns = 0
+        self.end = None
+        self._done = threading.Event()
+
+    def _clip_s(self, data):
+        return len(data.decode("utf-8")) * CHAR_S * self.scale
+
+    def play(self, data):
+        self.first_audio = time.perf_counter() - self.t0
+        self.end = self.first_audio + self._clip_s(data)
+        self._done.set()
+        return SpeechHandle.finished()
+
+    def play_stream(self):
+        handle = StreamHandle()
+        threading.Thread(target=self._consume, args=(handle,), daemon=True).start()
+        return handle
+
+    def _consume(self, handle):
+        for data in handle.chunks():
+            arrived = time.perf_counter() - self.t0
+            if self.first_audio is None:
+                self.first_audio = self.end = arrived
+            elif arrived > self.end:
+                self.gaps += arrived - self.end
+                self.underruns += 1
+                self.end = arrived
+            self.end += self._clip_s(data)
+        self._done.set()
+
+    def wait(self):
+        self._done.wait()
+
+
+def phrases():
+    items = [(text, lang) for by_lang in PROMPTS.values() for lang, text in by_lang.items()]
+    items.extend((f"Opening Google Maps for {a}. Exiting now.", "en") for a in ADDRESSES)
+    return sorted(items, key=lambda item: len(item[0]))
+
+
+def measure(text, lang, args, streaming):
+    cache_dir = tempfile.mkdtemp(prefix="oxland_tts_")
+    scale = args.time_scale
+
+    def synthesize(t, lang, voice=None):
+        time.sleep((args.base_ms + args.per_char_ms * len(t)) / 1000 * scale)
+        return t.encode("utf-8")
+
+    try:
+        cache = TTSCache(cache_dir=cache_dir, synthesize=synthesize)
+        player = TimelinePlayer(time.perf_counter(), scale)
+        if streaming:
+            speaker = StreamingSpeaker(cache, player, workers=args.workers)
+            speaker.speak(text, lang)
+            player.wait()
+            speaker.close()
+        else:
+            player.play(cache.load(text, lang))
+        return {"first_audio_ms": round(player.first_audio / scale * 1000, 1),
+                "gap_ms": round(player.gaps / scale * 1000, 1),
+                "underruns": player.underruns,
+                "end_ms": round(player.end / scale * 1000, 1)}
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-ms", type=float, default=300)
+    parser.add_argument("--per-char-ms", type=float, default=8)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--time-scale", type=float, default=1.0, help="shrink synthesis and playback time")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    rows = []
+    for text, lang in phrases():
+        rows.append({"chars": len(text), "chunks": len(split_chunks(text)), "lang": lang, "text": text,
+                     "whole": measure(text, lang, args, False), "streamed": measure(text, lang, args, True)})
+    multi = [r for r in rows if r["chunks"] > 1]
+    summary = {
+        "phrases": len(rows),
+        "multi_chunk": len(multi),
+        "median_first_audio_ms_whole": round(statistics.median(r["whole"]["first_audio_ms"] for r in multi), 1),
+        "median_first_audio_ms_streamed": round(statistics.median(r["streamed"]["first_audio_ms"] for r in multi), 1),
+        "underruns": sum(r["streamed"]["underruns"] for r in multi),
+    } if multi else {"phrases": len(rows), "multi_chunk": 0}
+    if args.json:
+        print(json.dumps({"summary": summary, "rows": rows}, indent=2, ensure_ascii=False))
+        return
+    print(f"{'chars':>5} {'chunks':>6}  {'first audio whole':>17} {'streamed':>9} {'gap':>7}  text")
+    for r in rows:
+        print(f"{r['chars']:>5} {r['chunks']:>6}  {r['whole']['first_audio_ms']:>15}ms "
+              f"{r['streamed']['first_audio_ms']:>7}ms {r['streamed']['gap_ms']:>5}ms  {r['text'][:48]}")
+    print(" ".join(f"{k}={v}" for k, v in summary.items()))
+
+
+if __name__ == "__main__":
+    main()
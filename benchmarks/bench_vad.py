@@ -0,0 +1,60 @@
+"""Replay WAV files through the streaming endpointer and report when each utterance is handed off.
+
+    python benchmarks/bench_vad.py recordings/*.wav [--hangover-ms 600] [--json]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vad import Endpointer, WavSource  # noqa: E402
+
+
+def run_file(path, **kwargs):
+    src = WavSource(path)
+    ep = Endpointer(samplerate=src.samplerate, **kwargs)
+    fed = 0
+    t0 = time.perf_counter()
+    for block in src.blocks():
+        fed += len(block)
+        if ep.feed(block):
+            break
+    cpu_s = time.perf_counter() - t0
+    audio = ep.audio()
+    file_s = len(src.samples) / src.samplerate
+    return {
+        "file": os.path.basename(path),
+        "file_s": round(file_s, 3),
+        "utterance_s": round(len(audio) / src.samplerate, 3),
+        "handoff_at_s": round(fed / src.samplerate, 3),  # stream position when ASR would start
+        "timed_out": ep.timed_out,
+        "vad_cpu_ms": round(cpu_s * 1000, 3),
+        "threshold_db": round(ep.vad.threshold_db, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("wavs", nargs="+")
+    parser.add_argument("--pre-roll-ms", type=int, default=300)
+    parser.add_argument("--hangover-ms", type=int, default=600)
+    parser.add_argument("--max-duration", type=float, default=8.0)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    rows = [run_file(p, pre_roll_ms=args.pre_roll_ms, hangover_ms=args.hangover_ms,
+                     max_duration=args.max_duration) for p in args.wavs]
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+    for r in rows:
+        print(f"{r['file']:<32} file={r['file_s']:6.2f}s utt={r['utterance_s']:5.2f}s "
+              f"handoff={r['handoff_at_s']:5.2f}s vad={r['vad_cpu_ms']:7.2f}ms thr={r['threshold_db']}dB"
+              + (" TIMEOUT" if r["timed_out"] else ""))
+
+
+if __name__ == "__main__":
+    main()
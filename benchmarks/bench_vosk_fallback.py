@@ -0,0 +1,70 @@
+"""Compare Vosk fallback latency: model reloaded per call (old listen_once_vosk) vs the shared VoskPool.
+
+    python benchmarks/bench_vosk_fallback.py sample.wav [--model vosk-model-small-en-us-0.15] [-n 10] [--threads 4]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import wave
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vosk_pool import VoskPool  # noqa: E402
+
+
+def reload_per_call(model_path, pcm):
+    from vosk import Model as VoskModel, KaldiRecognizer
+    rec = KaldiRecognizer(VoskModel(model_path), 16000)
+    rec.AcceptWaveform(pcm)
+    return json.loads(rec.FinalResult()).get("text", "")
+
+
+def timed(fn, n, threads=1):
+    def one(_):
+        t0 = time.perf_counter()
+        text = fn()
+        return time.perf_counter() - t0, text
+
+    with ThreadPoolExecutor(max_workers=threads) as ex:
+        results = list(ex.map(one, range(n)))
+    lat = sorted(r[0] for r in results)
+    return {
+        "n": n,
+        "threads": threads,
+        "mean_ms": round(statistics.mean(lat) * 1000, 2),
+        "p50_ms": round(lat[len(lat) // 2] * 1000, 2),
+        "p95_ms": round(lat[min(len(lat) - 1, int(len(lat) * 0.95))] * 1000, 2),
+        "distinct_texts": sorted({r[1] for r in results}),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("wav")
+    parser.add_argument("--model", default="vosk-model-small-en-us-0.15")
+    parser.add_argument("-n", type=int, default=10)
+    parser.add_argument("--threads", type=int, default=1)
+    args = parser.parse_args()
+
+    with wave.open(args.wav, "rb") as w:
+        pcm = w.readframes(w.getnframes())
+
+    pool = VoskPool(args.model)
+    t0 = time.perf_counter()
+    pool.model
+    load_ms = (time.perf_counter() - t0) * 1000
+
+    report = {
+        "model_load_ms": round(load_ms, 2),
+        "before_reload_per_call": timed(lambda: reload_per_call(args.model, pcm), args.n),
+        "after_shared_pool": timed(lambda: pool.transcribe(pcm), args.n, args.threads),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
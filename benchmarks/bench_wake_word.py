@@ -0,0 +1,195 @@
+"""Idle CPU and false-wake rate of the wake-word gate on a noise corpus, against always-on Whisper.
+
+    python benchmarks/bench_wake_word.py noise_dir [--wake-clips dir] [--vosk-model path] [--whisper small] [--json]
+    python benchmarks/bench_wake_word.py --synthetic 10 [--json]
+
+noise_dir holds 16 kHz mono WAVs recorded where the kiosk stands (chatter, HVAC,
+traffic) without the wake word, so every wake in them is a false wake. --wake-clips
+holds recordings of people saying "Oxland ..."; for those the detection rate and the
+audio handed over after the keyword are reported.
+
+The gated front end (energy gate + Vosk wake grammar) is timed in CPU seconds per
+second of audio. The always-on baseline endpoints the same audio into utterances of at
+most 3 s, as ree.py's standby does, each of which would be decoded by Whisper; with
+--whisper (and faster-whisper installed) they are decoded and timed, else counted.
+
+--synthetic N uses N minutes of generated room noise with speech-like bursts instead of
+a corpus. Without Vosk installed the keyword decode is skipped and only the energy gate
+is measured: its CPU cost and the share of audio that would reach Vosk.
+"""
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from batch_transcribe import read_audio  # noqa: E402
+from vad import SAMPLE_RATE, Endpointer, as_float32, normalize_audio  # noqa: E402
+from vosk_pool import VOSK_MODEL_PATH, VoskPool  # noqa: E402
+from wakeword import WakeWordGate  # noqa: E402
+
+BLOCK = SAMPLE_RATE * 30 // 1000
+
+
+class _NoDecode:
+    """Recognizer stand-in when Vosk is not installed: hears nothing, so only the gate is timed."""
+
+    def SetWords(self, on):
+        pass
+
+    def AcceptWaveform(self, pcm):
+        return False
+
+    def PartialResult(self):
+        return '{"partial": ""}'
+
+    def FinalResult(self):
+        return '{"text": ""}'
+
+    def Reset(self):
+        pass
+
+
+class _NoDecodePool:
+    @contextlib.contextmanager
+    def recognizer(self, grammar=None):
+        yield _NoDecode()
+
+
+def vosk_pool(model_path):
+    try:
+        import vosk  # noqa: F401
+    except ImportError:
+        return None
+    return VoskPool(model_path) if os.path.isdir(model_path) else None
+
+
+def load_dir(path):
+    clips = []
+    for fname in sorted(os.listdir(path)):
+        if fname.lower().endswith(".wav"):
+            clips.append((fname, as_float32(read_audio(os.path.join(path, fname)))))
+    return clips
+
+
+def synthetic(minutes, seed=0):
+    """Room noise at about -55 dBFS with 0.5-3 s syllable-modulated bursts every 4-15 s."""
+    rng = np.random.default_rng(seed)
+    n = int(minutes * 60 * SAMPLE_RATE)
+    audio = rng.normal(0, 10 ** (-55 / 20), n).astype(np.float32)
+    t = 0
+    while True:
+        t += int(rng.uniform(4, 15) * SAMPLE_RATE)
+        length = int(rng.uniform(0.5, 3.0) * SAMPLE_RATE)
+        if t + length >= n:
+            break
+        k = np.arange(length) / SAMPLE_RATE
+        envelope = np.clip(np.sin(2 * np.pi * rng.uniform(3, 6) * k), 0, None)
+        burst = np.convolve(rng.normal(0, 1, length), np.ones(8) / 8, mode="same") * envelope
+        audio[t:t + length] += (10 ** (rng.uniform(-35, -20) / 20) * burst).astype(np.float32)
+        t += length
+    return [("synthetic", audio)]
+
+
+def blocks(audio):
+    for i in range(0, len(audio), BLOCK):
+        yield audio[i:i + BLOCK]
+
+
+def run_gate(pool, clips):
+    gate = WakeWordGate(pool)
+    wakes = 0
+    cpu0 = time.process_time()
+    for _, audio in clips:
+        it = blocks(audio)
+        while gate.wait(it) is not None:
+            wakes += 1
+    cpu = time.process_time() - cpu0
+    audio_s = sum(len(a) for _, a in clips) / SAMPLE_RATE
+    return {
+        "audio_min": round(audio_s / 60, 1),
+        "cpu_percent": round(cpu / audio_s * 100, 3),
+        **{k: v for k, v in gate.stats().items() if k not in ("audio_s", "wakes")},
+        "false_wakes": wakes,
+        "false_wakes_per_hour": round(wakes / audio_s * 3600, 2),
+    }
+
+
+def run_baseline(clips, whisper_size=None):
+    model = None
+    if whisper_size:
+        try:
+            from faster_whisper import WhisperModel
+            model = WhisperModel(whisper_size, device="cpu", compute_type="int8")
+        except ImportError:
+            pass
+    windows = []
+    for _, audio in clips:
+        endpointer = Endpointer(max_duration=3, start_timeout=None)
+        for block in blocks(audio):
+            if endpointer.feed(block):
+                windows.append(endpointer.audio().copy())
+                endpointer.reset()
+    audio_s = sum(len(a) for _, a in clips) / SAMPLE_RATE
+    out = {"whisper_decodes": len(windows),
+           "whisper_decodes_per_hour": round(len(windows) / audio_s * 3600, 1),
+           "whisper_audio_s": round(sum(len(w) for w in windows) / SAMPLE_RATE, 1)}
+    if model is not None:
+        cpu0 = time.process_time()
+        for w in windows:
+            list(model.transcribe(normalize_audio(w), language="en", beam_size=1)[0])
+        out["cpu_percent"] = round((time.process_time() - cpu0) / audio_s * 100, 3)
+    return out
+
+
+def run_positives(pool, clips):
+    gate = WakeWordGate(pool)
+    detected, tails = 0, []
+    silence = np.zeros(SAMPLE_RATE, dtype=np.float32)
+    for _, audio in clips:
+        tail = gate.wait(blocks(np.concatenate((audio, silence))))
+        if tail is not None:
+            detected += 1
+            tails.append(len(tail) / SAMPLE_RATE)
+    return {"clips": len(clips), "detection_rate": round(detected / len(clips), 3) if clips else None,
+            "median_handover_s": round(float(np.median(tails)), 2) if tails else None,
+            "rejected": gate.rejected}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("noise_dir", nargs="?")
+    parser.add_argument("--synthetic", type=float, metavar="MINUTES")
+    parser.add_argument("--wake-clips")
+    parser.add_argument("--vosk-model", default=VOSK_MODEL_PATH)
+    parser.add_argument("--whisper", help="also decode the baseline's utterances with this Whisper size")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+    if not args.noise_dir and not args.synthetic:
+        parser.error("give a noise corpus directory or --synthetic MINUTES")
+
+    noise = load_dir(args.noise_dir) if args.noise_dir else synthetic(args.synthetic)
+    pool = vosk_pool(args.vosk_model)
+    report = {
+        "keyword_decode": "vosk" if pool else "skipped (vosk or its model not available)",
+        "gated": run_gate(pool or _NoDecodePool(), noise),
+        "always_on": run_baseline(noise, args.whisper),
+    }
+    if args.wake_clips and pool:
+        report["wake_clips"] = run_positives(pool, load_dir(args.wake_clips))
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    print(f"keyword decode: {report['keyword_decode']}")
+    for name in ("gated", "always_on", "wake_clips"):
+        if name in report:
+            print(f"  {name:<10} " + " ".join(f"{k}={v}" for k, v in report[name].items()))
+
+
+if __name__ == "__main__":
+    main()
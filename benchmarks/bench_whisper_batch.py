@@ -0,0 +1,105 @@
+"""Throughput and latency of micro-batched Whisper vs one call per utterance, under concurrent load.
+
+    python benchmarks/bench_whisper_batch.py clips/*.wav [--model small] [--concurrency 1,4,8,16]
+                                             [--requests 64] [--max-batch 8] [--wait-ms 15] [--json]
+
+Each level keeps `concurrency` requests in flight (as that many kiosks finishing
+utterances would) cycling through the clips (16-bit mono 16 kHz WAV). "sequential"
+is whisper_decode.decode on a model with num_workers=concurrency; "batched" is
+WhisperScheduler on a model with tune_threads() workers/threads. Reports requests/s,
+audio seconds per second, latency percentiles and the scheduler's batch histogram.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import wave
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vad import as_float32, normalize_audio  # noqa: E402
+from whisper_batch import WhisperScheduler, tune_threads  # noqa: E402
+from whisper_decode import decode  # noqa: E402
+
+
+def load_clips(paths):
+    clips = []
+    for path in paths:
+        with wave.open(path, "rb") as w:
+            if (w.getsampwidth(), w.getnchannels(), w.getframerate()) != (2, 1, 16000):
+                raise ValueError(f"{path}: expected 16-bit mono 16 kHz WAV")
+            pcm = np.frombuffer(w.readframes(w.getnframes()), dtype="<i2")
+        clips.append(normalize_audio(as_float32(pcm)))
+    return clips
+
+
+def drive(fn, clips, concurrency, requests):
+    latencies = []
+
+    def one(i):
+        t0 = time.perf_counter()
+        fn(clips[i % len(clips)])
+        latencies.append(time.perf_counter() - t0)
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(requests)))
+    wall = time.perf_counter() - t0
+    audio_s = sum(len(clips[i % len(clips)]) for i in range(requests)) / 16000
+    latencies.sort()
+    return {
+        "requests_per_s": round(requests / wall, 2),
+        "audio_s_per_s": round(audio_s / wall, 2),
+        "latency_ms_p50": round(statistics.median(latencies) * 1000, 1),
+        "latency_ms_p95": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("clips", nargs="+")
+    parser.add_argument("--model", default="small")
+    parser.add_argument("--language", default="en")
+    parser.add_argument("--concurrency", default="1,4,8,16")
+    parser.add_argument("--requests", type=int, default=64)
+    parser.add_argument("--max-batch", type=int, default=8)
+    parser.add_argument("--wait-ms", type=float, default=15)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    from faster_whisper import WhisperModel
+
+    clips = load_clips(args.clips)
+    cores = os.cpu_count() or 1
+    inter, intra = tune_threads(cores)
+    report = {"cores": cores, "batched_threads": {"num_workers": inter, "cpu_threads": intra}, "levels": []}
+    batched_model = WhisperModel(args.model, device="cpu", compute_type="int8", num_workers=inter, cpu_threads=intra)
+    for concurrency in (int(c) for c in args.concurrency.split(",")):
+        model = WhisperModel(args.model, device="cpu", compute_type="int8", num_workers=concurrency)
+        sequential = drive(lambda a: decode(model, a, args.language, mode="adaptive"), clips, concurrency, args.requests)
+        del model
+        scheduler = WhisperScheduler(batched_model, max_batch=args.max_batch, max_wait_ms=args.wait_ms, workers=inter)
+        batched = drive(lambda a: scheduler.transcribe(a, args.language), clips, concurrency, args.requests)
+        stats = scheduler.stats()
+        scheduler.close()
+        batched.update(batch_sizes=stats["batch_sizes"], queue_depth_at_dispatch=stats["queue_depth_at_dispatch"],
+                       wait_ms_p95=stats["wait_ms_p95"])
+        report["levels"].append({"concurrency": concurrency, "sequential": sequential, "batched": batched})
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    print(f"cores={cores} batched: num_workers={inter} cpu_threads={intra}")
+    for level in report["levels"]:
+        print(f"concurrency {level['concurrency']}:")
+        for name in ("sequential", "batched"):
+            print(f"  {name:<11} " + " ".join(f"{k}={v}" for k, v in level[name].items()))
+
+
+if __name__ == "__main__":
+    main()
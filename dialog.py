@@ -0,0 +1,114 @@
+import datetime
+
+from intents import IntentEngine
+
+# Dialog content shared by the kiosk script (ree.py) and the network gateway; nothing
+# here touches audio devices.
+ASSISTANT_NAME = "Oxland"
+COMPANY_NAME = "Oxbow Intellect Private Limited"
+
+intent_engine = IntentEngine()
+
+# ------------------ Intents ------------------
+def detect_language_choice(text: str):
+    lang = intent_engine.classify(text).best(["lang_en", "lang_hi"])
+    return {"lang_en": "en", "lang_hi": "hi"}.get(lang)
+
+def get_time_based_greeting(lang="en"):
+    hour = datetime.datetime.now().hour
+    if lang == "en":
+        if 5 <= hour < 12:
+            return "Good morning"
+        elif 12 <= hour < 15:
+            return "Good noon"
+        elif 15 <= hour < 18:
+            return "Good afternoon"
+        else:
+            return "Good evening"
+    else:
+        if 5 <= hour < 12:
+            return "सुप्रभात"
+        elif 12 <= hour < 15:
+            return "शुभ दोपहर"
+        elif 15 <= hour < 18:
+            return "शुभ अपराह्न"
+        else:
+            return "शुभ संध्या"
+
+def check_identity_question(text: str):
+    return identity_answer(intent_engine.classify(text))
+
+def identity_answer(result):
+    intent = result.first(["assistant_name", "company"])
+    if intent == "assistant_name":
+        return f"My name is {ASSISTANT_NAME}"
+    if intent == "company":
+        return f"I work at {COMPANY_NAME}"
+    return None
+
+def ask_yes_no(text):
+    return intent_engine.classify(text).best(["yes", "no"])
+
+# ------------------ Prompts ------------------
+PROMPTS = {
+    "welcome": {"en": "Welcome to Oxland"},
+    "choose_lang": {"en": "Please choose your language: English or Hindi."},
+    "ask_name": {"en": "What is your name?", "hi": "कृपया अपना नाम बताइए।"},
+    "ask_address_option": {"en": "Do you want to provide an address? Yes or No?", "hi": "क्या आप पता देना चाहते हैं? हाँ या नहीं?"},
+    "ask_address": {"en": "Please say the address you want to search on Google Maps.", "hi": "कृपया वह पता बताएं जिसे आप Google Maps पर देखना चाहते हैं।"},
+    "now_select_tab": {"en": "Now you can select the tab.", "hi": "अब आप टैब चुन सकते हैं।"},
+    "goodbye": {"en": "Opening the tab. Exiting. Goodbye!", "hi": "टैब खोल रहा हूँ। बाहर निकल रहा हूँ। अलविदा!"},
+    "not_found": {"en": "Sorry, I couldn't find that tab. Exiting.", "hi": "क्षमा करें, वह टैब नहीं मिला। बाहर निकल रहा हूँ।"},
+    # Session mode (ree.py --session)
+    "ask_command": {"en": "What would you like to open? Say a tab name, address, or exit.", "hi": "आप क्या खोलना चाहते हैं? टैब का नाम, पता, या एग्ज़िट बोलिए।"},
+    "next_command": {"en": "Anything else?", "hi": "और कुछ?"},
+    "starting_over": {"en": "Okay, starting over.", "hi": "ठीक है, फिर से शुरू करते हैं।"}
+}
+
+# Fixed replies spoken outside PROMPTS; pre-rendered into the TTS cache at startup.
+FIXED_PHRASES = [
+    ("Please say English or Hindi.", "en"),
+    ("Okay, exiting now. Goodbye!", "en"),
+    ("Okay, exiting now. Goodbye!", "hi"),
+    ("Please say Yes or No.", "en"),
+    ("Please say Yes or No.", "hi"),
+    ("Sorry, I didn't catch that. Please say your name again.", "en"),
+    ("Sorry, I didn't catch that. Please say your name again.", "hi"),
+    ("I didn't match that to any tab. Please say again.", "en"),
+    ("I didn't match that to any tab. Please say again.", "hi"),
+    (f"My name is {ASSISTANT_NAME}", "en"),
+    (f"My name is {ASSISTANT_NAME}", "hi"),
+    (f"I work at {COMPANY_NAME}", "en"),
+    (f"I work at {COMPANY_NAME}", "hi"),
+]
+
+# ------------------ Dialog graph ------------------
+# What can be spoken after each step, most likely first; rendered ahead of time while the
+# step's own capture and recognition run. Templated replies appear once their value is known.
+def next_prompts(step, lang="en", name=None):
+    if step == "welcome":
+        return [(PROMPTS["choose_lang"]["en"], "en")]
+    if step == "choose_language":
+        return [(PROMPTS["ask_name"]["en"], "en"), (PROMPTS["ask_name"]["hi"], "hi"),
+                ("Please say English or Hindi.", "en")]
+    if step == "capture_name":
+        return [(PROMPTS["ask_address_option"][lang], lang),
+                ("Sorry, I didn't catch that. Please say your name again.", lang)]
+    if step == "name_known":
+        return [(f"{get_time_based_greeting(lang)}, {name}", lang), (PROMPTS["ask_address_option"][lang], lang)]
+    if step == "ask_address":
+        return [(PROMPTS["now_select_tab"][lang], lang), (PROMPTS["ask_address"][lang], lang),
+                ("Please say Yes or No.", lang)]
+    if step == "select_tab":
+        return [(PROMPTS["goodbye"][lang], lang), ("I didn't match that to any tab. Please say again.", lang),
+                (f"Your name is {name}", lang), ("Okay, exiting now. Goodbye!", lang), (PROMPTS["not_found"][lang], lang)]
+    if step == "command":
+        return [(PROMPTS["next_command"][lang], lang), (PROMPTS["ask_address"][lang], lang),
+                ("I didn't match that to any tab. Please say again.", lang), (f"Your name is {name}", lang)]
+    return []
+
+# ------------------ Decoding vocabulary ------------------
+def decode_vocabulary(route_names, lang="en"):
+    vocabulary = [ASSISTANT_NAME, "English", "Hindi", *route_names]
+    context = [by_lang[lang] for by_lang in PROMPTS.values() if lang in by_lang]
+    return vocabulary, context
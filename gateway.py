@@ -0,0 +1,374 @@
+"""Serve the kiosk dialog to many clients over WebSocket with one shared set of warm models.
+
+    python gateway.py [--host 127.0.0.1] [--port 8765] [--asr-workers 4] [--no-batch] [--batch-wait-ms 15]
+
+Protocol (one WebSocket per session):
+  client -> server
+    text   {"type": "hello", "tts": true}        optional, sent first; tts=false skips audio frames
+    binary int16 little-endian mono PCM at 16 kHz, any block size
+    text   {"type": "text", "text": "..."}        typed answer instead of speech
+  server -> client
+    text   {"type": "say", "text": ..., "lang": ...}, followed by one binary audio frame (mp3 or wav) if tts
+    text   {"type": "listen", "step": ...}        start streaming the answer now
+    text   {"type": "transcript", "step": ..., "text": ..., "asr_ms": ...}
+    text   {"type": "route", "tab": ..., "url": ...} / {"type": "maps", "url": ...}
+    text   {"type": "end", "reason": ...}
+"""
+import argparse
+import asyncio
+import functools
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from dialog import (PROMPTS, FIXED_PHRASES, intent_engine, detect_language_choice, get_time_based_greeting,
+                    identity_answer, ask_yes_no, decode_vocabulary)
+from grammars import DialogGrammars, strip_unknown
+from model_registry import ModelRegistry
+from routes_catalog import RoutesCatalog, ROUTES_PATH
+from tts_backends import TTSSelector
+from tts_cache import TTSCache
+from vad import Endpointer, as_float32, normalize_audio, to_pcm16
+from vosk_pool import VoskPool, VOSK_MODEL_PATH
+from whisper_batch import WhisperScheduler, tune_threads, MAX_BATCH, MAX_WAIT_MS
+from whisper_decode import build_prompt, decode
+
+HOST = os.environ.get("OXLAND_GATEWAY_HOST", "127.0.0.1")
+PORT = int(os.environ.get("OXLAND_GATEWAY_PORT", 8765))
+SAMPLE_RATE = 16000
+LISTEN_TIMEOUT = 30.0   # seconds without audio before a session is dropped
+HELLO_TIMEOUT = 0.5
+ASR_DEADLINE_MS = 60    # longest a finished utterance waits for others to share its Whisper batch
+
+
+class SharedModels:
+    """Warm Whisper, the Vosk pool, routes, grammars and the TTS cache, shared by every session."""
+
+    def __init__(self, asr_workers=2, whisper_size="small", vosk_path=VOSK_MODEL_PATH, routes_path=ROUTES_PATH,
+                 batch=True, max_batch=MAX_BATCH, batch_wait_ms=MAX_WAIT_MS):
+        self.registry = ModelRegistry()
+        self.batch = batch
+        if batch:
+            # Few CTranslate2 workers, each batching many utterances across all its threads.
+            inter, intra = tune_threads()
+            self.registry.register("whisper", functools.partial(self._load_whisper, whisper_size, inter, intra))
+            self.registry.register("whisper_batch", lambda: WhisperScheduler(
+                self.registry.get("whisper"), max_batch=max_batch, max_wait_ms=batch_wait_ms, workers=inter))
+            # Enough ASR threads to have a full batch waiting on the scheduler at once.
+            asr_workers = max(asr_workers, max_batch * inter)
+        else:
+            # CTranslate2 runs up to num_workers transcriptions of the one model in parallel.
+            self.registry.register("whisper", functools.partial(self._load_whisper, whisper_size, asr_workers))
+        self.registry.register("vosk", functools.partial(self._load_vosk, vosk_path))
+        self.executor = ThreadPoolExecutor(max_workers=asr_workers, thread_name_prefix="asr")
+        self.grammars = DialogGrammars()
+        self.decode_prompts = {}
+        self.catalog = RoutesCatalog(routes_path)
+        self.catalog.subscribe(self._routes_changed)
+        self.catalog.reload()
+        self.route_index = self.catalog.index
+        self.tts_selector = TTSSelector()
+        self.tts_cache = TTSCache(synthesize=self.tts_selector)
+
+    def _routes_changed(self, catalog, diff):
+        self.decode_prompts = {lang: build_prompt(*decode_vocabulary(catalog.index.names(), lang))
+                               for lang in ("en", "hi")}
+        for stale in self.grammars.rebuild(catalog.index):
+            if self.registry.is_ready("vosk"):
+                try:
+                    self.registry.get("vosk").discard(stale)
+                except RuntimeError:
+                    pass
+
+    @staticmethod
+    def _load_whisper(size, workers, threads=0):
+        from faster_whisper import WhisperModel
+        return WhisperModel(size, device="cpu", compute_type="int8", num_workers=workers, cpu_threads=threads)
+
+    @staticmethod
+    def _load_vosk(path):
+        pool = VoskPool.shared(path)
+        pool.model
+        return pool
+
+    def warm(self):
+        self.registry.warm()
+        self.catalog.watch()
+        self.tts_cache.prewarm_async(PROMPTS, FIXED_PHRASES)
+
+    async def run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, functools.partial(fn, *args))
+
+    # Blocking recognizers; called on the ASR executor.
+    def recognize_constrained(self, audio, step):
+        """The step's grammar decode only: None when there is no grammar or it heard nothing."""
+        grammar = self.grammars.grammar(step)
+        if not grammar:
+            return None
+        try:
+            return strip_unknown(self.registry.get("vosk").transcribe(to_pcm16(audio).tobytes(), grammar)) or None
+        except Exception as e:
+            print(f"[Vosk error: {e}]")
+            return None
+
+    def recognize(self, audio, lang="en", step=None):
+        if step and lang == "en":
+            text = self.recognize_constrained(audio, step)
+            if text:
+                return text
+        if self.batch:
+            text, _, _ = self.registry.get("whisper_batch").transcribe(audio, lang, self.decode_prompts.get(lang),
+                                                                       deadline_ms=ASR_DEADLINE_MS)
+        else:
+            text, _, _ = decode(self.registry.get("whisper"), audio, lang, self.decode_prompts.get(lang))
+        return text
+
+    def stats(self):
+        return self.registry.get("whisper_batch").stats() if self.batch else {}
+
+    def recognize_name(self, audio, lang="en"):
+        try:
+            return self.registry.get("vosk").transcribe(to_pcm16(audio).tobytes()).title()
+        except Exception as e:
+            print(f"[Vosk error: {e}]")
+            return self.recognize(audio, lang)
+
+
+class SessionEnded(Exception):
+    pass
+
+
+class Session:
+    """One client connection walking choose_language -> capture_name -> ask_address -> select_tab."""
+
+    def __init__(self, ws, shared: SharedModels):
+        self.ws = ws
+        self.shared = shared
+        self.tts = True
+        self.listening = False
+        self.closed = False
+        self.hello = asyncio.Event()
+        self.inbox = asyncio.Queue()
+
+    # ---- transport ----
+    async def send(self, **message):
+        await self.ws.send(json.dumps(message, ensure_ascii=False))
+
+    async def receive(self):
+        try:
+            async for message in self.ws:
+                if isinstance(message, bytes):
+                    if self.listening:
+                        self.inbox.put_nowait(message)
+                    continue
+                msg = json.loads(message)
+                if msg.get("type") == "hello":
+                    self.tts = msg.get("tts", True)
+                    self.hello.set()
+                elif msg.get("type") == "text" and self.listening:
+                    self.inbox.put_nowait(msg.get("text", ""))
+        finally:
+            self.closed = True
+            self.inbox.put_nowait(None)
+
+    async def say(self, text, lang="en"):
+        await self.send(type="say", text=text, lang=lang)
+        if self.tts:
+            try:
+                await self.ws.send(await self.shared.run(self.shared.tts_cache.load, text, lang))
+            except Exception as e:
+                print(f"[TTS error: {e}]")
+
+    async def listen(self, step, lang="en", max_seconds=8):
+        """Endpoint the client's stream server-side and return the recognized text (or None)."""
+        while not self.inbox.empty():
+            self.inbox.get_nowait()
+        if self.closed:
+            raise SessionEnded("disconnected")
+        endpointer = Endpointer(samplerate=SAMPLE_RATE, max_duration=max_seconds, start_timeout=None)
+        self.listening = True
+        await self.send(type="listen", step=step)
+        try:
+            while True:
+                try:
+                    item = await asyncio.wait_for(self.inbox.get(), LISTEN_TIMEOUT)
+                except asyncio.TimeoutError:
+                    raise SessionEnded("timeout")
+                if item is None:
+                    raise SessionEnded("disconnected")
+                if isinstance(item, str):
+                    await self.send(type="transcript", step=step, text=item, asr_ms=0)
+                    return item or None
+                if endpointer.feed(as_float32(np.frombuffer(item, dtype="<i2"))):
+                    break
+        finally:
+            self.listening = False
+        audio = normalize_audio(endpointer.audio())
+        t0 = time.perf_counter()
+        if step == "name":
+            text = await self.shared.run(self.shared.recognize_name, audio, lang)
+        elif step == "language":
+            text = await self._recognize_language(audio)
+        else:
+            text = await self.shared.run(self.shared.recognize, audio, lang, step)
+        await self.send(type="transcript", step=step, text=text, asr_ms=round((time.perf_counter() - t0) * 1000, 1))
+        return text or None
+
+    async def _recognize_language(self, audio):
+        # Grammar only first (no Whisper fallback, that is the en decode below); then en and
+        # hi decodes side by side, first one naming a language wins.
+        text = await self.shared.run(self.shared.recognize_constrained, audio, "language")
+        if detect_language_choice(text or ""):
+            return text
+        decodes = [asyncio.ensure_future(self.shared.run(self.shared.recognize, audio, lang)) for lang in ("en", "hi")]
+        try:
+            for next_done in asyncio.as_completed(decodes):
+                candidate = await next_done
+                if detect_language_choice(candidate):
+                    return candidate
+        finally:
+            for d in decodes:
+                d.cancel()
+        return text or decodes[0].result()
+
+    # ---- dialog ----
+    async def choose_language(self):
+        await self.say(PROMPTS["choose_lang"]["en"], "en")
+        while True:
+            chosen = detect_language_choice(await self.listen("language") or "")
+            if chosen:
+                return chosen
+            await self.say("Please say English or Hindi.", "en")
+
+    async def capture_name(self, chosen):
+        while True:
+            await self.say(PROMPTS["ask_name"][chosen], chosen)
+            name = await self.listen("name", chosen, max_seconds=5)
+            if name:
+                return name
+            await self.say("Sorry, I didn't catch that. Please say your name again.", chosen)
+
+    async def ask_address(self, chosen):
+        await self.say(PROMPTS["ask_address_option"][chosen], chosen)
+        while True:
+            choice = ask_yes_no(await self.listen("yes_no", chosen) or "")
+            if choice == "no":
+                return False
+            if choice != "yes":
+                await self.say("Please say Yes or No.", chosen)
+                continue
+            await self.say(PROMPTS["ask_address"][chosen], chosen)
+            address = await self.listen("address", chosen)
+            if not address:
+                await self.say("Sorry, I didn't catch the address. Exiting.", chosen)
+                return True
+            await self.send(type="maps", url=f"https://www.google.com/maps/place/{address.replace(' ', '+')}")
+            await self.say(f"Opening Google Maps for {address}. Exiting now.", chosen)
+            return True
+
+    async def select_tab(self, chosen, name):
+        while True:
+            text = await self.listen("select_tab", chosen)
+            if not text:
+                continue
+            result = intent_engine.classify(text, self.shared.route_index)
+            if result.score("exit") == 1.0:
+                await self.say("Okay, exiting now. Goodbye!", chosen)
+                return None
+            if result.score("my_name") == 1.0:
+                await self.say(f"Your name is {name}", chosen)
+                continue
+            answer = identity_answer(result)
+            if answer:
+                await self.say(answer, chosen)
+                continue
+            if result.tab_score >= 0.5:
+                return result.tab
+            await self.say("I didn't match that to any tab. Please say again.", chosen)
+
+    async def dialog(self):
+        await self.say(PROMPTS["welcome"]["en"], "en")
+        chosen = await self.choose_language()
+        name = await self.capture_name(chosen)
+        await self.say(f"{get_time_based_greeting(chosen)}, {name}", chosen)
+        if await self.ask_address(chosen):
+            return "address"
+        await self.say(PROMPTS["now_select_tab"][chosen], chosen)
+        tab = await self.select_tab(chosen, name)
+        if tab is None:
+            return "exit"
+        await self.send(type="route", tab=tab, url=self.shared.catalog.url(tab))
+        await self.say(PROMPTS["goodbye"][chosen], chosen)
+        return "route"
+
+    async def serve(self):
+        receiver = asyncio.ensure_future(self.receive())
+        try:
+            # Give the client's hello a moment to arrive so its options apply to the welcome.
+            try:
+                await asyncio.wait_for(self.hello.wait(), HELLO_TIMEOUT)
+            except asyncio.TimeoutError:
+                pass
+            reason = await self.dialog()
+            await self.send(type="end", reason=reason)
+        except SessionEnded as e:
+            reason = str(e)
+        finally:
+            receiver.cancel()
+        return reason
+
+
+async def serve(shared, host=HOST, port=PORT):
+    import websockets
+
+    stats = {"active": 0, "completed": 0}
+
+    async def handler(ws, path=None):
+        stats["active"] += 1
+        t0 = time.monotonic()
+        try:
+            reason = await Session(ws, shared).serve()
+        except Exception as e:
+            reason = f"error: {type(e).__name__}: {e}"
+        finally:
+            stats["active"] -= 1
+            stats["completed"] += 1
+        print(f"(session ended: {reason}, {time.monotonic() - t0:.1f}s, "
+              f"active={stats['active']} completed={stats['completed']})")
+        if shared.batch and stats["completed"] % 50 == 0:
+            print(f"(whisper batching: {json.dumps(shared.stats())})")
+
+    async with websockets.serve(handler, host, port, max_size=2 ** 20):
+        print(f"(Gateway listening on ws://{host}:{port})")
+        await asyncio.Future()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--asr-workers", type=int, default=max(1, (os.cpu_count() or 2) // 2))
+    parser.add_argument("--whisper", default="small")
+    parser.add_argument("--vosk", default=VOSK_MODEL_PATH)
+    parser.add_argument("--routes", default=ROUTES_PATH, help="routes file(s), directory or glob; watched for changes")
+    parser.add_argument("--no-batch", dest="batch", action="store_false",
+                        help="one Whisper call per utterance instead of micro-batching")
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH)
+    parser.add_argument("--batch-wait-ms", type=float, default=MAX_WAIT_MS)
+    args = parser.parse_args()
+
+    shared = SharedModels(asr_workers=args.asr_workers, whisper_size=args.whisper, vosk_path=args.vosk,
+                          routes_path=args.routes, batch=args.batch, max_batch=args.max_batch,
+                          batch_wait_ms=args.batch_wait_ms)
+    shared.warm()
+    try:
+        asyncio.run(serve(shared, args.host, args.port))
+    except KeyboardInterrupt:
+        print("\nGateway stopped.")
+
+
+if __name__ == "__main__":
+    main()
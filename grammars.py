@@ -0,0 +1,65 @@
+import json
+import threading
+
+from intents import INTENT_TABLE
+from route_index import normalize
+
+# Which intents can be answered at each closed-vocabulary dialog step; "routes" adds
+# every route name and alias from the index.
+STEP_INTENTS = {
+    "language": ["lang_en", "lang_hi", "exit"],
+    "yes_no": ["yes", "no", "exit"],
+    "select_tab": ["exit", "my_name", "assistant_name", "company", "routes"],
+    "command": ["exit", "reset", "address", "my_name", "assistant_name", "company", "routes"],
+}
+UNKNOWN = "[unk]"
+
+
+def _english(phrase):
+    # The bundled Vosk model is English; Devanagari phrases are left to Whisper.
+    return phrase.isascii()
+
+
+class DialogGrammars:
+    """Vosk grammars (JSON phrase lists) per dialog step, rebuilt when the routes change.
+
+    Each grammar ends with "[unk]" so out-of-grammar speech decodes as unknown instead
+    of being forced onto the nearest phrase; callers fall back to open vocabulary then.
+    """
+
+    def __init__(self, table=INTENT_TABLE, steps=STEP_INTENTS):
+        self.table = table
+        self.steps = steps
+        self.version = 0
+        self._grammars = {}
+        self._lock = threading.Lock()
+        self.rebuild()
+
+    def rebuild(self, route_index=None):
+        """Recompute every step's grammar; returns the grammars that were replaced."""
+        route_phrases = route_index.phrases() if route_index is not None else []
+        grammars = {}
+        for step, intents in self.steps.items():
+            phrases = []
+            for intent in intents:
+                if intent == "routes":
+                    phrases.extend(route_phrases)
+                    continue
+                spec = self.table.get(intent, {})
+                phrases.extend(normalize(p) for p in (*spec.get("keywords", ()), *spec.get("fuzzy", ())))
+            phrases = [p for p in dict.fromkeys(phrases) if p and _english(p)]
+            grammars[step] = json.dumps(phrases + [UNKNOWN])
+        with self._lock:
+            stale = [g for step, g in self._grammars.items() if grammars.get(step) != g]
+            self._grammars = grammars
+            self.version += 1
+        return stale
+
+    def grammar(self, step):
+        """JSON grammar for step, or None for free-form steps."""
+        with self._lock:
+            return self._grammars.get(step)
+
+
+def strip_unknown(text):
+    return " ".join(w for w in text.split() if w != UNKNOWN)
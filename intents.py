@@ -0,0 +1,138 @@
+import unicodedata
+from collections import deque
+
+from route_index import RouteIndex, normalize
+
+# Declarative intent table. "keywords" are exact phrases found anywhere in the utterance
+# (on word boundaries); "fuzzy" phrases are also matched approximately against the
+# whole utterance, replacing the per-list difflib fallbacks.
+INTENT_TABLE = {
+    "exit": {"keywords": ["exit", "quit"], "fuzzy": ["exit", "quit"]},
+    "my_name": {"keywords": ["my name"]},
+    "assistant_name": {"keywords": ["your name", "assistant name", "who are you"],
+                       "fuzzy": ["your name", "assistant name", "who are you"]},
+    "company": {"keywords": ["company", "which company", "where do you work"],
+                "fuzzy": ["company", "which company", "where do you work"]},
+    "yes": {"keywords": ["yes", "yeah", "yep", "हाँ", "हां"], "fuzzy": ["yes", "yeah", "yep"]},
+    "no": {"keywords": ["no", "nah", "nope", "नहीं"], "fuzzy": ["no", "nah", "nope"]},
+    "lang_en": {"keywords": ["english", "eng", "इंग्लिश", "अंग्रेजी"], "fuzzy": ["english", "इंग्लिश", "अंग्रेजी"]},
+    "lang_hi": {"keywords": ["hindi", "हिंदी", "हिन्दी"], "fuzzy": ["hindi", "हिंदी", "हिन्दी"]},
+    "address": {"keywords": ["address", "google maps", "maps", "पता", "मैप"], "fuzzy": ["address", "google maps"]},
+    "reset": {"keywords": ["start over", "reset", "new user", "change language"], "fuzzy": ["start over", "reset"]},
+}
+FUZZY_CUTOFF = 0.5
+
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton: every keyword occurrence found in one left-to-right scan."""
+
+    def __init__(self, keywords):
+        # keywords: {phrase: payload}
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        for phrase, payload in keywords.items():
+            state = 0
+            for ch in phrase:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = nxt
+            self._out[state].append((len(phrase), payload))
+        queue = deque([0])
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                if state:
+                    f = self._fail[state]
+                    while f and ch not in self._goto[f]:
+                        f = self._fail[f]
+                    self._fail[nxt] = self._goto[f].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def scan(self, text):
+        """Yield (start, end, payload) for every keyword occurrence in text."""
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for length, payload in out[state]:
+                yield i + 1 - length, i + 1, payload
+
+
+def _is_word_char(ch):
+    return ch.isalnum() or unicodedata.category(ch).startswith("M")
+
+
+class IntentResult:
+    """Scores in [0, 1] per intent for one utterance, plus the best matching route."""
+
+    def __init__(self, scores, tab=None, tab_score=0.0):
+        self.scores = scores
+        self.tab = tab
+        self.tab_score = tab_score
+
+    def score(self, intent):
+        return self.scores.get(intent, 0.0)
+
+    def first(self, intents, cutoff=FUZZY_CUTOFF):
+        """First intent in priority order whose score clears cutoff."""
+        for intent in intents:
+            if self.scores.get(intent, 0.0) >= cutoff:
+                return intent
+        return None
+
+    def best(self, intents, cutoff=FUZZY_CUTOFF):
+        """Highest-scoring intent among intents, or None below cutoff."""
+        scored = [(self.scores.get(i, 0.0), i) for i in intents]
+        score, intent = max(scored, default=(0.0, None))
+        return intent if score >= cutoff else None
+
+
+class IntentEngine:
+    """Compiled once from a declarative table; classifies an utterance into all intents in one pass."""
+
+    def __init__(self, table=INTENT_TABLE):
+        keywords = {}
+        aliases = {}
+        for intent, spec in table.items():
+            for phrase in spec.get("keywords", ()):
+                keywords[normalize(phrase)] = intent
+            if spec.get("fuzzy"):
+                aliases[intent] = spec["fuzzy"]
+        self.intents = list(table)
+        self._automaton = KeywordAutomaton(keywords)
+        # The fuzzy stage shares the route index machinery: each intent is a "route"
+        # whose aliases are its fuzzy phrases, so cost does not grow per intent.
+        self._fuzzy = RouteIndex(phonetic=False)
+        for intent, phrases in aliases.items():
+            for phrase in phrases:
+                self._fuzzy.add_alias(intent, phrase)
+
+    def classify(self, text, route_index=None) -> IntentResult:
+        scores = {}
+        if not text:
+            return IntentResult(scores)
+        t = normalize(text)
+        for start, end, intent in self._automaton.scan(t):
+            if start > 0 and _is_word_char(t[start - 1]):
+                continue
+            if end < len(t) and _is_word_char(t[end]):
+                continue
+            scores[intent] = 1.0
+        for intent, score in self._fuzzy.search(t, limit=len(self.intents)):
+            if score > scores.get(intent, 0.0):
+                scores[intent] = score
+        result = IntentResult(scores)
+        if route_index is not None:
+            hits = route_index.search(text, limit=1)
+            if hits:
+                result.tab, result.tab_score = hits[0]
+        return result
@@ -0,0 +1,79 @@
+import threading
+import time
+
+PROCESS_START = time.monotonic()
+
+
+class ModelRegistry:
+    """Named model loaders that run once, on a background thread, on first demand."""
+
+    def __init__(self):
+        self._loaders = {}
+        self._models = {}
+        self._errors = {}
+        self._ready = {}
+        self._threads = {}
+        self.load_seconds = {}
+        self._lock = threading.Lock()
+
+    def register(self, name, loader):
+        with self._lock:
+            self._loaders[name] = loader
+            self._ready[name] = threading.Event()
+
+    def warm(self, *names):
+        """Start loading the given models (all registered ones by default) without blocking."""
+        with self._lock:
+            for name in names or list(self._loaders):
+                if name in self._threads:
+                    continue
+                t = threading.Thread(target=self._load, args=(name,), name=f"load-{name}", daemon=True)
+                self._threads[name] = t
+                t.start()
+
+    def _load(self, name):
+        t0 = time.monotonic()
+        try:
+            self._models[name] = self._loaders[name]()
+        except Exception as e:
+            self._errors[name] = e
+            print(f"[Model load error ({name}): {e}]")
+        finally:
+            self.load_seconds[name] = time.monotonic() - t0
+            self._ready[name].set()
+
+    def is_ready(self, name) -> bool:
+        return self._ready[name].is_set()
+
+    def wait(self, name, timeout=None) -> bool:
+        self.warm(name)
+        return self._ready[name].wait(timeout)
+
+    def get(self, name, timeout=None):
+        """Return the model, blocking only while it is still loading."""
+        if not self.wait(name, timeout):
+            raise TimeoutError(f"model {name!r} not ready after {timeout}s")
+        if name in self._errors:
+            raise RuntimeError(f"model {name!r} failed to load") from self._errors[name]
+        return self._models[name]
+
+
+class StartupReport:
+    """Records the first occurrence of named startup milestones relative to process start."""
+
+    def __init__(self, origin=PROCESS_START):
+        self.origin = origin
+        self.marks = {}
+        self.reported = False
+
+    def mark(self, name):
+        self.marks.setdefault(name, time.monotonic() - self.origin)
+
+    def report(self, registry: ModelRegistry = None):
+        if self.reported:
+            return
+        self.reported = True
+        parts = [f"{name}={secs:.2f}s" for name, secs in self.marks.items()]
+        if registry is not None:
+            parts += [f"load[{name}]={secs:.2f}s" for name, secs in registry.load_seconds.items()]
+        print("(Startup: " + ", ".join(parts) + ")")
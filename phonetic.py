@@ -0,0 +1,134 @@
+import functools
+import re
+import unicodedata
+
+# ------------------ Devanagari -> Latin ------------------
+_CONSONANTS = {
+    "क": "k", "ख": "kh", "ग": "g", "घ": "gh", "ङ": "n",
+    "च": "ch", "छ": "chh", "ज": "j", "झ": "jh", "ञ": "n",
+    "ट": "t", "ठ": "th", "ड": "d", "ढ": "dh", "ण": "n",
+    "त": "t", "थ": "th", "द": "d", "ध": "dh", "न": "n",
+    "प": "p", "फ": "ph", "ब": "b", "भ": "bh", "म": "m",
+    "य": "y", "र": "r", "ल": "l", "ळ": "l", "व": "v",
+    "श": "sh", "ष": "sh", "स": "s", "ह": "h",
+    # precomposed nukta forms
+    "क़": "q", "ख़": "kh", "ग़": "g", "ज़": "z", "ड़": "r", "ढ़": "rh", "फ़": "f", "य़": "y",
+}
+# Base consonant + combining nukta (U+093C), as most keyboards type them.
+_NUKTA = {"क": "q", "ख": "kh", "ग": "g", "ज": "z", "ड": "r", "ढ": "rh", "फ": "f", "य": "y"}
+_VOWELS = {
+    "अ": "a", "आ": "aa", "इ": "i", "ई": "ii", "उ": "u", "ऊ": "uu", "ऋ": "ri",
+    "ए": "e", "ऐ": "ai", "ओ": "o", "औ": "au", "ऑ": "o", "ऍ": "e",
+}
+_MATRAS = {
+    "ा": "aa", "ि": "i", "ी": "ii", "ु": "u", "ू": "uu", "ृ": "ri",
+    "े": "e", "ै": "ai", "ो": "o", "ौ": "au", "ॉ": "o", "ॅ": "e",
+}
+_VIRAMA = "्"
+_NUKTA_SIGN = "़"
+_ANUSVARA = "ं"
+_CHANDRABINDU = "ँ"
+_VISARGA = "ः"
+_LABIALS = ("p", "ph", "b", "bh", "m")
+
+# Hindi fillers around a tab name ("डैशबोर्ड खोलो", "मुझे मास्टर डेटा दिखाओ").
+HINDI_STOPWORDS = frozenset("खोलो खोलें खोलिए दिखाओ दिखाएं दिखाइए जाओ जाएं चलो पर को का की के में मुझे "
+                            "टैब पेज कृपया प्लीज़ प्लीज और".split())
+
+
+def has_devanagari(text: str) -> bool:
+    return any("ऀ" <= ch <= "ॿ" for ch in text)
+
+
+def transliterate(text: str) -> str:
+    """Romanize Devanagari (Hunterian-style, inherent "a" dropped word-finally); other text passes through."""
+    out = []
+    chars = unicodedata.normalize("NFC", text)
+    i, n = 0, len(chars)
+    while i < n:
+        ch = chars[i]
+        if ch in _CONSONANTS:
+            latin = _CONSONANTS[ch]
+            if i + 1 < n and chars[i + 1] == _NUKTA_SIGN:
+                latin = _NUKTA.get(ch, latin)
+                i += 1
+            out.append(latin)
+            nxt = chars[i + 1] if i + 1 < n else ""
+            if nxt in _MATRAS:
+                out.append(_MATRAS[nxt])
+                i += 1
+            elif nxt == _VIRAMA:
+                i += 1
+            elif nxt and ("ऀ" <= nxt <= "ॿ") and nxt not in "।॥":
+                out.append("a")            # inherent vowel inside the word
+        elif ch in _VOWELS:
+            out.append(_VOWELS[ch])
+        elif ch in _MATRAS:
+            out.append(_MATRAS[ch])
+        elif ch in (_ANUSVARA, _CHANDRABINDU):
+            nxt = chars[i + 1] if i + 1 < n else ""
+            out.append("m" if _CONSONANTS.get(nxt, "") in _LABIALS else "n")
+        elif ch == _VISARGA:
+            out.append("h")
+        elif "०" <= ch <= "९":
+            out.append(str(ord(ch) - ord("०")))
+        elif ch in "।॥":
+            out.append(" ")
+        elif ch not in (_VIRAMA, _NUKTA_SIGN):
+            out.append(ch)
+        i += 1
+    return "".join(out)
+
+
+# ------------------ Phonetic keys ------------------
+# English spellings rewritten towards how they are said (and how Hindi spells loanwords),
+# applied in order before letters are folded into consonant classes.
+_SPELLING = [
+    (re.compile(r"[ts]ion"), "shn"),
+    (re.compile(r"ture"), "chur"),
+    (re.compile(r"ch"), "C"),              # placeholder so the "c" rules below leave it alone
+    (re.compile(r"c?qu"), "kv"),
+    (re.compile(r"ck"), "k"),
+    (re.compile(r"ph"), "f"),
+    (re.compile(r"c(?=[eiy])"), "s"),
+    (re.compile(r"c"), "k"),
+    (re.compile(r"x"), "ks"),
+    (re.compile(r"dg"), "j"),
+    (re.compile(r"[sz]h"), "s"),
+    (re.compile(r"([bdgkjt])h"), r"\1"),   # aspirates (bh, dh, kh, ...) and English th
+    (re.compile(r"w"), "v"),
+    (re.compile(r"z"), "j"),
+    (re.compile(r"q"), "k"),
+]
+_VOWEL_LETTERS = frozenset("aeiouy")
+
+
+@functools.lru_cache(maxsize=65536)
+def phonetic_word(word: str) -> str:
+    """Consonant skeleton of one word: "acquisition" -> "akvsn", "ekvijishan" -> "akvjsn"."""
+    word = "".join(ch for ch in unicodedata.normalize("NFKD", word.lower()) if ch.isalnum() and ord(ch) < 128)
+    if not word:
+        return ""
+    for pattern, repl in _SPELLING:
+        word = pattern.sub(repl, word)
+    key = ["a" if word[0] in _VOWEL_LETTERS else word[0]]
+    for ch in word[1:]:
+        if ch in _VOWEL_LETTERS or ch == "h":
+            continue
+        if ch != key[-1]:
+            key.append(ch)
+    return "".join(key).lower()
+
+
+def phonetic_key(text: str) -> str:
+    """Space-separated phonetic keys for a mixed-script phrase, Hindi fillers dropped."""
+    words = []
+    for word in text.split():
+        if has_devanagari(word):
+            if word in HINDI_STOPWORDS:
+                continue
+            word = transliterate(word)
+        key = phonetic_word(word)
+        if key:
+            words.append(key)
+    return " ".join(words)
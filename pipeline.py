@@ -0,0 +1,172 @@
+import asyncio
+import threading
+import time
+
+import tracing
+
+BARGE_IN_BIAS_DB = 15.0  # extra energy needed to count as speech while our own prompt is playing
+
+
+class Turn:
+    """One user turn as it leaves the pipeline."""
+
+    def __init__(self, text, result, timings, ended_at):
+        self.text = text
+        self.result = result
+        self.timings = timings  # stage -> seconds since speech ended
+        self.ended_at = ended_at  # time.monotonic() when the utterance's capture ended
+
+
+class TurnPipeline:
+    """Dialog turns as an asyncio pipeline: capture -> ASR -> intent, with TTS -> playback beside it.
+
+    Stages run concurrently and hand off through queues, so the "You said" echo is
+    synthesized and played while the next stage matches the text, and the microphone
+    keeps listening the whole time. Speech detected during playback cancels it (barge-in).
+
+    With tracing on, each utterance is one "turn" span from the start of its capture to
+    its intent and echo, with capture, ASR, match and echo synthesis nested under it and
+    a "response" span from the end of speech to the intent.
+
+    capture(on_speech_start, stop_event, vad_bias) -> audio | empty
+    transcribe(audio) -> text | None
+    classify(text) -> intent result
+    synthesize(text) -> encoded audio bytes
+
+    A transcribe or classify error drops that utterance; a capture error (no input
+    device, say) ends the pipeline and is raised from next_turn.
+    """
+
+    def __init__(self, capture, transcribe, classify, synthesize, player, echo="You said: {text}"):
+        self.capture = capture
+        self.transcribe = transcribe
+        self.classify = classify
+        self.synthesize = synthesize
+        self.player = player
+        self.echo = echo
+        self._stop = threading.Event()
+        self._tasks = []
+        self._open_turns = {}    # turn span -> stages still to finish it (intent, echo)
+
+    async def __aenter__(self):
+        self._audio_q = asyncio.Queue(maxsize=2)
+        self._text_q = asyncio.Queue()
+        self._tts_q = asyncio.Queue()
+        self.turns = asyncio.Queue()
+        self._tasks = [asyncio.create_task(stage()) for stage in
+                       (self._capture_stage, self._asr_stage, self._intent_stage, self._tts_stage)]
+        return self
+
+    async def __aexit__(self, *exc):
+        self._stop.set()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    # ---- dialog-facing API ----
+    async def next_turn(self) -> Turn:
+        get = asyncio.ensure_future(self.turns.get())
+        try:
+            await asyncio.wait([get, *self._tasks], return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            if not get.done():
+                get.cancel()
+        if get.done():
+            return get.result()
+        for task in self._tasks:
+            if task.done():
+                raise task.exception() or RuntimeError("pipeline stage stopped")
+
+    async def say(self, text, wait=False):
+        """Queue a reply on the TTS stage; optionally wait until it has finished playing."""
+        done = asyncio.get_running_loop().create_future() if wait else None
+        await self._tts_q.put((text, done, None))
+        if done is not None:
+            await done
+
+    def barge_in_bias(self):
+        return BARGE_IN_BIAS_DB if self.player.busy else 0.0
+
+    # ---- stages ----
+    def _on_speech_start(self):
+        # Called on the capture thread; the playback engine is thread-safe.
+        if self.player.busy:
+            self.player.stop_all()
+
+    def _release(self, trace):
+        if trace is None:
+            return
+        self._open_turns[trace] -= 1
+        if not self._open_turns[trace]:
+            del self._open_turns[trace]
+            tracing.end(trace)
+
+    async def _capture_stage(self):
+        while True:
+            trace = tracing.begin("turn")
+            # to_thread copies the context, so spans opened by capture() nest under trace.
+            try:
+                with tracing.attach(trace):
+                    audio = await asyncio.to_thread(self.capture, self._on_speech_start, self._stop,
+                                                    self.barge_in_bias)
+            except BaseException:
+                tracing.end(trace)
+                raise
+            if audio is not None and len(audio):
+                response = tracing.begin("response", trace)
+                await self._audio_q.put((time.monotonic(), audio, trace, response))
+
+    async def _asr_stage(self):
+        while True:
+            ended_at, audio, trace, response = await self._audio_q.get()
+            try:
+                with tracing.attach(trace):
+                    text = await asyncio.to_thread(self.transcribe, audio)
+            except Exception as e:
+                print(f"[ASR error: {e}]")
+                text = None
+            if not text:
+                tracing.end(response)
+                tracing.end(trace)
+                continue
+            print(f"User: {text}")
+            asr_done = time.monotonic()
+            if trace is not None:
+                self._open_turns[trace] = 2 if self.echo else 1
+            if self.echo:
+                await self._tts_q.put((self.echo.format(text=text), None, trace))
+            await self._text_q.put((ended_at, asr_done, text, trace, response))
+
+    async def _intent_stage(self):
+        while True:
+            ended_at, asr_done, text, trace, response = await self._text_q.get()
+            try:
+                with tracing.attach(trace):
+                    result = self.classify(text)
+            except Exception as e:
+                print(f"[Intent error: {e}]")
+                result = None
+            now = time.monotonic()
+            tracing.end(response)
+            self._release(trace)
+            if result is None:
+                continue
+            await self.turns.put(Turn(text, result, {"asr": asr_done - ended_at, "intent": now - ended_at},
+                                       ended_at))
+
+    async def _tts_stage(self):
+        while True:
+            text, done, trace = await self._tts_q.get()
+            print(f"Assistant: {text}")
+            try:
+                with tracing.attach(trace):
+                    data = await asyncio.to_thread(self.synthesize, text)
+                handle = self.player.play(data)
+                if done is not None:
+                    await handle
+            except Exception as e:
+                print(f"[TTS error: {e}]")
+            finally:
+                self._release(trace)
+                if done is not None and not done.done():
+                    done.set_result(None)
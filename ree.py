@@ -1,74 +1,162 @@
-import json
+import argparse
+import asyncio
 import webbrowser
 import os
 import sys
+import threading
 import time
-import datetime
-import pygame
-import difflib
-from gtts import gTTS
-import sounddevice as sd
-import numpy as np
-from faster_whisper import WhisperModel
-from vosk import Model as VoskModel, KaldiRecognizer
-import json as js
-import tempfile
-
-ASSISTANT_NAME = "Oxland"
-COMPANY_NAME = "Oxbow Intellect Private Limited"
-MODULES_FILE = "modules_routes.json"
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from tts_cache import TTSCache
+from tts_backends import TTSSelector
+from tts_prefetch import TTSPrefetcher
+from tts_stream import StreamingSpeaker
+from audio_player import PlaybackEngine, SpeechHandle
+from route_index import RouteIndex
+from routes_catalog import RoutesCatalog
+from dialog import (ASSISTANT_NAME, PROMPTS, FIXED_PHRASES, intent_engine, detect_language_choice,
+                    get_time_based_greeting, identity_answer, ask_yes_no, decode_vocabulary, next_prompts)
+from vad import EnergyVAD, capture_utterance, default_source, normalize_audio, to_pcm16
+from model_registry import ModelRegistry, StartupReport
+from vosk_pool import VoskPool
+from pipeline import TurnPipeline
+from whisper_decode import build_prompt, decode
+from grammars import DialogGrammars, strip_unknown
+from wakeword import WakeWordGate
+from session import SessionState, CommandLatency, SESSION_IDLE_S, STANDBY, CHOOSE_LANGUAGE, CAPTURE_NAME, COMMAND, ADDRESS
+import tracing
+from tracing import traced
+
 
 # ------------------ Models ------------------
-whisper_model = WhisperModel("small", device="cpu", compute_type="int8")
 VOSK_MODEL_PATH = "vosk-model-small-en-us-0.15"
-vosk_model = VoskModel(VOSK_MODEL_PATH)
-vosk_rec = KaldiRecognizer(vosk_model, 16000)
 
-# ------------------ Audio Preprocess ------------------
-def preprocess_audio(audio, target_db=-20.0):
-    rms = np.sqrt(np.mean(audio**2))
-    scalar = 10 ** (target_db / 20) / (rms + 1e-6)
-    return np.clip(audio * scalar, -32768, 32767).astype(np.int16)
+def load_whisper():
+    from faster_whisper import WhisperModel
+    # Two workers so the en/hi decodes in listen_language_choice can run side by side.
+    return WhisperModel("small", device="cpu", compute_type="int8", num_workers=2)
+
+def load_vosk():
+    pool = VoskPool.shared(VOSK_MODEL_PATH)
+    pool.model
+    return pool
+
+# Loaded lazily on background threads; main() starts warming them as the welcome prompt plays.
+models = ModelRegistry()
+models.register("whisper", load_whisper)
+models.register("vosk", load_vosk)
+startup = StartupReport()
+# Closed-vocabulary steps decode with a Vosk grammar first (English only); OXLAND_VOSK_GRAMMAR=0 disables it.
+USE_GRAMMARS = os.environ.get("OXLAND_VOSK_GRAMMAR", "1") != "0"
+grammars = DialogGrammars()
+# Session mode with --wake-word: Whisper stays idle until "Oxland" is heard; muted while we speak.
+wake_gate = WakeWordGate(lambda: models.get("vosk"), muted=lambda: player.busy)
+decode_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="decode")
 
 # ------------------ TTS ------------------
-def speak_and_print(text: str, tts_lang: str = "en"):
+tts_selector = TTSSelector()
+tts_cache = TTSCache(synthesize=tts_selector)
+player = PlaybackEngine()
+# Renders the dialog's likely next prompts while the current step captures and recognizes.
+prefetcher = TTSPrefetcher(tts_cache)
+# Longer text plays sentence by sentence as it renders instead of after the whole string.
+streamer = StreamingSpeaker(tts_cache, player)
+
+def render(text, tts_lang="en"):
+    data = prefetcher.take(text, tts_lang)
+    return data if data is not None else tts_cache.load(text, tts_lang)
+
+def speak(text: str, tts_lang: str = "en") -> SpeechHandle:
     print(f"Assistant: {text}")
-    fd, path = tempfile.mkstemp(suffix=".mp3")
-    os.close(fd)
     try:
-        tts = gTTS(text=text, lang=tts_lang)
-        tts.save(path)
-
-        pygame.mixer.init()
-        pygame.mixer.music.load(path)
-        pygame.mixer.music.play()
-        while pygame.mixer.music.get_busy():
-            time.sleep(0.1)
-        pygame.mixer.music.stop()
-        pygame.mixer.quit()  
-        time.sleep(0.05)    
+        with tracing.span("tts_synthesis", lang=tts_lang):
+            data = prefetcher.take(text, tts_lang)
+            if data is None:
+                return streamer.speak(text, tts_lang)
+        return player.play(data)
     except Exception as e:
         print(f"[TTS error: {e}]")
-    finally:
-        if os.path.exists(path):
-            os.remove(path)
+        return SpeechHandle.finished(e)
+
+@traced("speak_and_print")
+def speak_and_print(text: str, tts_lang: str = "en"):
+    handle = speak(text, tts_lang)
+    with tracing.span("playback"):
+        handle.wait()
 
 # ------------------ Recording ------------------
-def record_audio(seconds=3, samplerate=16000):
-    print(f"(Listening for {seconds} seconds... speak now)")
-    audio = sd.rec(int(seconds * samplerate), samplerate=samplerate, channels=1, dtype="int16")
-    sd.wait()
-    audio = preprocess_audio(audio)
-    return audio
+@traced("capture")
+def record_audio(max_seconds=8, samplerate=16000, on_speech_start=None, stop_event=None, vad_bias=None):
+    print("(Listening... speak now)")
+    audio = capture_utterance(default_source(samplerate), stop_event=stop_event, max_duration=max_seconds,
+                              vad=EnergyVAD(bias=vad_bias), on_speech_start=on_speech_start)
+    tracing.annotate(audio_s=round(audio.size / samplerate, 3))
+    if audio.size == 0:
+        return audio
+    # float32 end to end: normalized in place and handed to Whisper as is.
+    return normalize_audio(audio)
 
 # ------------------ Whisper Recognition (low-latency) ------------------
-def listen_once(language="en", seconds=3):
-    audio_np = record_audio(seconds=seconds)
-    print(f"(Processing... recognizing speech with Whisper)")
+# Per-language initial prompts; filled by set_decode_vocabulary once the routes are loaded.
+decode_prompts = {}
+
+def set_decode_vocabulary(route_names):
+    for lang in ("en", "hi"):
+        decode_prompts[lang] = build_prompt(*decode_vocabulary(route_names, lang))
+
+@traced("asr", backend="whisper")
+def transcribe(audio_float, language="en"):
+    text, _, passes = decode(models.get("whisper"), audio_float, language, decode_prompts.get(language))
+    tracing.annotate(passes=len(passes))
+    return text
+
+def transcribed(text):
+    # Time to first transcription counts whichever backend produced it: Vosk grammar or Whisper.
+    if text:
+        startup.mark("first_transcription")
+        startup.report(models)
+    return text
+
+def rebuild_grammars(route_index):
+    for stale in grammars.rebuild(route_index):
+        if models.is_ready("vosk"):
+            try:
+                models.get("vosk").discard(stale)
+            except RuntimeError:
+                pass
+
+def on_routes_changed(catalog, diff):
+    set_decode_vocabulary(catalog.index.names())
+    rebuild_grammars(catalog.index)
+
+@traced("asr", backend="vosk-grammar")
+def recognize_constrained(audio_np, step):
+    grammar = grammars.grammar(step)
+    if not (USE_GRAMMARS and grammar):
+        return None
+    try:
+        text = strip_unknown(models.get("vosk").transcribe(to_pcm16(audio_np).tobytes(), grammar))
+    except Exception as e:
+        print(f"[Vosk error: {e}]")
+        return None
+    return text or None
+
+def recognize(audio_np, language="en", step=None):
+    # Constrained steps try the grammar first; out-of-grammar speech falls through to Whisper.
+    if step and language == "en":
+        text = recognize_constrained(audio_np, step)
+        if text:
+            return transcribed(text)
+    return transcribed(transcribe(audio_np, language))
+
+@traced("listen_once")
+def listen_once(language="en", max_seconds=8, step=None):
+    audio_np = record_audio(max_seconds=max_seconds)
+    if audio_np.size == 0:
+        print("No speech detected.")
+        return None
+    print(f"(Processing... recognizing speech)")
     try:
-        audio_float = audio_np.astype(np.float32) / 32768.0
-        segments, info = whisper_model.transcribe(audio_float, beam_size=5, language=language)
-        text = " ".join([seg.text for seg in segments]).strip()
+        text = recognize(audio_np, language, step)
         if text:
             print(f"User: {text}")
             speak_and_print(f"You said: {text}", "hi" if language == "hi" else "en")
@@ -80,206 +168,314 @@ def listen_once(language="en", seconds=3):
         print(f"[Whisper error: {e}]")
         return None
 
-def listen_name_with_vosk():
-    print("(Listening for your name with Vosk...)")
-    audio = sd.rec(int(5 * 16000), samplerate=16000, channels=1, dtype="int16")
-    sd.wait()
-    if vosk_rec.AcceptWaveform(audio.tobytes()):
-        result = js.loads(vosk_rec.Result())
-        text = result.get("text", "").strip().title()
-        return text if text else None
-    return None
-
-# ------------------ Language ------------------
-def detect_language_choice(text: str):
-    if not text:
+def listen_language_choice(max_seconds=8, audio_np=None):
+    """One capture, decoded as en and hi concurrently; the first decode naming a language wins."""
+    if audio_np is None:
+        audio_np = record_audio(max_seconds=max_seconds)
+    if audio_np.size == 0:
+        print("No speech detected.")
         return None
-    t = text.lower().strip()
-    english_keywords = ["english", "eng", "इंग्लिश", "अंग्रेजी"]
-    hindi_keywords = ["hindi", "हिंदी", "हिन्दी"]
-
-    for word in english_keywords:
-        if word in t:
-            return "en"
-    for word in hindi_keywords:
-        if word in t:
-            return "hi"
-
-    all_keywords = english_keywords + hindi_keywords
-    matches = difflib.get_close_matches(t, all_keywords, n=1, cutoff=0.5)
-    if matches:
-        if matches[0] in english_keywords:
-            return "en"
-        else:
-            return "hi"
+    print(f"(Processing... recognizing speech)")
+    text = transcribed(recognize_constrained(audio_np, "language"))
+    chosen = detect_language_choice(text) if text else None
+    if chosen:
+        print(f"User: {text}")
+        speak(f"You said: {text}", chosen)
+        return chosen
+    futures = {decode_pool.submit(transcribe, audio_np, lang): lang for lang in ("en", "hi")}
+    try:
+        for future in as_completed(futures):
+            try:
+                text = transcribed(future.result())
+            except Exception as e:
+                print(f"[Whisper error: {e}]")
+                continue
+            chosen = detect_language_choice(text)
+            if chosen:
+                print(f"User: {text}")
+                speak(f"You said: {text}", chosen)
+                return chosen
+    finally:
+        for future in futures:
+            future.cancel()
+    print("No language recognized.")
     return None
 
-# ------------------ Helpers ------------------
-def get_time_based_greeting(lang="en"):
-    hour = datetime.datetime.now().hour
-    if lang == "en":
-        if 5 <= hour < 12:
-            return "Good morning"
-        elif 12 <= hour < 15:
-            return "Good noon"
-        elif 15 <= hour < 18:
-            return "Good afternoon"
-        else:
-            return "Good evening"
-    else:
-        if 5 <= hour < 12:
-            return "सुप्रभात"
-        elif 12 <= hour < 15:
-            return "शुभ दोपहर"
-        elif 15 <= hour < 18:
-            return "शुभ अपराह्न"
-        else:
-            return "शुभ संध्या"
-
-def check_identity_question(text: str):
-    if not text:
+@traced("listen_name_with_vosk")
+def listen_name_with_vosk(max_seconds=5):
+    print("(Listening for your name with Vosk...)")
+    with tracing.span("capture"):
+        audio = capture_utterance(default_source(), max_duration=max_seconds)
+        tracing.annotate(audio_s=round(audio.size / 16000, 3))
+    if audio.size == 0:
         return None
-    t = text.lower()
-    identity_phrases = {
-        "name": ["your name", "assistant name", "who are you"],
-        "company": ["company", "which company", "where do you work"]
-    }
-    for key, phrases in identity_phrases.items():
-        matches = difflib.get_close_matches(t, phrases, n=1, cutoff=0.5)
-        if matches:
-            if key == "name":
-                return f"My name is {ASSISTANT_NAME}"
-            elif key == "company":
-                return f"I work at {COMPANY_NAME}"
-    return None
+    with tracing.span("asr", backend="vosk"):
+        text = models.get("vosk").transcribe(to_pcm16(audio).tobytes()).title()
+    return transcribed(text) or None
 
-def match_tab(user_text, tab_names):
+@traced("match_tab")
+def match_tab(user_text, route_index: RouteIndex, cutoff=0.5):
     if not user_text:
         return None
-    user_text = user_text.lower()
-    for name in tab_names:
-        if name.lower() in user_text or user_text in name.lower():
-            return name
-    matches = difflib.get_close_matches(user_text, [t.lower() for t in tab_names], n=1, cutoff=0.5)
-    if matches:
-        for name in tab_names:
-            if name.lower() == matches[0]:
-                return name
-    return None
-
-def ask_yes_no(text):
-    if not text:
-        return None
-    t = text.lower()
-    if "yes" in t or "yeah" in t or "yep" in t:
-        return "yes"
-    if "no" in t or "nah" in t or "nope" in t:
-        return "no"
-    matches = difflib.get_close_matches(t, ["yes", "no", "yeah", "nah", "nope", "yep"], n=1, cutoff=0.5)
-    if matches:
-        if matches[0] in ["yes", "yeah", "yep"]:
-            return "yes"
-        else:
-            return "no"
-    return None
-
-# ------------------ Prompts ------------------
-PROMPTS = {
-    "welcome": {"en": "Welcome to Oxland"},
-    "choose_lang": {"en": "Please choose your language: English or Hindi."},
-    "ask_name": {"en": "What is your name?", "hi": "कृपया अपना नाम बताइए।"},
-    "ask_address_option": {"en": "Do you want to provide an address? Yes or No?", "hi": "क्या आप पता देना चाहते हैं? हाँ या नहीं?"},
-    "ask_address": {"en": "Please say the address you want to search on Google Maps.", "hi": "कृपया वह पता बताएं जिसे आप Google Maps पर देखना चाहते हैं।"},
-    "now_select_tab": {"en": "Now you can select the tab.", "hi": "अब आप टैब चुन सकते हैं।"},
-    "goodbye": {"en": "Opening the tab. Exiting. Goodbye!", "hi": "टैब खोल रहा हूँ। बाहर निकल रहा हूँ। अलविदा!"},
-    "not_found": {"en": "Sorry, I couldn't find that tab. Exiting.", "hi": "क्षमा करें, वह टैब नहीं मिला। बाहर निकल रहा हूँ।"}
-}
+    return route_index.best(user_text, cutoff=cutoff)
 
 # ------------------ Steps ------------------
-def choose_language():
-    speak_and_print(PROMPTS["choose_lang"]["en"], "en")
-    chosen = None
+def choose_language(give_up=None, heard=None):
+    prefetcher.prefetch(next_prompts("choose_language"))
+    # Words said right after the wake word ("Oxland, Hindi") can already answer this.
+    chosen = listen_language_choice(audio_np=heard) if heard is not None and heard.size else None
+    if not chosen:
+        speak_and_print(PROMPTS["choose_lang"]["en"], "en")
     while not chosen:
-        text = listen_once("en", seconds=3)
-        chosen = detect_language_choice(text)
-        if not chosen:
-            text = listen_once("hi", seconds=3)
-            chosen = detect_language_choice(text)
+        chosen = listen_language_choice()
         if not chosen:
+            if give_up and give_up():
+                return None
             speak_and_print("Please say English or Hindi.", "en")
     return chosen
 
-def capture_name(chosen):
+def capture_name(chosen, give_up=None):
+    prefetcher.prefetch(next_prompts("capture_name", chosen))
     name_text = None
     while not name_text:
         speak_and_print(PROMPTS["ask_name"][chosen], "hi" if chosen == "hi" else "en")
         name_text = listen_name_with_vosk()
         if not name_text:
+            if give_up and give_up():
+                return None
             speak_and_print("Sorry, I didn't catch that. Please say your name again.", "hi" if chosen == "hi" else "en")
+    prefetcher.prefetch(next_prompts("name_known", chosen, name_text))
     return name_text
 
+def maps_url(address):
+    return f"https://www.google.com/maps/place/{address.replace(' ', '+')}"
+
 def ask_address(chosen):
+    prefetcher.prefetch(next_prompts("ask_address", chosen))
     speak_and_print(PROMPTS["ask_address_option"][chosen], "hi" if chosen == "hi" else "en")
     while True:
-        response = listen_once("hi" if chosen == "hi" else "en", seconds=3)
+        response = listen_once("hi" if chosen == "hi" else "en", step="yes_no")
         choice = ask_yes_no(response)
         if choice == "yes":
             speak_and_print(PROMPTS["ask_address"][chosen], "hi" if chosen == "hi" else "en")
-            address = listen_once("hi" if chosen == "hi" else "en", seconds=3)
+            address = listen_once("hi" if chosen == "hi" else "en")
             if address:
-                url = f"https://www.google.com/maps/place/{address.replace(' ', '+')}"
+                webbrowser.open(maps_url(address))
                 speak_and_print(f"Opening Google Maps for {address}. Exiting now.", "hi" if chosen == "hi" else "en")
-                webbrowser.open(url)
-                sys.exit(0)
             else:
                 speak_and_print("Sorry, I didn't catch the address. Exiting.", "hi" if chosen == "hi" else "en")
-                sys.exit(0)
+            sys.exit(0)
         elif choice == "no":
             return
         else:
             speak_and_print("Please say Yes or No.", "hi" if chosen == "hi" else "en")
 
-def select_tab(chosen, modules, name_text):
-    tab_names = list(modules.keys())
-    print("Available Tabs:", ", ".join(tab_names))
-    selected_tab = None
-    while not selected_tab:
-        response = listen_once("hi" if chosen == "hi" else "en", seconds=3)
-        if not response:
-            continue
-        if "exit" in response.lower() or "quit" in response.lower():
-            speak_and_print("Okay, exiting now. Goodbye!", "hi" if chosen == "hi" else "en")
-            sys.exit(0)
-        if "my name" in response.lower():
-            speak_and_print(f"Your name is {name_text}", "hi" if chosen == "hi" else "en")
-            continue
-        identity_answer = check_identity_question(response)
-        if identity_answer:
-            speak_and_print(identity_answer, "hi" if chosen == "hi" else "en")
-            continue
-        selected_tab = match_tab(response, tab_names)
-        if not selected_tab:
-            speak_and_print("I didn't match that to any tab. Please say again.", "hi" if chosen == "hi" else "en")
-    return selected_tab
+async def next_command_async(chosen, route_index, name_text, step="select_tab", idle_s=None, prompt=None,
+                             wake=None):
+    """Run turns until one calls for an action: (kind, tab or address, speech end time)."""
+    # "select_tab" ends in tab or exit; session steps "command" and "address" add address,
+    # reset and (after idle_s without a turn) idle, and "address" returns the next utterance.
+    # With a wake gate only the answer right after one of our prompts is taken without "Oxland".
+    tts_lang = "hi" if chosen == "hi" else "en"
+    asr_lang = "hi" if chosen == "hi" else "en"
+    asr_step = None if step == "address" else step
+
+    # Set by ask(); the next capture takes it and listens without the wake word.
+    prompted = threading.Event()
+
+    def capture(on_speech_start, stop_event, vad_bias):
+        if wake is None or prompted.is_set():
+            prompted.clear()
+            return record_audio(on_speech_start=on_speech_start, stop_event=stop_event, vad_bias=vad_bias)
+        # A capture already waiting for "Oxland" gives way when we ask something (or stop).
+        return capture_after_wake(wake, prompted, on_speech_start=on_speech_start)
+
+    def recognize_turn(audio_np):
+        try:
+            return recognize(audio_np, asr_lang, asr_step)
+        except Exception as e:
+            print(f"[Whisper error: {e}]")
+            return None
+
+    @traced("match_tab")
+    def classify(text):
+        return intent_engine.classify(text, route_index)
+
+    @traced("tts_synthesis", lang=tts_lang)
+    def synthesize(text):
+        return render(text, tts_lang)
+
+    # The echo plays while the next utterance is already being captured; talking over it stops it.
+    pipeline = TurnPipeline(capture, recognize_turn, classify, synthesize, player)
+
+    async def ask(text):
+        prompted.set()
+        await pipeline.say(text)
+
+    prompted.set()
+    prefetcher.prefetch(next_prompts("command" if step == "command" else "select_tab", chosen, name_text))
+    async with pipeline:
+        try:
+            if prompt:
+                await pipeline.say(prompt)
+            while True:
+                try:
+                    turn = await asyncio.wait_for(pipeline.next_turn(), idle_s)
+                except asyncio.TimeoutError:
+                    return "idle", None, time.monotonic()
+                ended_at = turn.ended_at
+                result = turn.result
+                # One classification pass covers exit, identity and tab intents.
+                if result.score("exit") == 1.0:
+                    await pipeline.say("Okay, exiting now. Goodbye!", wait=True)
+                    return "exit", None, ended_at
+                if step in ("command", "address") and result.score("reset") == 1.0:
+                    return "reset", None, ended_at
+                if step == "address":
+                    return "address", turn.text, ended_at
+                if step == "command" and result.score("address") == 1.0:
+                    return "address", None, ended_at
+                if result.score("my_name") == 1.0:
+                    await ask(f"Your name is {name_text}")
+                    continue
+                answer = identity_answer(result)
+                if answer:
+                    await ask(answer)
+                    continue
+                if result.tab_score >= 0.5:
+                    return "tab", result.tab, ended_at
+                await ask("I didn't match that to any tab. Please say again.")
+        finally:
+            prompted.set()   # releases a capture still waiting for the wake word
+
+def select_tab(chosen, route_index, name_text):
+    print("Available Tabs:", ", ".join(route_index.names()))
+    _, tab, _ = asyncio.run(next_command_async(chosen, route_index, name_text))
+    return tab
+
+# ------------------ Session mode ------------------
+def wait_for_speaker():
+    """Standby: stay silent until someone speaks near the kiosk."""
+    print("(Standby... waiting for someone to speak)")
+    capture_utterance(default_source(), max_duration=3, start_timeout=None)
+
+def capture_after_wake(wake, stop_event=None, max_seconds=8, on_speech_start=None):
+    """Block until the wake word, then return what is said after it."""
+    try:
+        with tracing.span("capture", wake_word=True):
+            audio = wake.capture_command(default_source(), stop_event, on_wake=lambda: print("(Wake word heard)"),
+                                         on_speech_start=on_speech_start, max_duration=max_seconds)
+            tracing.annotate(audio_s=round(audio.size / 16000, 3))
+    except Exception as e:
+        print(f"[Wake word error: {e}]")
+        return record_audio(max_seconds=max_seconds, on_speech_start=on_speech_start, stop_event=stop_event)
+    return normalize_audio(audio)
+
+def report_command(latency, kind, ended_at):
+    seconds = time.monotonic() - ended_at
+    phase = latency.record(kind, seconds)
+    print(f"(Command: {kind} {seconds * 1000:.0f} ms after speech ended, {phase})")
+
+def serve_sessions(catalog, idle_s=SESSION_IDLE_S, wake_word=False):
+    """Serve users one after another with warm models, each for any number of commands."""
+    # Language and name are asked once per user; "reset" asks again, "exit" or idle_s
+    # without progress forgets the user and goes back to standby.
+    session = SessionState(idle_s)
+    latency = CommandLatency()
+    wake = wake_gate if wake_word else None
+    prompt = None
+    heard = None
+    session.fire("wake")    # main() has already played the welcome
+    try:
+        while True:
+            state = session.state
+            lang = session.lang or "en"
+            if state == STANDBY:
+                print(f"(Session {session.sessions} ended after {session.commands} commands; latency: {latency.summary()})")
+                if wake:
+                    print(f"(Standby... say \"{ASSISTANT_NAME}\" to start; wake gate: {wake.stats()})")
+                    heard = capture_after_wake(wake, max_seconds=4)
+                else:
+                    wait_for_speaker()
+                speak_and_print(PROMPTS["welcome"]["en"], "en")
+                session.fire("wake")
+            elif state == CHOOSE_LANGUAGE:
+                session.lang = choose_language(give_up=session.expired, heard=heard)
+                heard = None
+                session.fire("chosen" if session.lang else "idle")
+            elif state == CAPTURE_NAME:
+                session.name = capture_name(lang, give_up=session.expired)
+                if not session.name:
+                    session.fire("idle")
+                    continue
+                speak_and_print(f"{get_time_based_greeting(lang)}, {session.name}", lang)
+                prompt = PROMPTS["ask_command"][lang]
+                session.fire("named")
+            elif state == COMMAND:
+                startup.mark("first_command_prompt")
+                kind, tab, ended_at = asyncio.run(next_command_async(lang, catalog.index, session.name, "command",
+                                                                     idle_s, prompt, wake))
+                prompt = PROMPTS["next_command"][lang]
+                if kind == "tab":
+                    url = catalog.url(tab)
+                    if url:
+                        webbrowser.open(url)
+                        report_command(latency, "tab", ended_at)
+                        print(f"Opening tab '{tab}' -> {url}")
+                        speak_and_print(f"Opening {tab}.", lang)
+                        session.commands += 1
+                    else:
+                        speak_and_print("I didn't match that to any tab. Please say again.", lang)
+                elif kind == "reset":
+                    speak_and_print(PROMPTS["starting_over"][lang], lang)
+                session.fire(kind)
+            elif state == ADDRESS:
+                kind, address, ended_at = asyncio.run(next_command_async(lang, catalog.index, session.name, "address",
+                                                                         idle_s, PROMPTS["ask_address"][lang]))
+                if kind == "address":
+                    webbrowser.open(maps_url(address))
+                    report_command(latency, "address", ended_at)
+                    speak_and_print(f"Opening Google Maps for {address}.", lang)
+                    session.commands += 1
+                    kind = "opened"
+                elif kind == "reset":
+                    speak_and_print(PROMPTS["starting_over"][lang], lang)
+                session.fire(kind)
+    finally:
+        print(f"(Command latency: {latency.summary()})")
 
 # ------------------ Main ------------------
-def main():
+def main(session_mode=False, idle_s=SESSION_IDLE_S, wake_word=False):
+    catalog = RoutesCatalog()
+    catalog.subscribe(on_routes_changed)
     try:
-        with open(MODULES_FILE, "r", encoding="utf-8") as f:
-            modules = json.load(f)
+        catalog.reload()
     except Exception as e:
         print(f"Error loading modules file: {e}")
         return
+    catalog.watch()
+    route_index = catalog.index
 
-    speak_and_print(PROMPTS["welcome"]["en"], "en")
+    prefetcher.prefetch(next_prompts("welcome"))
+    welcome = speak(PROMPTS["welcome"]["en"], "en")
+    if welcome.wait_started():
+        startup.mark("first_audio")
+    models.warm()
+    tts_cache.prewarm_async(PROMPTS, FIXED_PHRASES)
+    welcome.wait()
+    if session_mode:
+        serve_sessions(catalog, idle_s, wake_word)
+        return
     chosen = choose_language()
     name_text = capture_name(chosen)
     greet = get_time_based_greeting(chosen)
     speak_and_print(f"{greet}, {name_text}", "hi" if chosen == "hi" else "en")
     ask_address(chosen)
     speak_and_print(PROMPTS["now_select_tab"][chosen], "hi" if chosen == "hi" else "en")
-    selected_tab = select_tab(chosen, modules, name_text)
-    url = modules.get(selected_tab)
+    selected_tab = select_tab(chosen, route_index, name_text)
+    if selected_tab is None:
+        sys.exit(0)
+    url = catalog.url(selected_tab)
     if url:
         speak_and_print(PROMPTS["goodbye"][chosen], "hi" if chosen == "hi" else "en")
         print(f"Opening tab '{selected_tab}' -> {url}")
@@ -288,8 +484,21 @@ def main():
         speak_and_print(PROMPTS["not_found"][chosen], "hi" if chosen == "hi" else "en")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Oxland voice navigation kiosk (Whisper + Vosk).")
+    parser.add_argument("--session", action="store_true",
+                        help="keep serving commands and users with warm models instead of exiting after one")
+    parser.add_argument("--idle-s", type=float, default=SESSION_IDLE_S,
+                        help="seconds without progress before a session resets")
+    parser.add_argument("--wake-word", action="store_true", default=os.environ.get("OXLAND_WAKE_WORD") == "1",
+                        help=f"session mode: keep Whisper idle until \"{ASSISTANT_NAME}\" is spoken (uses Vosk)")
+    args = parser.parse_args()
     try:
-        main()
+        main(args.session, args.idle_s, args.wake_word)
     except KeyboardInterrupt:
         print("\nExiting on user interrupt.")
         sys.exit(0)
+    finally:
+        prefetcher.close()
+        streamer.close()
+        print(f"(TTS prefetch: {prefetcher.stats()})")
+        print(f"(TTS backends: {tts_selector.stats()})")
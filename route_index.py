@@ -0,0 +1,386 @@
+import difflib
+import heapq
+import json
+import re
+import sys
+import threading
+from collections import defaultdict
+
+from phonetic import has_devanagari, phonetic_key
+
+NGRAM = 3
+TOKEN_CUTOFF = 0.6
+# A word of this many letters or fewer is one or two edits away from most other short
+# words ("hello"/"help", "house"/"home"), so it must match at SHORT_TOKEN_CUTOFF.
+SHORT_TOKEN_CHARS = 4
+SHORT_TOKEN_CUTOFF = 0.75
+GRAM_PREFILTER = 0.2
+MAX_FUZZY_TOKENS = 8
+SELECTIVE_POSTINGS = 256
+# Terms (tokens, keys) one lookup may bring into play through its rarest grams or tokens
+# first; bounds the tail on large catalogs. bench_match_tab-style queries at 10k routes:
+# p95 6.3 -> 2.3 ms, max 80 -> 6 ms, accuracy unchanged (at 50k: 31 -> 5 ms, -1 point).
+SCAN_BUDGET = 256
+COMPACT_FALLBACK = 0.8
+COMPACT_RESCORE = 16
+# Best keys turned into routes per query; fixed, so what search() returns does not depend
+# on its limit.
+RANK_CANDIDATES = 64
+MIN_QUERY_CHARS = 2
+# Below this, or for Devanagari queries, the phonetic index is consulted too; its scores
+# are discounted so a spelling match still wins a tie.
+PHONETIC_FALLBACK = 0.8
+PHONETIC_WEIGHT = 0.9
+# Latin queries reach the phonetic index only with this many consonants in their key:
+# "yes" (s), "start" (strt) or "locate" (lkt) are too short a skeleton to tell routes apart.
+PHONETIC_MIN_CONSONANTS = 5
+# Keys are short consonant skeletons, where one letter moves the edit ratio a lot.
+PHONETIC_CUTOFF = 0.8
+# Filler words that carry no route information; dropped from names and queries alike.
+STOPWORDS = frozenset({"and", "the", "a", "an", "of", "to", "open", "go", "please", "tab", "show", "me", "page"})
+
+# \w misses Indic vowel signs and viramas, so keep the combining-mark ranges explicitly
+# (Devanagari danda and double danda are punctuation, not marks).
+_NON_WORD = re.compile(r"[^\w\s\u0300-\u036f\u0900-\u0963\u0966-\u097f]+|[\u0964\u0965]", re.UNICODE)
+_SPACES = re.compile(r"\s+")
+
+
+def normalize(text: str) -> str:
+    text = text.lower().replace("&", " and ")
+    text = _NON_WORD.sub(" ", text)
+    return _SPACES.sub(" ", text).strip()
+
+
+def tokenize(text: str) -> list:
+    words = normalize(text).split()
+    return [t for t in words if t not in STOPWORDS] or words
+
+
+def char_ngrams(token: str, n: int = NGRAM) -> set:
+    padded = f" {token} "
+    if len(padded) <= n:
+        return {padded}
+    return {padded[i:i + n] for i in range(len(padded) - n + 1)}
+
+
+def _phonetic_form(key: str) -> str:
+    return phonetic_key(" ".join(tokenize(key)))
+
+
+def _consonants(pkey: str) -> int:
+    # Phonetic keys are consonants plus a leading "a" for words that start with a vowel.
+    return sum(ch not in "a " for ch in pkey)
+
+
+def load_aliases(path) -> dict:
+    """Read {route name: [alias, ...]} from path; a missing file just means no aliases."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+class RouteIndex:
+    """Token and character-n-gram postings over route names and aliases.
+
+    A query is resolved by fuzzy-matching each of its tokens against the token
+    vocabulary (n-gram prefilter, then edit-ratio rescoring) and scoring only the
+    keys posted under the tokens it hits. Tokens posted under many keys ("land",
+    "data") are only walked when a key made of them alone could still win, and then
+    only until SCAN_BUDGET keys are in play, so the cost follows the selectivity of the
+    query rather than the catalog size. Equal scores rank a route whose name starts with
+    the query's first word ahead ("land" -> Land Acquisition, not Forest Land), then by
+    name, so results never depend on insertion order.
+    Edits and searches hold lock, so a catalog can be updated while it is being searched.
+
+    With phonetic=True every name and alias is also posted, by the same machinery, under
+    its phonetic key (phonetic.py), which Devanagari and misheard queries reach after
+    transliteration: "लैंड एक्विजिशन" and "lend acuisition" both find Land Acquisition.
+    """
+
+    def __init__(self, routes=None, aliases=None, token_cutoff=TOKEN_CUTOFF, min_query_chars=MIN_QUERY_CHARS,
+                 phonetic=True):
+        self.token_cutoff = token_cutoff
+        self.min_query_chars = min_query_chars
+        self.urls = {}
+        self._keys = defaultdict(set)          # route name -> normalized keys (name + aliases)
+        self._key_routes = defaultdict(set)    # normalized key -> route names
+        self._key_tokens = {}                  # normalized key -> token list
+        self._token_keys = defaultdict(dict)   # token -> {normalized key: occurrences}
+        self._compact_keys = defaultdict(set)  # run-together key ("masterdata") -> normalized keys
+        self._token_grams = defaultdict(set)   # char n-gram -> tokens
+        self._compact_grams = defaultdict(set) # char n-gram -> run-together keys
+        self._term_grams = {}                  # token or run-together key -> its n-grams
+        self.lock = threading.RLock()
+        self._phonetic = RouteIndex(token_cutoff=PHONETIC_CUTOFF, phonetic=False) if phonetic else None
+        aliases = aliases or {}
+        for name, url in (routes or {}).items():
+            self.add(name, url, aliases.get(name, ()))
+
+    def __len__(self):
+        return len(self.urls)
+
+    def __contains__(self, name):
+        return name in self.urls
+
+    def names(self):
+        with self.lock:
+            return list(self.urls)
+
+    def phrases(self):
+        """Every normalized route name and alias."""
+        with self.lock:
+            return list(self._key_routes)
+
+    # ---- building ----
+    def add(self, name, url=None, aliases=()):
+        with self.lock:
+            if name in self.urls:
+                self.remove(name)
+            self.urls[name] = url
+            for text in (name, *aliases):
+                self._add_text(name, text)
+
+    def add_alias(self, name, alias):
+        with self.lock:
+            self._add_text(name, alias)
+
+    def _add_text(self, name, text):
+        key = normalize(text)
+        self._add_key(name, key)
+        if self._phonetic is not None:
+            self._phonetic._add_key(name, _phonetic_form(key))
+
+    def _add_key(self, name, key):
+        if not key:
+            return
+        self._keys[name].add(key)
+        self._key_routes[key].add(name)
+        if key in self._key_tokens:
+            return
+        toks = list(dict.fromkeys(tokenize(key)))
+        self._key_tokens[key] = toks
+        for tok in toks:
+            postings = self._token_keys[tok]
+            if not postings:
+                self._add_grams(tok, self._token_grams)
+            postings[key] = postings.get(key, 0) + 1
+        if len(toks) > 1:
+            # The run-together form lets "mastercdata" reach "master data".
+            compact = "".join(toks)
+            if compact not in self._compact_keys:
+                self._add_grams(compact, self._compact_grams)
+            self._compact_keys[compact].add(key)
+
+    def _add_grams(self, term, gram_index):
+        grams = self._term_grams.get(term)
+        if grams is None:
+            # Interned tuple: a few thousand distinct grams are shared by every term, where
+            # per-term sets of fresh strings were most of the index at 50k routes.
+            grams = self._term_grams[term] = tuple(sys.intern(g) for g in char_ngrams(term))
+        for g in grams:
+            gram_index[g].add(term)
+
+    def _drop_grams(self, term, gram_index):
+        for g in self._term_grams[term]:
+            gram_index[g].discard(term)
+            if not gram_index[g]:
+                del gram_index[g]
+        if term not in self._token_keys and term not in self._compact_keys:
+            del self._term_grams[term]
+
+    def remove(self, name):
+        with self.lock:
+            self._remove(name)
+
+    def _remove(self, name):
+        self.urls.pop(name, None)
+        if self._phonetic is not None:
+            self._phonetic._remove(name)
+        for key in self._keys.pop(name, ()):
+            routes = self._key_routes[key]
+            routes.discard(name)
+            if routes:
+                continue
+            del self._key_routes[key]
+            toks = self._key_tokens.pop(key)
+            for tok in set(toks):
+                postings = self._token_keys[tok]
+                postings.pop(key, None)
+                if not postings:
+                    del self._token_keys[tok]
+                    self._drop_grams(tok, self._token_grams)
+            if len(toks) > 1:
+                compact = "".join(toks)
+                self._compact_keys[compact].discard(key)
+                if not self._compact_keys[compact]:
+                    del self._compact_keys[compact]
+                    self._drop_grams(compact, self._compact_grams)
+
+    # ---- lookup ----
+    def _similar(self, term, vocab, gram_index) -> dict:
+        """Entries of vocab similar to term, with similarity in [0, 1]."""
+        if term in vocab:
+            return {term: 1.0}
+        qgrams = char_ngrams(term)
+        shared = defaultdict(int)
+        room = SCAN_BUDGET
+        # Rarest grams first; once the budget is spent, common grams (" la", "and") only
+        # add to terms already in play.
+        for g in sorted(qgrams, key=lambda g: (len(gram_index.get(g, ())), g)):
+            terms = gram_index.get(g, ())
+            if room <= 0 and len(shared) < len(terms):
+                for t in shared:
+                    if t in terms:
+                        shared[t] += 1
+                continue
+            for t in terms:
+                if t in shared:
+                    shared[t] += 1
+                elif room > 0:
+                    shared[t] = 1
+                    room -= 1
+        nq = len(qgrams)
+        dice = {}
+        for t, n in shared.items():
+            d = 2.0 * n / (nq + len(self._term_grams[t]))
+            if d >= GRAM_PREFILTER:
+                dice[t] = d
+        out = {}
+        for t in heapq.nlargest(MAX_FUZZY_TOKENS, dice, key=lambda t: (dice[t], t)):
+            sim = difflib.SequenceMatcher(None, term, t).ratio()
+            cutoff = self.token_cutoff
+            if min(len(term), len(t)) <= SHORT_TOKEN_CHARS:
+                cutoff = max(cutoff, SHORT_TOKEN_CUTOFF)
+            if sim >= cutoff:
+                out[t] = sim
+        return out
+
+    def search(self, query: str, limit: int = 5) -> list:
+        """Ranked [(route name, score)] with scores in [0, 1]."""
+        with self.lock:
+            spelled = self._search(query)
+            best = spelled
+            devanagari = has_devanagari(query)
+            if self._phonetic is not None and query and (devanagari or max(spelled.values(), default=0.0) < PHONETIC_FALLBACK):
+                pquery = _phonetic_form(normalize(query))
+                if pquery and (devanagari or _consonants(pquery) >= PHONETIC_MIN_CONSONANTS):
+                    # A phonetic hit can confirm a spelling candidate, but one found only
+                    # phonetically ranks after every spelling candidate.
+                    weakest = min(spelled.values(), default=1.0)
+                    best = dict(spelled)
+                    for name, score in self._phonetic._search(pquery).items():
+                        score *= PHONETIC_WEIGHT
+                        if name not in spelled:
+                            best[name] = min(score, weakest)
+                        elif score > best[name]:
+                            best[name] = score
+            # A total order over every candidate, so the top results do not depend on limit.
+            first = tokenize(normalize(query))[:1]
+            key_tokens = self._key_tokens
+
+            def rank(kv):
+                name, score = kv
+                leads = key_tokens.get(normalize(name), ())[:1] == first
+                return name not in spelled, -score, not leads, name
+
+            ranked = heapq.nsmallest(limit, best.items(), key=rank)
+            return [(name, round(score, 4)) for name, score in ranked]
+
+    def _search(self, query) -> dict:
+        """{route name: score} for the RANK_CANDIDATES best-scoring keys."""
+        if not query:
+            return {}
+        qnorm = normalize(query)
+        if len(qnorm.replace(" ", "")) < self.min_query_chars:
+            return {}
+        if qnorm in self._key_routes:
+            return dict.fromkeys(self._key_routes[qnorm], 1.0)
+        qtoks = tokenize(qnorm)
+
+        vocab_hits = {}
+        for qtok in qtoks:
+            for tok, sim in self._similar(qtok, self._token_keys, self._token_grams).items():
+                if sim > vocab_hits.get(tok, 0.0):
+                    vocab_hits[tok] = sim
+
+        inv_nq = 1.0 / len(qtoks)
+        key_tokens = self._key_tokens
+
+        def score_of(key, w):
+            return 0.7 * w / len(key_tokens[key]) + 0.3 * min(1.0, w * inv_nq)
+
+        selective = {t: s for t, s in vocab_hits.items() if len(self._token_keys[t]) <= SELECTIVE_POSTINGS}
+        common = {t: s for t, s in vocab_hits.items() if t not in selective}
+        weights = defaultdict(float)
+        for tok, sim in selective.items():
+            for key, count in self._token_keys[tok].items():
+                weights[key] += sim * count
+        if common:
+            seeded = set(weights)
+            for tok, sim in common.items():
+                postings = self._token_keys[tok]
+                for key in seeded:
+                    count = postings.get(key)
+                    if count:
+                        weights[key] += sim * count
+            top = max((score_of(k, w) for k, w in weights.items()), default=0.0)
+            if top < 0.7 + 0.3 * min(1.0, sum(common.values()) * inv_nq):
+                room = SCAN_BUDGET
+                for tok in sorted(common, key=lambda t: (len(self._token_keys[t]), t)):
+                    sim, postings = common[tok], self._token_keys[tok]
+                    if room <= 0 and len(weights) < len(postings):
+                        # Out of budget: only add to the keys already in play.
+                        for key in weights:
+                            count = postings.get(key)
+                            if count and key not in seeded:
+                                weights[key] += sim * count
+                        continue
+                    for key, count in postings.items():
+                        if key in seeded:
+                            continue
+                        if key in weights:
+                            weights[key] += sim * count
+                        elif room > 0:
+                            weights[key] = sim * count
+                            room -= 1
+
+        scored = [(score_of(key, w), key) for key, w in weights.items()]
+        exact = all(q in self._token_keys for q in qtoks)
+        if not exact and max(scored, default=(0.0,))[0] < COMPACT_FALLBACK:
+            # Weak token-level result: compare the query run together against whole keys,
+            # which catches split or glued words ("dash board", "mastercdata"). Rescore the
+            # best token-level candidates if there are any, else search the compact index.
+            qcompact = "".join(qtoks)
+            if scored:
+                for _, key in heapq.nlargest(COMPACT_RESCORE, scored):
+                    toks = key_tokens[key]
+                    if len(toks) > 1:
+                        # Held to COMPACT_FALLBACK: a lower bar lets one word that shares a
+                        # prefix with a whole name through ("course" vs "courtcases").
+                        sim = difflib.SequenceMatcher(None, qcompact, "".join(toks)).ratio()
+                        if sim >= COMPACT_FALLBACK:
+                            scored.append((sim, key))
+            else:
+                compact_hits = self._similar(qcompact, self._compact_keys, self._compact_grams)
+                for compact, sim in compact_hits.items():
+                    for key in self._compact_keys[compact]:
+                        scored.append((sim, key))
+            if len(qtoks) > 1:
+                # Split words against one-word names: "dash bord" -> "dashboard".
+                for tok, sim in self._similar(qcompact, self._token_keys, self._token_grams).items():
+                    if sim >= COMPACT_FALLBACK and key_tokens.get(tok) == [tok]:
+                        scored.append((sim, tok))
+        best = {}
+        for score, key in heapq.nlargest(RANK_CANDIDATES, scored):
+            for name in self._key_routes[key]:
+                if score > best.get(name, 0.0):
+                    best[name] = score
+        return best
+
+    def best(self, query: str, cutoff: float = 0.5):
+        results = self.search(query, limit=1)
+        if results and results[0][1] >= cutoff:
+            return results[0][0]
+        return None
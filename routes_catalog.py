@@ -0,0 +1,167 @@
+import glob
+import json
+import os
+import threading
+import time
+
+from route_index import RouteIndex
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+# One or more files, directories or glob patterns, separated by os.pathsep.
+ROUTES_PATH = os.environ.get("OXLAND_ROUTES", os.path.join(ROOT, "modules_routes.json"))
+WATCH_INTERVAL = float(os.environ.get("OXLAND_ROUTES_WATCH_S", 1.0))
+
+
+def _is_aliases(path):
+    return "aliases" in os.path.basename(path)
+
+
+class CatalogDiff:
+    """Route names added, removed and changed (URL or aliases) by one reload."""
+
+    __slots__ = ("added", "removed", "changed")
+
+    def __init__(self, added=(), removed=(), changed=()):
+        self.added = list(added)
+        self.removed = list(removed)
+        self.changed = list(changed)
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed)
+
+    def __repr__(self):
+        return f"CatalogDiff(+{len(self.added)} -{len(self.removed)} ~{len(self.changed)})"
+
+
+class RoutesCatalog:
+    """{route name: url} merged from one or more JSON files, kept in a RouteIndex that is
+    patched in place when the files change.
+
+    Directories contribute every *.json in them; files with "aliases" in the name hold
+    {route name: [alias, ...]} (route_aliases.json next to a single routes file is picked
+    up too). Later files override earlier ones. Only files whose mtime or size moved are
+    re-read, and only the routes that differ are removed from and re-added to the index.
+    """
+
+    def __init__(self, paths=ROUTES_PATH, index=None):
+        self.paths = paths.split(os.pathsep) if isinstance(paths, str) else list(paths)
+        self.index = index or RouteIndex()
+        self.routes = {}
+        self.aliases = {}
+        self.version = 0
+        self.error = None
+        self._files = {}          # path -> ((mtime, size), parsed JSON)
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._watcher = None
+
+    def __len__(self):
+        return len(self.routes)
+
+    def url(self, name):
+        return self.routes.get(name)
+
+    def names(self):
+        return list(self.routes)
+
+    def subscribe(self, listener):
+        """Call listener(catalog, diff) after every reload that changed something."""
+        self._listeners.append(listener)
+
+    # ---- loading ----
+    def files(self):
+        found = []
+        for path in self.paths:
+            if os.path.isdir(path):
+                found.extend(sorted(glob.glob(os.path.join(path, "*.json"))))
+            elif glob.has_magic(path):
+                found.extend(sorted(glob.glob(path)))
+            else:
+                found.append(path)
+                sibling = os.path.join(os.path.dirname(path), "route_aliases.json")
+                if not _is_aliases(path) and os.path.exists(sibling):
+                    found.append(sibling)
+        return list(dict.fromkeys(found))
+
+    def _read(self, path):
+        """(stamp, data) for path, reusing the cached parse while its mtime and size hold."""
+        st = os.stat(path)
+        stamp = (st.st_mtime_ns, st.st_size)
+        cached = self._files.get(path)
+        if cached and cached[0] == stamp:
+            return cached
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if not isinstance(data, dict):
+            raise ValueError(f"{path}: expected a JSON object")
+        return stamp, data
+
+    def reload(self) -> CatalogDiff:
+        """Re-read changed files and patch the index; raises (leaving the catalog as it was) on bad input."""
+        with self._lock:
+            paths = self.files()
+            if not any(not _is_aliases(p) for p in paths):
+                raise FileNotFoundError(f"no routes files in {os.pathsep.join(self.paths)}")
+            files = {path: self._read(path) for path in paths}
+            if self.version and files == self._files:
+                return CatalogDiff()
+            routes, aliases = {}, {}
+            for path, (_, data) in files.items():
+                (aliases if _is_aliases(path) else routes).update(data)
+            diff = self._apply(routes, {name: list(aliases.get(name, ())) for name in routes})
+            self._files = files
+            self.version += 1
+        if diff:
+            for listener in self._listeners:
+                try:
+                    listener(self, diff)
+                except Exception as e:
+                    print(f"[Routes listener error: {e}]")
+        return diff
+
+    def _apply(self, routes, aliases):
+        old_routes, old_aliases = self.routes, self.aliases
+        diff = CatalogDiff(
+            added=[n for n in routes if n not in old_routes],
+            removed=[n for n in old_routes if n not in routes],
+            changed=[n for n in routes if n in old_routes
+                     and (routes[n] != old_routes[n] or aliases[n] != old_aliases.get(n))])
+        index = self.index
+        with index.lock:
+            for name in diff.removed:
+                index.remove(name)
+            for name in diff.changed:
+                if aliases[name] == old_aliases.get(name):
+                    index.urls[name] = routes[name]      # URL only: postings are unchanged
+                else:
+                    index.add(name, routes[name], aliases[name])
+            for name in diff.added:
+                index.add(name, routes[name], aliases[name])
+        self.routes, self.aliases = routes, aliases
+        return diff
+
+    # ---- watching ----
+    def watch(self, interval=WATCH_INTERVAL):
+        """Poll the files on a daemon thread and apply changes as they appear."""
+        if self._watcher is None:
+            self._watcher = threading.Thread(target=self._watch, args=(interval,), name="routes-watch", daemon=True)
+            self._watcher.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _watch(self, interval):
+        while not self._stop.wait(interval):
+            try:
+                t0 = time.perf_counter()
+                diff = self.reload()
+                self.error = None
+                if diff:
+                    print(f"(Routes reloaded: {diff} in {(time.perf_counter() - t0) * 1000:.0f} ms)")
+            except Exception as e:
+                # Half-written file or bad JSON: keep serving the last good catalog.
+                if str(e) != str(self.error):
+                    print(f"[Routes reload error: {e}]")
+                self.error = e
@@ -0,0 +1,91 @@
+import os
+import statistics
+import time
+
+# Long-running kiosk sessions (ree.py --session): one user's language and name are kept
+# across any number of commands until they say exit or reset, or walk away. Like
+# dialog.py, nothing here touches audio devices.
+SESSION_IDLE_S = float(os.environ.get("OXLAND_SESSION_IDLE_S", 90))
+
+# ------------------ States ------------------
+STANDBY = "standby"                  # nobody at the kiosk; wait for speech before greeting
+CHOOSE_LANGUAGE = "choose_language"
+CAPTURE_NAME = "capture_name"
+COMMAND = "command"                  # open tabs, answer questions; loops until exit/reset/idle
+ADDRESS = "address"                  # the next utterance is an address for Google Maps
+
+TRANSITIONS = {
+    STANDBY: {"wake": CHOOSE_LANGUAGE},
+    CHOOSE_LANGUAGE: {"chosen": CAPTURE_NAME, "idle": STANDBY, "exit": STANDBY},
+    CAPTURE_NAME: {"named": COMMAND, "idle": STANDBY, "exit": STANDBY},
+    COMMAND: {"tab": COMMAND, "address": ADDRESS, "reset": CHOOSE_LANGUAGE, "idle": STANDBY, "exit": STANDBY},
+    ADDRESS: {"opened": COMMAND, "reset": CHOOSE_LANGUAGE, "idle": STANDBY, "exit": STANDBY},
+}
+# Events that end the current user's session and forget who they were.
+ENDS_USER = {"reset", "idle", "exit"}
+
+
+class SessionState:
+    """Where the kiosk dialog is and who it is talking to; fire() moves it along TRANSITIONS."""
+
+    def __init__(self, idle_s=SESSION_IDLE_S, clock=time.monotonic):
+        self.idle_s = idle_s
+        self.clock = clock
+        self.state = STANDBY
+        self.lang = None
+        self.name = None
+        self.sessions = 0
+        self.commands = 0
+        self.last_activity = clock()
+
+    def fire(self, event) -> str:
+        try:
+            nxt = TRANSITIONS[self.state][event]
+        except KeyError:
+            raise ValueError(f"no transition from {self.state!r} on {event!r}") from None
+        if event == "wake":
+            self.sessions += 1
+            self.commands = 0
+        if event in ENDS_USER:
+            self.lang = None
+            self.name = None
+        self.state = nxt
+        self.touch()
+        return nxt
+
+    def touch(self):
+        self.last_activity = self.clock()
+
+    def expired(self) -> bool:
+        """No progress for idle_s: the user has most likely walked away."""
+        return self.clock() - self.last_activity >= self.idle_s
+
+
+class CommandLatency:
+    """Speech-end -> action latency per command, the process's first command (cold) kept apart.
+
+    The first command can wait on models still loading in the background; later ones run
+    against warm models. Process start-up itself is covered by model_registry.StartupReport.
+    """
+
+    def __init__(self):
+        self.cold = None
+        self.warm = []
+
+    def record(self, kind, seconds) -> str:
+        if self.cold is None:
+            self.cold = (kind, seconds)
+            return "cold"
+        self.warm.append((kind, seconds))
+        return "warm"
+
+    def summary(self) -> dict:
+        warm = sorted(s for _, s in self.warm)
+        out = {
+            "cold_command_ms": round(self.cold[1] * 1000, 1) if self.cold else None,
+            "warm_commands": len(warm),
+        }
+        if warm:
+            out["warm_p50_ms"] = round(statistics.median(warm) * 1000, 1)
+            out["warm_p95_ms"] = round(warm[min(len(warm) - 1, int(len(warm) * 0.95))] * 1000, 1)
+        return out
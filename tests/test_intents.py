@@ -0,0 +1,79 @@
+import pytest
+
+from dialog import ask_yes_no, detect_language_choice
+from intents import IntentEngine
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return IntentEngine()
+
+
+# Keywords match on word boundaries only.
+@pytest.mark.parametrize("text, intent", [
+    ("exit", "exit"),
+    ("EXIT!", "exit"),
+    ("please exit now", "exit"),
+    ("i want to quit", "exit"),
+    ("start over", "reset"),
+    ("reset", "reset"),
+    ("yes please", "yes"),
+    ("nope", "no"),
+    ("हाँ", "yes"),
+    ("नहीं", "no"),
+    ("english please", "lang_en"),
+    ("हिंदी", "lang_hi"),
+])
+def test_keyword_is_exact(engine, text, intent):
+    assert engine.classify(text).score(intent) == 1.0
+
+
+@pytest.mark.parametrize("text, intent", [
+    ("exiting", "exit"),
+    ("yesterday", "yes"),
+    ("know", "no"),
+    ("snow", "no"),
+    ("noted", "no"),
+    ("i don't know", "no"),
+])
+def test_keyword_inside_another_word_does_not_match(engine, text, intent):
+    assert engine.classify(text).score(intent) < 0.5
+
+
+# Near misses score below 1.0, which ree.py and session mode require before exiting or
+# resetting; only the keyword itself may end a session.
+@pytest.mark.parametrize("text, intent", [
+    ("quiet", "exit"),
+    ("quite", "exit"),
+    ("exist", "exit"),
+    ("exits", "exit"),
+    ("resetting", "reset"),
+])
+def test_fuzzy_near_miss_never_scores_as_exact(engine, text, intent):
+    assert 0.0 < engine.classify(text).score(intent) < 1.0
+
+
+def test_i_dont_know_is_neither_yes_nor_no():
+    assert ask_yes_no("I don't know") is None
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("yes", "yes"),
+    ("yeah sure", "yes"),
+    ("no thanks", "no"),
+    ("nahi", "no"),
+    ("", None),
+])
+def test_ask_yes_no(text, expected):
+    assert ask_yes_no(text) == expected
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("english", "en"),
+    ("inglish", "en"),
+    ("hindi", "hi"),
+    ("हिन्दी", "hi"),
+    ("banana", None),
+])
+def test_detect_language_choice(text, expected):
+    assert detect_language_choice(text) == expected
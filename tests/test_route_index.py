@@ -0,0 +1,96 @@
+import json
+import os
+
+import pytest
+
+from route_index import RouteIndex, load_aliases
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def index():
+    with open(os.path.join(ROOT, "modules_routes.json"), "r", encoding="utf-8") as f:
+        routes = json.load(f)
+    return RouteIndex(routes, load_aliases(os.path.join(ROOT, "route_aliases.json")))
+
+
+def names(results):
+    return [name for name, _ in results]
+
+
+def test_equal_scores_prefer_names_led_by_the_query_then_alphabetical(index):
+    results = index.search("land", limit=10)
+    assert len({score for _, score in results}) == 1
+    assert names(results) == ["Land Acquisition", "Land Aggregator", "Land Use & Land Cover", "Forest Land"]
+
+
+@pytest.mark.parametrize("query", ["land", "lend acuisition", "court", "data", "लैंड एक्विजिशन", "dash bord"])
+def test_ranking_does_not_depend_on_limit(index, query):
+    full = index.search(query, limit=20)
+    for limit in (1, 2, 3):
+        assert index.search(query, limit=limit) == full[:limit]
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("open forest land", "Forest Land"),
+    ("please go to the master data page", "Master Data"),
+    ("show me the dashboard", "Dashboard"),
+])
+def test_filler_words_are_ignored(index, query, expected):
+    assert index.search(query, limit=1) == [(expected, 1.0)]
+
+
+def test_name_made_only_of_stopwords_still_matches():
+    index = RouteIndex({"Show Me": "/show-me", "Settings": "/settings"})
+    assert index.search("show me", limit=1) == [("Show Me", 1.0)]
+
+
+@pytest.mark.parametrize("query", ["please", "open the", "hello", "house", "yes", "start"])
+def test_filler_and_short_words_match_nothing(index, query):
+    assert index.best(query) is None
+
+
+def test_min_query_chars(index):
+    assert index.search("a") == []
+    assert names(index.search("faq", limit=1)) == ["FAQs"]
+    strict = RouteIndex({"FAQs": "/faq"}, min_query_chars=4)
+    assert strict.search("faq") == []
+    assert names(strict.search("faqs", limit=1)) == ["FAQs"]
+
+
+def test_add_and_remove(index):
+    assert index.best("crop insurance") is None
+    index.add("Crop Insurance", "/crop-insurance", ["fasal bima"])
+    assert index.best("crop insurance") == "Crop Insurance"
+    assert index.best("fasal bima") == "Crop Insurance"
+    index.remove("Crop Insurance")
+    assert "Crop Insurance" not in index
+    assert index.best("crop insurance") is None
+    assert index.best("fasal bima") is None
+
+
+def test_remove_everything_leaves_an_empty_index(index):
+    for name in index.names():
+        index.remove(name)
+    assert len(index) == 0
+    assert index.phrases() == []
+    assert index.search("land") == []
+
+
+def test_adding_a_duplicate_name_replaces_it(index):
+    size = len(index)
+    assert index.best("home") == "Dashboard"
+    index.add("Dashboard", "/new-dashboard", ["start page"])
+    assert len(index) == size
+    assert index.urls["Dashboard"] == "/new-dashboard"
+    assert index.best("home") is None
+    assert index.best("start page") == "Dashboard"
+    assert index.best("dashboard") == "Dashboard"
+
+
+def test_shared_alias_survives_removing_one_owner():
+    index = RouteIndex({"Court Cases": "/a", "Litigation": "/b"}, {"Court Cases": ["legal"], "Litigation": ["legal"]})
+    assert sorted(names(index.search("legal"))) == ["Court Cases", "Litigation"]
+    index.remove("Court Cases")
+    assert names(index.search("legal")) == ["Litigation"]
@@ -0,0 +1,76 @@
+import threading
+import time
+
+from tts_backends import TTSBackend, TTSSelector
+
+
+class FakeBackend(TTSBackend):
+    languages = frozenset({"en", "hi"})
+
+    def __init__(self, name, offline=True, delay_s=0.0, audio=b"RIFF....WAVE"):
+        self.name = name
+        self.offline = offline
+        self.delay_s = delay_s
+        self.audio = audio
+        self.calls = 0
+
+    def available(self):
+        return True
+
+    def synthesize(self, text, lang="en"):
+        self.calls += 1
+        time.sleep(self.delay_s)
+        return self.audio
+
+
+class HangingBackend(FakeBackend):
+    """Stands in for gTTS on a firewalled site: blocks until released."""
+
+    def __init__(self, name="gtts"):
+        super().__init__(name, offline=False)
+        self.release = threading.Event()
+
+    def synthesize(self, text, lang="en"):
+        self.calls += 1
+        self.release.wait(30)
+        raise OSError("connect timed out")
+
+
+def test_hanging_online_backend_falls_back_within_deadline():
+    hanging, local = HangingBackend(), FakeBackend("espeak")
+    selector = TTSSelector([hanging, local], deadline_s=0.2)
+    try:
+        t0 = time.perf_counter()
+        data, voice = selector("Hello", "en")
+        elapsed = time.perf_counter() - t0
+    finally:
+        hanging.release.set()
+    assert data == local.audio and voice == {"engine": "espeak"}
+    assert elapsed < 1.0
+    assert selector.stats()["gtts:en"]["failures"] == 1
+
+
+def test_timed_out_backend_cools_down():
+    hanging, local = HangingBackend(), FakeBackend("espeak")
+    selector = TTSSelector([hanging, local], deadline_s=0.1)
+    try:
+        selector("Hello", "en")
+        t0 = time.perf_counter()
+        selector("Goodbye", "en")
+        assert time.perf_counter() - t0 < 0.1
+    finally:
+        hanging.release.set()
+    assert hanging.calls == 1 and local.calls == 2
+
+
+def test_online_backend_within_deadline_is_used():
+    online, local = FakeBackend("gtts", offline=False, delay_s=0.05, audio=b"ID3mp3"), FakeBackend("espeak")
+    data, voice = TTSSelector([online, local], deadline_s=1.0)("Hello", "en")
+    assert data == b"ID3mp3" and voice == {"engine": "gtts"}
+    assert local.calls == 0
+
+
+def test_offline_backend_is_not_cut_off():
+    slow, local = FakeBackend("piper", delay_s=0.3), FakeBackend("espeak")
+    data, voice = TTSSelector([slow, local], deadline_s=0.1)("Hello", "en")
+    assert voice == {"engine": "piper"}
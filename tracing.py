@@ -0,0 +1,233 @@
+import contextlib
+import contextvars
+import functools
+import itertools
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+
+TRACE_FILE = os.environ.get("OXLAND_TRACE")            # JSON lines, one record per turn
+PROM_FILE = os.environ.get("OXLAND_TRACE_PROM")        # node_exporter textfile-collector .prom file
+BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0, 30.0)
+
+_current = contextvars.ContextVar("oxland_span", default=None)
+
+
+class Span:
+    """One timed stage; spans opened inside it are attached to the same turn."""
+
+    __slots__ = ("stage", "start", "duration", "attrs", "turn")
+
+    def __init__(self, stage, turn, attrs):
+        self.stage = stage
+        self.turn = turn
+        self.attrs = attrs
+        self.start = time.monotonic()
+        self.duration = None
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+
+class Turn:
+    """Everything traced under one outermost span."""
+
+    def __init__(self, turn_id, root_stage):
+        self.id = turn_id
+        self.root_stage = root_stage
+        self.wall = time.time()
+        self.spans = []
+        self.counters = defaultdict(int)
+        self.root = None                  # set by begin() for a root span it opened
+
+
+class _NoSpan:
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+class Tracer:
+    """Collects per-turn stage timings and exports them as JSON lines and Prometheus text.
+
+    Disabled unless a trace or prom file is configured; then span() hands back a shared
+    no-op and traced functions cost one attribute check.
+    """
+
+    def __init__(self, trace_file=TRACE_FILE, prom_file=PROM_FILE, buckets=BUCKETS):
+        self.trace_file = trace_file
+        self.prom_file = prom_file
+        self.buckets = buckets
+        self.enabled = bool(trace_file or prom_file)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._hist = {}                      # (metric, stage) -> [bucket counts..., sum, count]
+        self._counters = defaultdict(int)    # counter name -> total
+
+    def span(self, stage, **attrs):
+        if not self.enabled:
+            return _NO_SPAN
+        return self._span(stage, attrs)
+
+    @contextlib.contextmanager
+    def _span(self, stage, attrs):
+        parent = _current.get()
+        turn = parent.turn if parent is not None else Turn(next(self._ids), stage)
+        span = Span(stage, turn, attrs)
+        token = _current.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.attrs["error"] = type(e).__name__
+            raise
+        finally:
+            span.duration = time.monotonic() - span.start
+            _current.reset(token)
+            turn.spans.append(span)
+            if parent is None:
+                self._finish(turn, span)
+
+    def begin(self, stage, parent=None, **attrs):
+        """Open a span that is not bound to a with block; close it with end().
+
+        For turns whose stages run on different tasks and threads: attach() makes it the
+        parent of spans opened there. Returns None when tracing is disabled.
+        """
+        if not self.enabled:
+            return None
+        if parent is not None:
+            return Span(stage, parent.turn, attrs)
+        turn = Turn(next(self._ids), stage)
+        turn.root = Span(stage, turn, attrs)
+        return turn.root
+
+    def end(self, span):
+        """Close a span from begin(); closing a root span writes out its turn."""
+        if span is None or span.duration is not None:
+            return
+        span.duration = time.monotonic() - span.start
+        span.turn.spans.append(span)
+        if span is span.turn.root:
+            self._finish(span.turn, span)
+
+    def _finish(self, turn, root):
+        origin = root.start
+        record = {
+            "ts": round(turn.wall, 3),
+            "turn": turn.id,
+            "stage": turn.root_stage,
+            "duration_ms": round(root.duration * 1000, 2),
+            "spans": [dict(stage=s.stage, start_ms=round((s.start - origin) * 1000, 2),
+                           duration_ms=round(s.duration * 1000, 2), **s.attrs)
+                      for s in sorted(turn.spans, key=lambda s: s.start)],
+            "counters": dict(turn.counters),
+        }
+        with self._lock:
+            self._observe("oxland_turn_seconds", turn.root_stage, root.duration)
+            for s in turn.spans:
+                self._observe("oxland_stage_seconds", s.stage, s.duration)
+            for name, n in turn.counters.items():
+                self._counters[name] += n
+            if self.trace_file:
+                with open(self.trace_file, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            if self.prom_file:
+                self._write_prom()
+
+    def _observe(self, metric, stage, seconds):
+        h = self._hist.get((metric, stage))
+        if h is None:
+            h = self._hist[(metric, stage)] = [0] * (len(self.buckets) + 2)
+        for i, le in enumerate(self.buckets):
+            if seconds <= le:
+                h[i] += 1
+        h[-2] += seconds
+        h[-1] += 1
+
+    def _write_prom(self):
+        lines = []
+        for metric, help_text in (("oxland_turn_seconds", "Duration of a whole turn by its outermost stage."),
+                                  ("oxland_stage_seconds", "Duration of each traced stage.")):
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} histogram"]
+            for (m, stage), h in sorted(self._hist.items()):
+                if m != metric:
+                    continue
+                for le, n in zip(self.buckets, h):
+                    lines.append(f'{metric}_bucket{{stage="{stage}",le="{le}"}} {n}')
+                lines.append(f'{metric}_bucket{{stage="{stage}",le="+Inf"}} {h[-1]}')
+                lines.append(f'{metric}_sum{{stage="{stage}"}} {h[-2]:.6f}')
+                lines.append(f'{metric}_count{{stage="{stage}"}} {h[-1]}')
+        if self._counters:
+            lines += ["# HELP oxland_events_total Counted events (cache hits, fallbacks).",
+                      "# TYPE oxland_events_total counter"]
+            lines += [f'oxland_events_total{{event="{name}"}} {n}' for name, n in sorted(self._counters.items())]
+        # The collector may read at any time, so replace the file atomically.
+        tmp = f"{self.prom_file}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        os.replace(tmp, self.prom_file)
+
+
+tracer = Tracer()
+
+
+def traced(stage, **attrs):
+    """Decorator: time every call of the function as stage."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return fn(*args, **kwargs)
+            with tracer.span(stage, **attrs):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def span(stage, **attrs):
+    return tracer.span(stage, **attrs)
+
+
+def begin(stage, parent=None, **attrs):
+    return tracer.begin(stage, parent, **attrs)
+
+
+def end(span):
+    tracer.end(span)
+
+
+def attach(span):
+    """Context in which new spans nest under span (from begin()); asyncio.to_thread carries it along."""
+    if span is None:
+        return _NO_SPAN
+    return _attached(span)
+
+
+@contextlib.contextmanager
+def _attached(span):
+    token = _current.set(span)
+    try:
+        yield span
+    finally:
+        _current.reset(token)
+
+
+def annotate(**attrs):
+    """Attach attributes (audio duration, backend...) to the innermost open span, if any."""
+    current = _current.get()
+    if current is not None:
+        current.attrs.update(attrs)
+
+
+def count(name, n=1):
+    """Bump a per-turn counter such as tts_cache_hit; no-op outside a traced turn."""
+    current = _current.get()
+    if current is not None:
+        current.turn.counters[name] += n
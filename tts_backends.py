@@ -0,0 +1,277 @@
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+
+import tracing
+from tts_cache import GTTS_VOICE, synthesize_gtts
+
+# Preference order (best voice first); a backend is skipped while it is unavailable,
+# cooling down after a failure, or measured slower than LATENCY_BUDGET_S.
+BACKEND_ORDER = os.environ.get("OXLAND_TTS_BACKENDS", "gtts,piper,espeak,pyttsx3").split(",")
+LATENCY_BUDGET_S = float(os.environ.get("OXLAND_TTS_LATENCY_BUDGET_S", 1.5))
+FAILURE_COOLDOWN_S = 60.0
+REPROBE_S = 300.0          # retry an over-budget backend this often in case it recovered
+EWMA_ALPHA = 0.3
+SUBPROCESS_TIMEOUT_S = 20.0
+# Online backends (gTTS) that have not answered by then count as failed; on an offline site
+# this is how long a phrase waits before the next backend is tried.
+NETWORK_DEADLINE_S = float(os.environ.get("OXLAND_TTS_NETWORK_DEADLINE_S", 5.0))
+
+
+class TTSBackend:
+    """One synthesis engine: synthesize(text, lang) -> encoded audio bytes (mp3 or wav)."""
+
+    name = "base"
+    languages = frozenset()
+    offline = True
+
+    def available(self) -> bool:
+        return False
+
+    def voice(self, lang) -> dict:
+        """Settings that change the audio; part of the TTS cache key."""
+        return {"engine": self.name}
+
+    def synthesize(self, text, lang="en") -> bytes:
+        raise NotImplementedError
+
+
+class GTTSBackend(TTSBackend):
+    name = "gtts"
+    languages = frozenset({"en", "hi"})
+    offline = False
+
+    def available(self):
+        try:
+            import gtts  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def voice(self, lang):
+        return GTTS_VOICE
+
+    def synthesize(self, text, lang="en"):
+        return synthesize_gtts(text, lang, GTTS_VOICE)
+
+
+class EspeakBackend(TTSBackend):
+    """espeak-ng (or espeak) command line, WAV on stdout."""
+
+    name = "espeak"
+    languages = frozenset({"en", "hi"})
+    VOICES = {"en": "en-us", "hi": "hi"}
+
+    def __init__(self, speed=160):
+        self.speed = speed
+        self.binary = shutil.which("espeak-ng") or shutil.which("espeak")
+
+    def available(self):
+        return self.binary is not None
+
+    def voice(self, lang):
+        return {"engine": self.name, "voice": self.VOICES[lang], "speed": self.speed}
+
+    def synthesize(self, text, lang="en"):
+        cmd = [self.binary, "--stdout", "-v", self.VOICES[lang], "-s", str(self.speed), text]
+        return subprocess.run(cmd, check=True, capture_output=True, timeout=SUBPROCESS_TIMEOUT_S).stdout
+
+
+class PiperBackend(TTSBackend):
+    """Piper neural TTS; one .onnx voice per language from OXLAND_PIPER_MODEL / OXLAND_PIPER_MODEL_HI."""
+
+    name = "piper"
+
+    def __init__(self):
+        self.binary = shutil.which("piper")
+        self.models = {lang: path for lang, path in (("en", os.environ.get("OXLAND_PIPER_MODEL")),
+                                                     ("hi", os.environ.get("OXLAND_PIPER_MODEL_HI")))
+                       if path and os.path.exists(path)}
+        self.languages = frozenset(self.models)
+
+    def available(self):
+        return self.binary is not None and bool(self.models)
+
+    def voice(self, lang):
+        return {"engine": self.name, "model": os.path.basename(self.models[lang])}
+
+    def synthesize(self, text, lang="en"):
+        fd, out = tempfile.mkstemp(suffix=".wav")
+        os.close(fd)
+        try:
+            subprocess.run([self.binary, "--model", self.models[lang], "--output_file", out], input=text.encode("utf-8"),
+                           check=True, capture_output=True, timeout=SUBPROCESS_TIMEOUT_S)
+            with open(out, "rb") as f:
+                return f.read()
+        finally:
+            os.remove(out)
+
+
+class Pyttsx3Backend(TTSBackend):
+    """The OS speech engine (SAPI5 / NSSpeechSynthesizer / espeak) through pyttsx3, rendered to WAV."""
+
+    name = "pyttsx3"
+
+    def __init__(self, rate=170):
+        self.rate = rate
+        self._engine = None
+        self._voices = {}
+        self._lock = threading.Lock()   # pyttsx3 engines are not thread-safe
+        self.languages = frozenset()
+        try:
+            import pyttsx3
+        except ImportError:
+            return
+        try:
+            self._engine = pyttsx3.init()
+        except Exception:
+            return
+        for v in self._engine.getProperty("voices"):
+            tags = " ".join([v.id, v.name or "", *(str(x) for x in (v.languages or ()))]).lower()
+            for lang, marks in (("en", ("en", "english")), ("hi", ("hi", "hindi"))):
+                if lang not in self._voices and any(m in tags for m in marks):
+                    self._voices[lang] = v.id
+        self.languages = frozenset(self._voices)
+
+    def available(self):
+        return self._engine is not None and bool(self._voices)
+
+    def voice(self, lang):
+        return {"engine": self.name, "voice": self._voices[lang], "rate": self.rate}
+
+    def synthesize(self, text, lang="en"):
+        fd, out = tempfile.mkstemp(suffix=".wav")
+        os.close(fd)
+        try:
+            with self._lock:
+                self._engine.setProperty("voice", self._voices[lang])
+                self._engine.setProperty("rate", self.rate)
+                self._engine.save_to_file(text, out)
+                self._engine.runAndWait()
+            with open(out, "rb") as f:
+                return f.read()
+        finally:
+            os.remove(out)
+
+
+BACKENDS = {"gtts": GTTSBackend, "piper": PiperBackend, "espeak": EspeakBackend, "pyttsx3": Pyttsx3Backend}
+
+
+class _Health:
+    __slots__ = ("calls", "failures", "ewma_s", "last_s", "measured_at", "down_until", "last_error")
+
+    def __init__(self):
+        self.calls = 0
+        self.failures = 0
+        self.ewma_s = None
+        self.last_s = None
+        self.measured_at = 0.0
+        self.down_until = 0.0
+        self.last_error = None
+
+
+class TTSSelector:
+    """Picks a backend per phrase and falls back down the list when one fails.
+
+    Backends are tried in preference order, skipping those without the language, not
+    installed, cooling down after a failure, or whose measured latency (an EWMA per
+    backend and language) is over budget while a faster one exists. Used as a TTSCache
+    synthesizer: voices(lang) lists the cache keys to probe and synthesize returns the
+    audio with the voice it was made with, so each engine's audio is cached separately.
+    Lookups probe every known voice, so a clip rendered while gTTS was reachable is still
+    played from the cache when it is not. An online backend that has not answered within
+    deadline_s is abandoned (left to finish on its thread) and cooled down like a failure.
+    """
+
+    def __init__(self, backends=None, budget_s=LATENCY_BUDGET_S, cooldown_s=FAILURE_COOLDOWN_S,
+                 deadline_s=NETWORK_DEADLINE_S):
+        if backends is None:
+            backends = [BACKENDS[name.strip()]() for name in BACKEND_ORDER if name.strip() in BACKENDS]
+        self.known = list(backends)
+        self.backends = [b for b in backends if b.available()]
+        self.budget_s = budget_s
+        self.cooldown_s = cooldown_s
+        self.deadline_s = deadline_s
+        self._health = {}
+        self._lock = threading.Lock()
+
+    def _h(self, backend, lang) -> _Health:
+        return self._health.setdefault((backend.name, lang), _Health())
+
+    def candidates(self, lang):
+        """Backends to try for lang, best first."""
+        now = time.monotonic()
+        with self._lock:
+            usable = [b for b in self.backends if lang in b.languages and self._h(b, lang).down_until <= now]
+            fast = [b for b in usable if (self._h(b, lang).ewma_s or 0.0) <= self.budget_s
+                    or now - self._h(b, lang).measured_at > REPROBE_S]
+            slow = sorted((b for b in usable if b not in fast), key=lambda b: self._h(b, lang).ewma_s)
+        return fast + slow
+
+    def voices(self, lang):
+        """Cache keys to probe for lang: the candidates best first, then every other known voice."""
+        first = self.candidates(lang)
+        return [b.voice(lang) for b in first] + [b.voice(lang) for b in self.known
+                                                  if b not in first and lang in b.languages]
+
+    def __call__(self, text, lang="en", voice=None):
+        """(audio bytes, voice) from the first candidate that succeeds."""
+        errors = []
+        for backend in self.candidates(lang):
+            t0 = time.perf_counter()
+            try:
+                data = self._synthesize(backend, text, lang)
+                if not data:
+                    raise RuntimeError("empty audio")
+            except Exception as e:
+                errors.append(f"{backend.name}: {e}")
+                self._record(backend, lang, None, e)
+                continue
+            elapsed = time.perf_counter() - t0
+            self._record(backend, lang, elapsed)
+            tracing.annotate(tts_backend=backend.name)
+            return data, backend.voice(lang)
+        raise RuntimeError(f"no TTS backend for {lang!r}: " + ("; ".join(errors) or "none available"))
+
+    def _synthesize(self, backend, text, lang):
+        if backend.offline or self.deadline_s is None:
+            return backend.synthesize(text, lang)
+        result = {}
+
+        def run():
+            try:
+                result["data"] = backend.synthesize(text, lang)
+            except Exception as e:
+                result["error"] = e
+
+        worker = threading.Thread(target=run, name=f"tts-{backend.name}", daemon=True)
+        worker.start()
+        worker.join(self.deadline_s)
+        if worker.is_alive():
+            raise TimeoutError(f"no audio after {self.deadline_s:g} s")
+        if "error" in result:
+            raise result["error"]
+        return result["data"]
+
+    def _record(self, backend, lang, elapsed, error=None):
+        with self._lock:
+            h = self._h(backend, lang)
+            h.calls += 1
+            if error is not None:
+                h.failures += 1
+                h.last_error = str(error)
+                h.down_until = time.monotonic() + self.cooldown_s
+                return
+            h.last_s = elapsed
+            h.measured_at = time.monotonic()
+            h.ewma_s = elapsed if h.ewma_s is None else h.ewma_s + EWMA_ALPHA * (elapsed - h.ewma_s)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {f"{name}:{lang}": {"calls": h.calls, "failures": h.failures,
+                                        "ewma_ms": round(h.ewma_s * 1000, 1) if h.ewma_s is not None else None,
+                                        "last_error": h.last_error}
+                    for (name, lang), h in self._health.items()}
@@ -0,0 +1,207 @@
+import hashlib
+import io
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import tracing
+
+CACHE_DIR = os.environ.get(
+    "OXLAND_TTS_CACHE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".tts_cache"),
+)
+CACHE_MAX_BYTES = int(os.environ.get("OXLAND_TTS_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+GTTS_VOICE = {"engine": "gtts", "tld": "com", "slow": False}
+GTTS_TIMEOUT_S = float(os.environ.get("OXLAND_GTTS_TIMEOUT_S", 3.0))   # per request to translate.google
+AUDIO_EXTS = (".mp3", ".wav")
+
+
+def audio_ext(data: bytes) -> str:
+    """File extension for encoded audio: RIFF/WAVE from the local engines, else mp3 (gTTS)."""
+    return ".wav" if data[:4] == b"RIFF" and data[8:12] == b"WAVE" else ".mp3"
+
+
+def synthesize_gtts(text: str, lang: str = "en", voice: dict = None) -> bytes:
+    """Render text to mp3 bytes with gTTS."""
+    from gtts import gTTS
+
+    voice = voice or GTTS_VOICE
+    buf = io.BytesIO()
+    gTTS(text=text, lang=lang, tld=voice.get("tld", "com"), slow=voice.get("slow", False),
+         timeout=GTTS_TIMEOUT_S).write_to_fp(buf)
+    return buf.getvalue()
+
+
+class TTSCache:
+    """Content-addressed audio cache with a size cap and LRU eviction.
+
+    synthesize(text, lang, voice) returns encoded audio, or (audio, voice) when it picks
+    the voice itself; a synthesizer with a voices(lang) method (tts_backends.TTSSelector)
+    has every voice it knows for the language probed on lookup, best first.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes=CACHE_MAX_BYTES, synthesize=synthesize_gtts):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.synthesize = synthesize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> size in bytes, oldest first
+        self._ext = {}                 # key -> file extension of its audio format
+        self._size = 0
+        self._lock = threading.Lock()
+        self._inflight = {}
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load_existing()
+
+    def _load_existing(self):
+        found = []
+        for fname in os.listdir(self.cache_dir):
+            key, ext = os.path.splitext(fname)
+            if ext not in AUDIO_EXTS:
+                continue
+            st = os.stat(os.path.join(self.cache_dir, fname))
+            found.append((st.st_mtime, key, ext, st.st_size))
+        for _, key, ext, size in sorted(found):
+            self._size -= self._entries.pop(key, 0)
+            self._entries[key] = size
+            self._ext[key] = ext
+            self._size += size
+        self._evict()
+
+    @staticmethod
+    def key(text: str, lang: str = "en", voice: dict = None) -> str:
+        payload = json.dumps([text, lang, voice or GTTS_VOICE], sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def path_for(self, key: str, ext: str = None) -> str:
+        return os.path.join(self.cache_dir, key + (ext or self._ext.get(key, ".mp3")))
+
+    def _voices(self, lang, voice):
+        if voice is not None:
+            return [voice]
+        voices = getattr(self.synthesize, "voices", None)
+        return (voices(lang) if voices else None) or [None]
+
+    def _find(self, text, lang, voice):
+        """Key of a cached rendering of text in any candidate voice, or None."""
+        for v in self._voices(lang, voice):
+            key = self.key(text, lang, v)
+            if key in self._entries:
+                return key
+        return None
+
+    def contains(self, text: str, lang: str = "en", voice: dict = None) -> bool:
+        """Whether text is cached, without touching LRU order or counters."""
+        with self._lock:
+            return self._find(text, lang, voice) is not None
+
+    def lookup(self, text: str, lang: str = "en", voice: dict = None):
+        """Return the cached file path or None, updating LRU order and counters."""
+        with self._lock:
+            key = self._find(text, lang, voice)
+            if key is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                tracing.count("tts_cache_hit")
+                path = self.path_for(key)
+                try:
+                    os.utime(path)
+                except OSError:
+                    pass
+                return path
+            self.misses += 1
+        tracing.count("tts_cache_miss")
+        return None
+
+    def put(self, key: str, data: bytes) -> str:
+        ext = audio_ext(data)
+        path = self.path_for(key, ext)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        with self._lock:
+            old_ext = self._ext.get(key)
+            if old_ext is not None and old_ext != ext:
+                try:
+                    os.remove(self.path_for(key, old_ext))
+                except OSError:
+                    pass
+            self._size -= self._entries.pop(key, 0)
+            self._entries[key] = len(data)
+            self._ext[key] = ext
+            self._size += len(data)
+            self._evict(keep=key)
+        return path
+
+    def _evict(self, keep=None):
+        while self._size > self.max_bytes and self._entries:
+            key, size = next(iter(self._entries.items()))
+            if key == keep and len(self._entries) == 1:
+                break
+            if key == keep:
+                self._entries.move_to_end(key)
+                continue
+            del self._entries[key]
+            self._size -= size
+            try:
+                os.remove(self.path_for(key, self._ext.pop(key, None)))
+            except OSError:
+                pass
+
+    def get_or_synthesize(self, text: str, lang: str = "en", voice: dict = None) -> str:
+        """Return a path to audio for text, synthesizing only on a cache miss."""
+        path = self.lookup(text, lang, voice)
+        if path:
+            return path
+        key = self.key(text, lang, voice)
+        with self._lock:
+            pending = self._inflight.get(key)
+            owner = pending is None
+            if owner:
+                pending = self._inflight[key] = threading.Event()
+        if not owner:
+            pending.wait()
+            with self._lock:
+                found = self._find(text, lang, voice)
+            if found is not None:
+                return self.path_for(found)
+            return self.get_or_synthesize(text, lang, voice)
+        try:
+            data = self.synthesize(text, lang, voice)
+            if isinstance(data, tuple):
+                data, used = data
+                return self.put(self.key(text, lang, used), data)
+            return self.put(key, data)
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            pending.set()
+
+    def load(self, text: str, lang: str = "en", voice: dict = None) -> bytes:
+        """Return the encoded audio for text as bytes, synthesizing on a miss."""
+        with open(self.get_or_synthesize(text, lang, voice), "rb") as f:
+            return f.read()
+
+    def prewarm(self, prompts: dict, extra=()):
+        """Render every PROMPTS entry (plus extra (text, lang) pairs) into the cache."""
+        phrases = [(text, lang) for by_lang in prompts.values() for lang, text in by_lang.items()]
+        phrases.extend(extra)
+        for text, lang in phrases:
+            if self.contains(text, lang):
+                continue
+            try:
+                self.get_or_synthesize(text, lang)
+            except Exception as e:
+                print(f"[TTS cache prewarm error: {e}]")
+
+    def prewarm_async(self, prompts: dict, extra=()):
+        t = threading.Thread(target=self.prewarm, args=(prompts, extra), daemon=True)
+        t.start()
+        return t
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries), "bytes": self._size}
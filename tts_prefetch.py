@@ -0,0 +1,104 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import tracing
+
+
+class TTSPrefetcher:
+    """Renders prompts that are likely to be spoken next and hands their audio over in memory.
+
+    prefetch() queues (text, lang) pairs on background workers; take() pops a prefetched
+    clip (waiting if its render is already running) or returns None so the caller renders
+    it as usual. A render still queued behind other prefetches is cancelled instead of
+    waited for (counted as a miss). Clips never taken, whether evicted past max_entries or
+    left at close(), are counted as wasted.
+    """
+
+    def __init__(self, cache, workers=2, max_entries=32):
+        self.cache = cache
+        self.max_entries = max_entries
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tts-prefetch")
+        self._pending = OrderedDict()   # (text, lang) -> Future of (audio bytes, render seconds)
+        self._lock = threading.Lock()
+        self.scheduled = 0
+        self.hits = 0
+        self.late_hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.wasted = 0
+        self.hidden_s = 0.0
+        self.wasted_s = 0.0
+
+    def _render(self, text, lang):
+        t0 = time.perf_counter()
+        data = self.cache.load(text, lang)
+        return data, time.perf_counter() - t0
+
+    def prefetch(self, items):
+        """Start rendering each (text, lang) pair not already queued, in order."""
+        with self._lock:
+            for text, lang in items:
+                key = (text, lang)
+                if not text or key in self._pending:
+                    continue
+                self._pending[key] = self._pool.submit(self._render, text, lang)
+                self.scheduled += 1
+            while len(self._pending) > self.max_entries:
+                _, future = self._pending.popitem(last=False)
+                self._discard(future)
+
+    def _discard(self, future):
+        self.wasted += 1
+        if future.done() and not future.exception():
+            self.wasted_s += future.result()[1]
+        else:
+            future.cancel()
+
+    def take(self, text, lang="en"):
+        """Audio bytes for text if it was prefetched, else None."""
+        with self._lock:
+            future = self._pending.pop((text, lang), None)
+        if future is not None and future.cancel():
+            future = None      # not started: rendering inline beats waiting behind unrelated prefetches
+        if future is None:
+            self.misses += 1
+            tracing.count("tts_prefetch_miss")
+            return None
+        if future.done():
+            self.hits += 1
+        else:
+            self.late_hits += 1
+        t0 = time.perf_counter()
+        try:
+            data, render_s = future.result()
+        except Exception as e:
+            self.errors += 1
+            print(f"[TTS prefetch error: {e}]")
+            return None
+        # A late hit only hides the part of the render that ran before it was needed.
+        self.hidden_s += max(0.0, render_s - (time.perf_counter() - t0))
+        tracing.count("tts_prefetch_hit")
+        return data
+
+    def close(self):
+        with self._lock:
+            for future in self._pending.values():
+                self._discard(future)
+            self._pending.clear()
+        self._pool.shutdown(wait=False)
+
+    def stats(self) -> dict:
+        taken = self.hits + self.late_hits
+        return {
+            "scheduled": self.scheduled,
+            "hits": self.hits,
+            "late_hits": self.late_hits,
+            "misses": self.misses,
+            "hit_rate": round(taken / (taken + self.misses), 3) if taken + self.misses else None,
+            "wasted": self.wasted,
+            "wasted_render_ms": round(self.wasted_s * 1000, 1),
+            "render_ms_hidden": round(self.hidden_s * 1000, 1),
+            "errors": self.errors,
+        }
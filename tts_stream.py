@@ -0,0 +1,91 @@
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+import tracing
+
+# Chunks shorter than this are merged into a neighbour: very short clips sound clipped and
+# each one pays the synthesizer's fixed per-request cost.
+MIN_CHUNK_CHARS = int(os.environ.get("OXLAND_TTS_MIN_CHUNK", 12))
+# Sentences longer than this are also split at clause punctuation.
+CLAUSE_SPLIT_CHARS = int(os.environ.get("OXLAND_TTS_CLAUSE_SPLIT", 60))
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+|(?<=[।॥])\s*")
+_CLAUSE_END = re.compile(r"(?<=[,;:])\s+")
+
+
+def _merge_short(pieces, min_chars):
+    out = []
+    for piece in pieces:
+        if out and (len(out[-1]) < min_chars or len(piece) < min_chars):
+            out[-1] = f"{out[-1]} {piece}"
+        else:
+            out.append(piece)
+    return out
+
+
+def split_chunks(text: str, min_chars=MIN_CHUNK_CHARS, clause_chars=CLAUSE_SPLIT_CHARS) -> list:
+    """Split text at sentence ends (. ! ? and the Devanagari danda) and, in long sentences, at , ; :"""
+    pieces = []
+    for sentence in _SENTENCE_END.split(text.strip()):
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+        if len(sentence) > clause_chars:
+            pieces.extend(_merge_short([c.strip() for c in _CLAUSE_END.split(sentence) if c.strip()], min_chars))
+        else:
+            pieces.append(sentence)
+    return _merge_short(pieces, min_chars)
+
+
+class StreamingSpeaker:
+    """Speaks text chunk by chunk so playback starts once the first chunk is rendered.
+
+    Chunks render ahead on a small pool (each through the TTS cache, so repeated sentences
+    hit it) and are fed to a player stream in order; the player queues each one behind
+    the chunk that is playing. Text that is cached whole, or is a single chunk, is played
+    as one clip.
+    """
+
+    def __init__(self, cache, player, workers=2):
+        self.cache = cache
+        self.player = player
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tts-stream")
+        self._feeder = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tts-feed")
+
+    def speak(self, text: str, lang: str = "en"):
+        """Start speaking text and return its handle once the first audio is ready to play."""
+        chunks = split_chunks(text)
+        if len(chunks) < 2 or self.cache.contains(text, lang):
+            return self.player.play(self.cache.load(text, lang))
+        tracing.annotate(tts_chunks=len(chunks))
+        futures = [self._pool.submit(self.cache.load, chunk, lang) for chunk in chunks]
+        try:
+            first = futures[0].result()
+        except Exception:
+            for future in futures:
+                future.cancel()
+            raise
+        handle = self.player.play_stream()
+        handle.feed(first)
+        self._feeder.submit(self._feed, handle, futures[1:])
+        return handle
+
+    @staticmethod
+    def _feed(handle, futures):
+        try:
+            for future in futures:
+                if handle.cancelled:
+                    break
+                handle.feed(future.result())
+        except Exception as e:
+            handle.error = e
+            print(f"[TTS error: {e}]")
+        finally:
+            for future in futures:
+                future.cancel()
+            handle.end()
+
+    def close(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self._feeder.shutdown(wait=False)
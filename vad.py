@@ -0,0 +1,379 @@
+import collections
+import contextlib
+import os
+import queue
+import threading
+import time
+import wave
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+FRAME_MS = 30
+BLOCK_MS = 30
+
+
+# ------------------ Voice activity detection ------------------
+def frame_energy_db(samples: np.ndarray, frame_len: int) -> np.ndarray:
+    """Per-frame energy in dBFS for a 1-D int16 or [-1, 1] float buffer (trailing partial frame dropped)."""
+    n = len(samples) // frame_len
+    if n == 0:
+        return np.empty(0, dtype=np.float64)
+    frames = samples[: n * frame_len].reshape(n, frame_len)
+    if frames.dtype == np.int16:
+        frames = frames / 32768.0
+    power = np.einsum("ij,ij->i", frames, frames, dtype=np.float64) / frame_len
+    return 10.0 * np.log10(power + 1e-12)
+
+
+class EnergyVAD:
+    """Adaptive energy detector: speech is anything margin_db above the tracked noise floor.
+
+    The floor is seeded from the first seed_ms of audio (no frame counts as speech until
+    then; the endpointer's pre-roll keeps them) and never sits below a low percentile of
+    the last window_ms, so steady noise louder than the initial guess raises it.
+    """
+
+    def __init__(self, min_threshold_db=-50.0, margin_db=12.0, floor_alpha=0.05, initial_floor_db=-60.0, bias=None,
+                 frame_ms=FRAME_MS, seed_ms=300, window_ms=3000, floor_percentile=10):
+        self.min_threshold_db = min_threshold_db
+        self.margin_db = margin_db
+        self.floor_alpha = floor_alpha
+        self.noise_floor_db = initial_floor_db
+        self.bias = bias  # optional callable -> extra dB, e.g. raised while our own speech is playing
+        self.seed_frames = max(1, seed_ms // frame_ms)
+        self.floor_percentile = floor_percentile
+        self._recent = collections.deque(maxlen=max(self.seed_frames, window_ms // frame_ms))
+        self._seeded = False
+
+    @property
+    def threshold_db(self) -> float:
+        threshold = max(self.min_threshold_db, self.noise_floor_db + self.margin_db)
+        return threshold + self.bias() if self.bias else threshold
+
+    def classify(self, energies_db: np.ndarray) -> np.ndarray:
+        self._recent.extend(energies_db.tolist())
+        if not self._seeded:
+            if len(self._recent) < self.seed_frames:
+                return np.zeros(len(energies_db), dtype=bool)
+            self._seeded = True
+            self.noise_floor_db = float(np.percentile(self._recent, self.floor_percentile))
+        speech = energies_db > self.threshold_db
+        quiet = energies_db[~speech]
+        if quiet.size:
+            # Only non-speech frames pull the floor along, so a long utterance can't raise it.
+            self.noise_floor_db += self.floor_alpha * (float(quiet.mean()) - self.noise_floor_db)
+        # Noise that is louder than the floor never counts as quiet; the pauses between
+        # words keep this percentile below speech level.
+        low = float(np.percentile(self._recent, self.floor_percentile))
+        if low > self.noise_floor_db:
+            self.noise_floor_db = low
+        return speech
+
+
+# ------------------ Buffers ------------------
+def as_float32(block: np.ndarray) -> np.ndarray:
+    """[-1, 1] float32 view of a block; int16 blocks (WAV, older callers) are converted once."""
+    block = np.asarray(block).reshape(-1)
+    if block.dtype == np.int16:
+        return np.multiply(block, 1.0 / 32768.0, dtype=np.float32)
+    return block.astype(np.float32, copy=False)
+
+
+def normalize_audio(audio: np.ndarray, target_db=-20.0, peak=0.99) -> np.ndarray:
+    """Scale float32 audio in place to target_db RMS, limited so no sample exceeds peak."""
+    if audio.size == 0:
+        return audio
+    # float64 accumulation: squaring int16 overflowed, and long float32 sums lose precision.
+    rms = float(np.sqrt(np.einsum("i,i->", audio, audio, dtype=np.float64) / audio.size))
+    gain = 10 ** (target_db / 20) / (rms + 1e-9)
+    top = max(float(audio.max()), -float(audio.min()))
+    if top * gain > peak:
+        gain = peak / top
+    audio *= np.float32(gain)
+    return audio
+
+
+def to_pcm16(audio: np.ndarray) -> np.ndarray:
+    """int16 copy of [-1, 1] float audio for Vosk: one allocation, no float temporaries."""
+    out = np.empty(audio.shape, dtype=np.int16)
+    np.multiply(audio, 32767.0, out=out, casting="unsafe")
+    return out
+
+
+# ------------------ Endpointing ------------------
+class Endpointer:
+    """Streaming endpointer: feed blocks, get the utterance once the speaker stops.
+
+    Frames are copied into one float32 buffer sized for max_duration, allocated once;
+    audio() is a view of it, valid until the next reset().
+    """
+
+    def __init__(self, samplerate=SAMPLE_RATE, frame_ms=FRAME_MS, pre_roll_ms=300, hangover_ms=600,
+                 min_speech_ms=90, max_duration=8.0, start_timeout=6.0, vad=None, on_speech_start=None):
+        self.samplerate = samplerate
+        self.frame_len = samplerate * frame_ms // 1000
+        self.pre_roll_frames = max(1, pre_roll_ms // frame_ms)
+        self.hangover_frames = max(1, hangover_ms // frame_ms)
+        self.min_speech_frames = max(1, min_speech_ms // frame_ms)
+        self.max_frames = int(max_duration * 1000 / frame_ms)
+        self.start_timeout_frames = int(start_timeout * 1000 / frame_ms) if start_timeout else None
+        self.vad = vad or EnergyVAD()
+        self.on_speech_start = on_speech_start
+        self._buf = np.empty((self.max_frames + self.pre_roll_frames) * self.frame_len, dtype=np.float32)
+        self.reset()
+
+    def reset(self):
+        self._pending = np.empty(0, dtype=np.float32)
+        self._pre_roll = collections.deque(maxlen=self.pre_roll_frames)
+        self._n = 0
+        self._triggered = False
+        self._speech_run = 0
+        self._silence_run = 0
+        self._seen = 0
+        self.done = False
+        self.timed_out = False
+
+    def _append(self, frame):
+        self._buf[self._n:self._n + self.frame_len] = frame
+        self._n += self.frame_len
+
+    def feed(self, block: np.ndarray) -> bool:
+        """Consume a block of float32 (or int16) samples; returns True once the utterance is complete."""
+        if self.done:
+            return True
+        block = as_float32(block)
+        buf = np.concatenate((self._pending, block)) if self._pending.size else block
+        n = len(buf) // self.frame_len
+        self._pending = buf[n * self.frame_len:].copy()
+        if n == 0:
+            return False
+        frames = buf[: n * self.frame_len].reshape(n, self.frame_len)
+        speech = self.vad.classify(frame_energy_db(frames.reshape(-1), self.frame_len))
+        for frame, is_speech in zip(frames, speech):
+            self._seen += 1
+            if not self._triggered:
+                self._pre_roll.append(frame)
+                self._speech_run = self._speech_run + 1 if is_speech else 0
+                if self._speech_run >= self.min_speech_frames:
+                    self._triggered = True
+                    for pre in self._pre_roll:
+                        self._append(pre)
+                    self._pre_roll.clear()
+                    if self.on_speech_start:
+                        self.on_speech_start()
+                elif self.start_timeout_frames and self._seen >= self.start_timeout_frames:
+                    self.done = self.timed_out = True
+                    return True
+                continue
+            self._append(frame)
+            self._silence_run = 0 if is_speech else self._silence_run + 1
+            if self._silence_run >= self.hangover_frames or self._n >= self.max_frames * self.frame_len:
+                self.done = True
+                return True
+        return False
+
+    def audio(self) -> np.ndarray:
+        return self._buf[:self._n]
+
+    @property
+    def triggered(self) -> bool:
+        return self._triggered
+
+
+# ------------------ Sources ------------------
+class MicSource:
+    """Live microphone via a sounddevice.InputStream callback, captured as float32."""
+
+    def __init__(self, samplerate=SAMPLE_RATE, block_ms=BLOCK_MS, device=None):
+        self.samplerate = samplerate
+        self.blocksize = samplerate * block_ms // 1000
+        self.device = device
+        self._queue = queue.Queue()
+        self._stream = None
+
+    def _callback(self, indata, frames, time_info, status):
+        self._queue.put(indata[:, 0].copy())
+
+    def __enter__(self):
+        import sounddevice as sd
+
+        self._queue = queue.Queue()     # nothing left over from an earlier open
+        self._stream = sd.InputStream(samplerate=self.samplerate, blocksize=self.blocksize, channels=1,
+                                      dtype="float32", callback=self._callback, device=self.device)
+        self._stream.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stream.stop()
+        self._stream.close()
+        self._stream = None
+
+    def blocks(self):
+        while True:
+            yield self._queue.get()
+
+
+class WavSource:
+    """16-bit mono WAV file replayed block by block, optionally in real time."""
+
+    def __init__(self, path, block_ms=BLOCK_MS, realtime=False):
+        self.path = path
+        self.block_ms = block_ms
+        self.realtime = realtime
+        with wave.open(path, "rb") as w:
+            if w.getsampwidth() != 2 or w.getnchannels() != 1:
+                raise ValueError(f"{path}: expected 16-bit mono WAV")
+            self.samplerate = w.getframerate()
+            pcm = np.frombuffer(w.readframes(w.getnframes()), dtype=np.int16)
+        self.samples = as_float32(pcm)
+        self.blocksize = self.samplerate * block_ms // 1000
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+    def blocks(self):
+        for i in range(0, len(self.samples), self.blocksize):
+            if self.realtime:
+                time.sleep(self.block_ms / 1000)
+            yield self.samples[i:i + self.blocksize]
+        # Pad with silence so the hangover can elapse at end of file.
+        silence = np.zeros(self.blocksize, dtype=np.float32)
+        while True:
+            yield silence
+
+
+def default_source(samplerate=SAMPLE_RATE):
+    """Microphone, unless OXLAND_AUDIO_SOURCE points at a WAV file for headless runs."""
+    path = os.environ.get("OXLAND_AUDIO_SOURCE")
+    if path:
+        return WavSource(path)
+    return MicSource(samplerate=samplerate)
+
+
+# ------------------ Background noise floor ------------------
+class NoiseFloorTracker:
+    """Rolling noise floor from the idle microphone, kept ready for speech_recognition.
+
+    A background thread reads the source and, whenever idle() holds, records per-frame
+    RMS. The floor is the median of the last window_s seconds; the threshold follows
+    speech_recognition's own rule (floor times dynamic_energy_ratio, in int16 RMS units)
+    and is pushed into the recognizer, so a listen can start without a calibration pause.
+    Inside paused() the tracker's stream is closed, so a listen can open the same device
+    even where it is exclusive (ALSA hw:).
+    """
+
+    def __init__(self, source=None, recognizer=None, idle=None, samplerate=SAMPLE_RATE, frame_ms=FRAME_MS,
+                 window_s=3.0, min_s=0.5, update_s=0.25, ratio=1.5, min_threshold=50.0, release_timeout_s=1.0):
+        self.source = source
+        self.recognizer = recognizer
+        self.idle = idle
+        self.ratio = ratio
+        self.min_threshold = min_threshold
+        self.frame_len = samplerate * frame_ms // 1000
+        self.min_frames = int(min_s * 1000 / frame_ms)
+        self.update_frames = max(1, int(update_s * 1000 / frame_ms))
+        self._ring = np.zeros(int(window_s * 1000 / frame_ms), dtype=np.float64)
+        self._i = 0
+        self._count = 0
+        self._since_update = 0
+        self.release_timeout_s = release_timeout_s
+        self._paused = 0
+        self._open = False
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._thread = None
+        self.floor = None
+        self.threshold = None
+        self.error = None
+
+    @property
+    def ready(self) -> bool:
+        return self.error is None and self.threshold is not None
+
+    def feed(self, block: np.ndarray):
+        """Add a block of idle audio (float32 or int16); partial trailing frames are dropped."""
+        rms = 32768.0 * 10.0 ** (frame_energy_db(as_float32(block), self.frame_len) / 20.0)
+        for value in rms:
+            self._ring[self._i] = value
+            self._i = (self._i + 1) % len(self._ring)
+        self._count = min(self._count + len(rms), len(self._ring))
+        self._since_update += len(rms)
+        if self._count >= self.min_frames and (self.threshold is None or self._since_update >= self.update_frames):
+            self._update()
+
+    def _update(self):
+        self._since_update = 0
+        self.floor = float(np.median(self._ring[:self._count]))
+        self.threshold = max(self.min_threshold, self.floor * self.ratio)
+        if self.recognizer is not None:
+            self.recognizer.energy_threshold = self.threshold
+
+    @contextlib.contextmanager
+    def paused(self):
+        """Release the microphone while the user is being recorded; returns once it is closed."""
+        with self._cond:
+            self._paused += 1
+            # The reader notices at its next block, one frame at most.
+            self._cond.wait_for(lambda: not self._open, self.release_timeout_s)
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._paused -= 1
+                self._cond.notify_all()
+
+    def _set_open(self, is_open):
+        with self._cond:
+            self._open = is_open
+            self._cond.notify_all()
+
+    def start(self, recognizer=None):
+        if recognizer is not None:
+            self.recognizer = recognizer
+        self._thread = threading.Thread(target=self._run, name="noise-floor", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        with self._cond:
+            self._cond.notify_all()
+
+    def _run(self):
+        source = self.source or default_source()
+        try:
+            while not self._stop.is_set():
+                with self._cond:
+                    self._cond.wait_for(lambda: not self._paused or self._stop.is_set())
+                if self._stop.is_set():
+                    return
+                try:
+                    with source:
+                        self._set_open(True)
+                        for block in source.blocks():
+                            if self._stop.is_set() or self._paused:
+                                break
+                            if self.idle is None or self.idle():
+                                self.feed(block)
+                finally:
+                    self._set_open(False)
+        except Exception as e:
+            self.error = e
+            print(f"[Noise floor tracker stopped: {e}]")
+
+
+def capture_utterance(source=None, stop_event=None, **endpointer_kwargs) -> np.ndarray:
+    """Block until one utterance has been spoken and return it as float32 (empty if none or stopped)."""
+    source = source or default_source()
+    endpointer = Endpointer(samplerate=source.samplerate, **endpointer_kwargs)
+    with source:
+        for block in source.blocks():
+            if stop_event is not None and stop_event.is_set():
+                return np.empty(0, dtype=np.float32)
+            if endpointer.feed(block):
+                break
+    return endpointer.audio()
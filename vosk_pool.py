@@ -0,0 +1,85 @@
+import contextlib
+import json
+import threading
+
+VOSK_MODEL_PATH = "vosk-model-small-en-us-0.15"
+SAMPLE_RATE = 16000
+
+
+class VoskPool:
+    """One shared Vosk model per path, handing out a clean KaldiRecognizer per utterance.
+
+    The acoustic model is loaded once and is read-only, so it is shared by every thread;
+    recognizers carry decoder state, so each is owned by one caller at a time and is
+    Reset() before it goes back to the idle list.
+    """
+
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, model_path=VOSK_MODEL_PATH, samplerate=SAMPLE_RATE, model=None, max_idle=4):
+        self.model_path = model_path
+        self.samplerate = samplerate
+        self.max_idle = max_idle
+        self._model = model
+        self._model_lock = threading.Lock()
+        self._idle = {}  # grammar key -> [KaldiRecognizer]
+        self._idle_lock = threading.Lock()
+
+    @classmethod
+    def shared(cls, model_path=VOSK_MODEL_PATH, samplerate=SAMPLE_RATE):
+        """Process-wide pool for model_path, created on first use."""
+        with cls._instances_lock:
+            key = (model_path, samplerate)
+            if key not in cls._instances:
+                cls._instances[key] = cls(model_path, samplerate)
+            return cls._instances[key]
+
+    @property
+    def model(self):
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    from vosk import Model as VoskModel
+                    self._model = VoskModel(self.model_path)
+        return self._model
+
+    def _new_recognizer(self, grammar=None):
+        from vosk import KaldiRecognizer
+        if grammar is None:
+            return KaldiRecognizer(self.model, self.samplerate)
+        return KaldiRecognizer(self.model, self.samplerate, grammar)
+
+    def acquire(self, grammar=None):
+        with self._idle_lock:
+            idle = self._idle.get(grammar)
+            if idle:
+                return idle.pop()
+        return self._new_recognizer(grammar)
+
+    def release(self, rec, grammar=None):
+        rec.Reset()
+        with self._idle_lock:
+            idle = self._idle.setdefault(grammar, [])
+            if len(idle) < self.max_idle:
+                idle.append(rec)
+
+    def discard(self, grammar):
+        """Drop idle recognizers built for a grammar that is no longer used."""
+        with self._idle_lock:
+            self._idle.pop(grammar, None)
+
+    @contextlib.contextmanager
+    def recognizer(self, grammar=None):
+        """Borrow a reset recognizer for one utterance."""
+        rec = self.acquire(grammar)
+        try:
+            yield rec
+        finally:
+            self.release(rec, grammar)
+
+    def transcribe(self, pcm16: bytes, grammar=None) -> str:
+        """Decode a complete int16 mono utterance and return its text."""
+        with self.recognizer(grammar) as rec:
+            rec.AcceptWaveform(pcm16)
+            return json.loads(rec.FinalResult()).get("text", "").strip()
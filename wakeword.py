@@ -0,0 +1,175 @@
+import collections
+import json
+import os
+
+import numpy as np
+
+from dialog import ASSISTANT_NAME
+from vad import FRAME_MS, SAMPLE_RATE, Endpointer, EnergyVAD, as_float32, default_source, frame_energy_db, to_pcm16
+
+# How the bundled English Vosk model can hear the assistant's name; the wake grammar is
+# these plus "[unk]", so everything else decodes as unknown. Words missing from the
+# model's vocabulary are dropped by Vosk with a warning.
+WAKE_PHRASES = tuple(p.strip() for p in os.environ.get(
+    "OXLAND_WAKE_PHRASES", f"{ASSISTANT_NAME.lower()},ox land,oaks land").split(",") if p.strip())
+# Lowest per-word confidence accepted; a partial hit below it counts as rejected.
+WAKE_MIN_CONF = float(os.environ.get("OXLAND_WAKE_MIN_CONF", 0.7))
+
+
+class WakeWordGate:
+    """Keeps the expensive recognizer idle until the wake word has been spoken.
+
+    An energy gate passes only voiced stretches, plus a pre-roll from a ring buffer of
+    recent frames, to a Vosk recognizer restricted to the wake phrases. Silence costs one
+    energy calculation per frame and background chatter a small-grammar decode. On a
+    confident hit the audio after the keyword is handed on together with the rest of the
+    utterance, read from the same open stream, so words said right after "Oxland" are
+    kept.
+    """
+
+    def __init__(self, pool, phrases=WAKE_PHRASES, min_conf=WAKE_MIN_CONF, samplerate=SAMPLE_RATE,
+                 frame_ms=FRAME_MS, pre_roll_ms=400, min_speech_ms=90, hangover_ms=450, max_segment_s=6.0,
+                 vad=None, muted=None):
+        self.pool = pool                # VoskPool, or a callable returning one (e.g. from a ModelRegistry)
+        self.phrases = [tuple(p.lower().split()) for p in phrases]
+        self.grammar = json.dumps([*phrases, "[unk]"])
+        self.min_conf = min_conf
+        self.samplerate = samplerate
+        self.frame_len = samplerate * frame_ms // 1000
+        self.pre_roll_frames = max(1, pre_roll_ms // frame_ms)
+        self.min_speech_frames = max(1, min_speech_ms // frame_ms)
+        self.hangover_frames = max(1, hangover_ms // frame_ms)
+        self.max_segment_frames = int(max_segment_s * 1000 / frame_ms)
+        self.vad = vad or EnergyVAD()
+        self.muted = muted              # callable -> True while our own speech is playing
+        self.frames = 0
+        self.decoded_frames = 0
+        self.segments = 0
+        self.wakes = 0
+        self.rejected = 0
+
+    def _pool(self):
+        return self.pool() if callable(self.pool) else self.pool
+
+    # ---- keyword spotting ----
+    def _hit(self, words):
+        """End time (seconds into the segment) of a confident wake phrase in Vosk's word list."""
+        tokens = [w.get("word", "") for w in words]
+        for phrase in self.phrases:
+            n = len(phrase)
+            for i in range(len(tokens) - n + 1):
+                if tuple(tokens[i:i + n]) == phrase:
+                    if min(w.get("conf", 0.0) for w in words[i:i + n]) >= self.min_conf:
+                        return words[i + n - 1]["end"]
+                    self.rejected += 1
+        return None
+
+    def _partial_hit(self, rec):
+        partial = json.loads(rec.PartialResult()).get("partial", "")
+        return any(" ".join(p) in partial for p in self.phrases)
+
+    def wait(self, blocks, stop_event=None):
+        """Consume blocks until the wake word; returns the float32 audio after it (None if stopped)."""
+        fl = self.frame_len
+        pending = np.empty(0, dtype=np.float32)
+        # Frames left over when a segment ended mid-block, already classified: the VAD's
+        # floor and hangover must not see them twice.
+        carried = np.empty((0, fl), dtype=np.float32)
+        carried_speech = np.empty(0, dtype=bool)
+        pre_roll = collections.deque(maxlen=self.pre_roll_frames)
+        segment = []                     # frames of the voiced stretch being decoded
+        origin = 0                       # index in segment where the recognizer's timeline starts
+        speech_run = silence_run = 0
+        pool = self._pool()
+        with pool.recognizer(self.grammar) as rec:
+            rec.SetWords(True)
+            for block in blocks:
+                if stop_event is not None and stop_event.is_set():
+                    return None
+                buf = np.concatenate((pending, as_float32(block))) if pending.size else as_float32(block)
+                n = len(buf) // fl
+                pending = buf[n * fl:].copy()
+                if n == 0 and not len(carried):
+                    continue
+                frames = buf[:n * fl].reshape(n, fl)
+                self.frames += n
+                if n == 0 or (self.muted is not None and self.muted()):
+                    speech = np.zeros(n, dtype=bool)
+                else:
+                    speech = self.vad.classify(frame_energy_db(frames.reshape(-1), fl))
+                if len(carried):
+                    frames, speech = np.concatenate((carried, frames)), np.concatenate((carried_speech, speech))
+                    carried, carried_speech = carried[:0], carried_speech[:0]
+                fed = len(segment)
+                ended = False
+                for i, (frame, is_speech) in enumerate(zip(frames, speech)):
+                    if not segment:
+                        pre_roll.append(frame)
+                        speech_run = speech_run + 1 if is_speech else 0
+                        if speech_run >= self.min_speech_frames:
+                            segment.extend(pre_roll)
+                            pre_roll.clear()
+                            silence_run = 0
+                            fed = origin = 0
+                            self.segments += 1
+                        continue
+                    segment.append(frame)
+                    silence_run = 0 if is_speech else silence_run + 1
+                    if silence_run >= self.hangover_frames or len(segment) >= self.max_segment_frames:
+                        # The rest of the block goes round again, with its classification,
+                        # once this stretch is settled.
+                        carried, carried_speech = frames[i + 1:], speech[i + 1:]
+                        ended = True
+                        break
+                if not segment:
+                    continue
+                new = segment[fed:]
+                self.decoded_frames += len(new)
+                rec.AcceptWaveform(to_pcm16(np.concatenate(new)).tobytes())
+                if not (ended or self._partial_hit(rec)):
+                    continue
+                end_s = self._hit(json.loads(rec.FinalResult()).get("result", []))
+                rec.Reset()
+                rec.SetWords(True)
+                if end_s is not None:
+                    self.wakes += 1
+                    audio = np.concatenate(segment[origin:])[int(end_s * self.samplerate):]
+                    return np.concatenate((audio, carried.reshape(-1), pending))
+                if ended:
+                    segment = []
+                    speech_run = 0
+                else:
+                    origin = len(segment)   # a rejected partial hit: decoding restarts here
+        return None
+
+    def capture_command(self, source=None, stop_event=None, on_wake=None, **endpointer_kwargs) -> np.ndarray:
+        """Wait for the wake word, then endpoint what is said after it on the same stream."""
+        source = source or default_source(self.samplerate)
+        endpointer_kwargs.setdefault("vad", self.vad)
+        endpointer = Endpointer(samplerate=source.samplerate, **endpointer_kwargs)
+        with source:
+            blocks = source.blocks()
+            tail = self.wait(blocks, stop_event)
+            if tail is None:
+                return np.empty(0, dtype=np.float32)
+            if on_wake:
+                on_wake()
+            if tail.size and endpointer.feed(tail):
+                return endpointer.audio()
+            for block in blocks:
+                if stop_event is not None and stop_event.is_set():
+                    return np.empty(0, dtype=np.float32)
+                if endpointer.feed(block):
+                    break
+        return endpointer.audio()
+
+    def stats(self) -> dict:
+        frame_s = self.frame_len / self.samplerate
+        return {
+            "audio_s": round(self.frames * frame_s, 1),
+            "decoded_s": round(self.decoded_frames * frame_s, 1),
+            "decoded_fraction": round(self.decoded_frames / self.frames, 4) if self.frames else None,
+            "segments": self.segments,
+            "wakes": self.wakes,
+            "rejected": self.rejected,
+        }
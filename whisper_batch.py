@@ -0,0 +1,211 @@
+import os
+import threading
+import time
+import zlib
+from collections import Counter, deque
+from concurrent.futures import Future
+
+import numpy as np
+
+from whisper_decode import BEAM_SIZE, MAX_COMPRESSION_RATIO, MIN_AVG_LOGPROB
+
+MAX_BATCH = int(os.environ.get("OXLAND_WHISPER_MAX_BATCH", 8))
+MAX_WAIT_MS = float(os.environ.get("OXLAND_WHISPER_MAX_WAIT_MS", 15))
+MAX_PROMPT_TOKENS = 223
+MAX_LENGTH = 448
+
+
+def tune_threads(cores=None):
+    """(inter-op workers, intra-op threads) for a core count.
+
+    Batching already keeps each forward pass busy, so few concurrent workers with
+    several threads each beat one thread per request.
+    """
+    cores = cores or os.cpu_count() or 1
+    inter = max(1, cores // 4)
+    return inter, max(1, cores // inter)
+
+
+class _Request:
+    __slots__ = ("audio", "language", "prompt", "deadline", "future", "enqueued")
+
+    def __init__(self, audio, language, prompt, deadline):
+        self.audio = audio
+        self.language = language
+        self.prompt = prompt
+        self.deadline = deadline
+        self.future = Future()
+        self.enqueued = time.monotonic()
+
+
+class WhisperScheduler:
+    """Micro-batches concurrent transcriptions through one faster-whisper model.
+
+    Requests wait up to max_wait_ms (never past their own deadline) for others with the
+    same language and prompt; each group is padded to Whisper's 30 s window and run
+    through CTranslate2's generate() as one greedy batch. Items whose greedy result
+    looks unreliable are re-run together with beam search, as whisper_decode does.
+    """
+
+    def __init__(self, model, max_batch=MAX_BATCH, max_wait_ms=MAX_WAIT_MS, workers=1):
+        self.model = model
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self._queue = deque()
+        self._cond = threading.Condition()
+        self._tokenizers = {}
+        self._closed = False
+        self._stats_lock = threading.Lock()
+        self.started = time.monotonic()
+        self.completed = 0
+        self.audio_seconds = 0.0
+        self.deadline_misses = 0
+        self.batch_sizes = Counter()
+        self.queue_depths = Counter()
+        self.waits = deque(maxlen=1000)
+        self._threads = [threading.Thread(target=self._run, name=f"whisper-batch-{i}", daemon=True)
+                         for i in range(workers)]
+        for t in self._threads:
+            t.start()
+
+    # ---- client side ----
+    def submit(self, audio, language="en", prompt=None, deadline_ms=None) -> Future:
+        """Queue a float32 16 kHz clip; the future resolves to (text, language, passes)."""
+        deadline = time.monotonic() + deadline_ms / 1000 if deadline_ms else None
+        req = _Request(audio, language, prompt, deadline)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("scheduler closed")
+            self._queue.append(req)
+            self._cond.notify()
+        return req.future
+
+    def transcribe(self, audio, language="en", prompt=None, deadline_ms=None):
+        return self.submit(audio, language, prompt, deadline_ms).result()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    # ---- batching ----
+    def _take_batch(self):
+        with self._cond:
+            while not self._queue and not self._closed:
+                self._cond.wait()
+            if not self._queue:
+                return None
+            first = self._queue[0]
+            key = (first.language, first.prompt)
+            close_at = first.enqueued + self.max_wait
+            while True:
+                same = sum(1 for r in self._queue if (r.language, r.prompt) == key)
+                deadlines = [r.deadline for r in self._queue if r.deadline is not None]
+                until = min([close_at, *deadlines])
+                remaining = until - time.monotonic()
+                if same >= self.max_batch or remaining <= 0 or self._closed:
+                    break
+                self._cond.wait(remaining)
+            self.queue_depths[len(self._queue)] += 1
+            batch, rest = [], deque()
+            for r in self._queue:
+                if len(batch) < self.max_batch and (r.language, r.prompt) == key:
+                    batch.append(r)
+                else:
+                    rest.append(r)
+            self._queue = rest
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._take_batch()
+            if batch is None:
+                return
+            start = time.monotonic()
+            with self._stats_lock:
+                for r in batch:
+                    self.waits.append(start - r.enqueued)
+                    if r.deadline is not None and start > r.deadline:
+                        self.deadline_misses += 1
+            try:
+                results = self._decode_batch(batch)
+            except Exception as e:
+                for r in batch:
+                    r.future.set_exception(e)
+                continue
+            with self._stats_lock:
+                self.batch_sizes[len(batch)] += 1
+                self.completed += len(batch)
+                self.audio_seconds += sum(len(r.audio) for r in batch) / 16000
+            for r, result in zip(batch, results):
+                r.future.set_result(result)
+
+    # ---- CTranslate2 ----
+    def _tokenizer(self, language):
+        tok = self._tokenizers.get(language)
+        if tok is None:
+            from faster_whisper.tokenizer import Tokenizer
+            tok = self._tokenizers[language] = Tokenizer(self.model.hf_tokenizer, self.model.model.is_multilingual,
+                                                         task="transcribe", language=language)
+        return tok
+
+    def _features(self, audio):
+        fe = self.model.feature_extractor
+        mel = fe(audio)[:, :fe.nb_max_frames]
+        if mel.shape[1] < fe.nb_max_frames:
+            mel = np.pad(mel, ((0, 0), (0, fe.nb_max_frames - mel.shape[1])))
+        return mel
+
+    def _prompt_tokens(self, tokenizer, prompt):
+        tokens = []
+        if prompt:
+            tokens = [tokenizer.sot_prev] + tokenizer.encode(" " + prompt.strip())[-MAX_PROMPT_TOKENS:]
+        return tokens + list(tokenizer.sot_sequence) + [tokenizer.no_timestamps]
+
+    def _generate(self, features, prompts, beam_size):
+        import ctranslate2
+        batch = ctranslate2.StorageView.from_array(np.ascontiguousarray(features, dtype=np.float32))
+        return self.model.model.generate(batch, prompts, beam_size=beam_size, max_length=MAX_LENGTH,
+                                         return_scores=True, suppress_blank=True, suppress_tokens=[-1])
+
+    def _decode_batch(self, batch):
+        language, prompt = batch[0].language, batch[0].prompt
+        tokenizer = self._tokenizer(language)
+        features = np.stack([self._features(r.audio) for r in batch])
+        prompts = [self._prompt_tokens(tokenizer, prompt)] * len(batch)
+        results = []
+        retry = []
+        for i, res in enumerate(self._generate(features, prompts, 1)):
+            text = tokenizer.decode([t for t in res.sequences_ids[0] if t < tokenizer.eot]).strip()
+            results.append((text, language, ["greedy"]))
+            if _unreliable(text, res.scores[0]):
+                retry.append(i)
+        if retry:
+            for i, res in zip(retry, self._generate(features[retry], [prompts[0]] * len(retry), BEAM_SIZE)):
+                text = tokenizer.decode([t for t in res.sequences_ids[0] if t < tokenizer.eot]).strip()
+                results[i] = (text or results[i][0], language, ["greedy", "beam"])
+        return results
+
+    # ---- reporting ----
+    def stats(self) -> dict:
+        with self._stats_lock:
+            elapsed = max(1e-9, time.monotonic() - self.started)
+            waits = sorted(self.waits)
+            return {
+                "queue_depth": len(self._queue),
+                "completed": self.completed,
+                "requests_per_s": round(self.completed / elapsed, 3),
+                "audio_s_per_s": round(self.audio_seconds / elapsed, 3),
+                "batch_sizes": dict(sorted(self.batch_sizes.items())),
+                "queue_depth_at_dispatch": dict(sorted(self.queue_depths.items())),
+                "wait_ms_p50": round(waits[len(waits) // 2] * 1000, 2) if waits else None,
+                "wait_ms_p95": round(waits[min(len(waits) - 1, int(len(waits) * 0.95))] * 1000, 2) if waits else None,
+                "deadline_misses": self.deadline_misses,
+            }
+
+
+def _unreliable(text, avg_logprob):
+    if not text:
+        return True
+    data = text.encode("utf-8")
+    return avg_logprob < MIN_AVG_LOGPROB or len(data) / len(zlib.compress(data)) > MAX_COMPRESSION_RATIO
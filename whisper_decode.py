@@ -0,0 +1,60 @@
+import os
+
+# "adaptive": greedy first, beam search only when the greedy pass looks unreliable.
+# "greedy" / "beam": always one or the other (beam is the old beam_size=5 behaviour).
+DECODE_MODE = os.environ.get("OXLAND_WHISPER_DECODE", "adaptive")
+BEAM_SIZE = 5
+# Escalate when the greedy pass scores below these (same signals Whisper's own
+# temperature fallback uses).
+MIN_AVG_LOGPROB = -0.6
+MAX_COMPRESSION_RATIO = 2.4
+BEAM_TEMPERATURES = [0.0, 0.2, 0.4, 0.6, 0.8, 1.0]
+# Whisper keeps only the last ~223 prompt tokens; stay well inside that.
+MAX_PROMPT_CHARS = 600
+
+
+def build_prompt(vocabulary, context=()):
+    """initial_prompt biasing the decoder towards vocabulary (route names, assistant name).
+
+    Context sentences (the prompts the assistant speaks) come first and the vocabulary
+    last, so if Whisper truncates the prompt it is the context that gets dropped.
+    """
+    terms = ", ".join(dict.fromkeys(v for v in vocabulary if v))
+    text = " ".join(c.strip() for c in context if c)
+    prompt = f"{text} {terms}." if text else f"{terms}."
+    if len(prompt) > MAX_PROMPT_CHARS:
+        prompt = prompt[-MAX_PROMPT_CHARS:].split(" ", 1)[-1]
+    return prompt
+
+
+def _run(model, audio, language, prompt, beam_size, temperature):
+    segments, info = model.transcribe(audio, language=language, beam_size=beam_size, temperature=temperature,
+                                      initial_prompt=prompt, condition_on_previous_text=False,
+                                      without_timestamps=True)
+    segments = list(segments)
+    text = " ".join(seg.text for seg in segments).strip()
+    return text, segments, info
+
+
+def _unreliable(text, segments):
+    if not text or not segments:
+        return True
+    # Weight by segment length so one short trailing segment cannot decide.
+    weights = [max(1, len(seg.text)) for seg in segments]
+    total = sum(weights)
+    avg_logprob = sum(seg.avg_logprob * w for seg, w in zip(segments, weights)) / total
+    compression = max(seg.compression_ratio for seg in segments)
+    return avg_logprob < MIN_AVG_LOGPROB or compression > MAX_COMPRESSION_RATIO
+
+
+def decode(model, audio, language=None, prompt=None, mode=None):
+    """Transcribe one command clip; returns (text, detected language, passes used)."""
+    mode = mode or DECODE_MODE
+    if mode == "beam":
+        text, _, info = _run(model, audio, language, prompt, BEAM_SIZE, BEAM_TEMPERATURES)
+        return text, info.language, ["beam"]
+    text, segments, info = _run(model, audio, language, prompt, 1, 0.0)
+    if mode == "greedy" or not _unreliable(text, segments):
+        return text, info.language, ["greedy"]
+    beam_text, _, info = _run(model, audio, language, prompt, BEAM_SIZE, BEAM_TEMPERATURES)
+    return beam_text or text, info.language, ["greedy", "beam"]
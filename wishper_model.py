@@ -1,19 +1,25 @@
-import json
 import webbrowser
-import tempfile
-import os
 import time
 import sys
+import threading
 import datetime
-import pygame
-import difflib
-from gtts import gTTS
 import speech_recognition as sr
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from tts_cache import TTSCache
+from tts_backends import TTSSelector
+from tts_stream import StreamingSpeaker
+from audio_player import PlaybackEngine, SpeechHandle
+from route_index import RouteIndex
+from routes_catalog import RoutesCatalog
+import tracing
+from tracing import traced
+from vad import NoiseFloorTracker
 
 try:
     import sounddevice as sd
     import numpy as np
-    from vosk import Model as VoskModel, KaldiRecognizer
+    from vosk_pool import VoskPool
+    import vosk  # noqa: F401
     HAS_VOSK = True
 except ImportError:
     HAS_VOSK = False
@@ -21,41 +27,59 @@ except ImportError:
 
 ASSISTANT_NAME = "Oxland"
 COMPANY_NAME = "Oxbow Intellect Private Limited"
-MODULES_FILE = r"C:\Users\ronia\Desktop\Voice_Command\modules_routes.json"
 
 
-def speak_and_print(text: str, tts_lang: str = "en"):
-    """Speak out loud and print to console safely."""
+tts_cache = TTSCache(synthesize=TTSSelector())
+player = PlaybackEngine()
+# Longer text plays sentence by sentence as it renders instead of after the whole string.
+streamer = StreamingSpeaker(tts_cache, player)
+# Tracks the idle room between turns instead of a calibration pause before every listen.
+noise_tracker = NoiseFloorTracker(idle=lambda: not player.busy)
+CALIBRATION_S = 0.8
+
+
+def speak(text: str, tts_lang: str = "en") -> SpeechHandle:
+    """Queue speech on the playback thread and return a handle without blocking."""
     print(f"Assistant: {text}")
     try:
-        tts = gTTS(text=text, lang=tts_lang)
-        fd, path = tempfile.mkstemp(suffix=".mp3")
-        os.close(fd)
-        tts.save(path)
+        with tracing.span("tts_synthesis", lang=tts_lang):
+            return streamer.speak(text, tts_lang)
+    except Exception as e:
+        print(f"[TTS error: {e}]")
+        return SpeechHandle.finished(e)
+
 
-        pygame.mixer.init()
-        pygame.mixer.music.load(path)
-        pygame.mixer.music.play()
-        while pygame.mixer.music.get_busy():
-            time.sleep(0.1)
+@traced("speak_and_print")
+def speak_and_print(text: str, tts_lang: str = "en"):
+    """Speak out loud and print to console safely."""
+    handle = speak(text, tts_lang)
+    with tracing.span("playback"):
+        handle.wait()
 
-        pygame.mixer.music.stop()
-        pygame.mixer.quit()
-        os.remove(path)
 
-    except Exception as e:
-        print(f"[TTS error: {e}]")
+def use_noise_floor(recognizer: sr.Recognizer, source):
+    """Take the background noise floor as the energy threshold; calibrate only until it is ready."""
+    if noise_tracker.ready:
+        recognizer.energy_threshold = noise_tracker.threshold
+        tracing.annotate(calibration_ms=0, energy_threshold=round(noise_tracker.threshold))
+        return
+    t0 = time.perf_counter()
+    recognizer.adjust_for_ambient_noise(source, duration=CALIBRATION_S)
+    tracing.annotate(calibration_ms=round((time.perf_counter() - t0) * 1000))
 
 
+@traced("listen_once")
 def listen_once(recognizer: sr.Recognizer, mic: sr.Microphone, language_code="en-US"):
     """Capture voice and return recognized text (Google STT)."""
-    with mic as source:
-        recognizer.adjust_for_ambient_noise(source, duration=0.8)
+    with tracing.span("capture"), noise_tracker.paused(), mic as source:
+        use_noise_floor(recognizer, source)
         print("🎙️ Listening...")
         audio = recognizer.listen(source)
+        tracing.annotate(audio_s=round(len(audio.frame_data) / (audio.sample_rate * audio.sample_width), 3))
     print("🔎 Processing...")
     try:
-        text = recognizer.recognize_google(audio, language=language_code)
+        with tracing.span("asr", backend="google", lang=language_code):
+            text = recognizer.recognize_google(audio, language=language_code)
         print(f"User: {text}")
         return text
     except sr.UnknownValueError:
@@ -66,22 +90,20 @@ def listen_once(recognizer: sr.Recognizer, mic: sr.Microphone, language_code="en
         return None
 
 
+@traced("listen_once_vosk")
 def listen_once_vosk(timeout=5):
     """Capture audio and return recognized text using Vosk (offline)."""
     if not HAS_VOSK:
         return None
 
     try:
-        model = VoskModel("vosk-model-small-en-us-0.15")
-        rec = KaldiRecognizer(model, 16000)
-
         print("🎙️ Listening (Vosk)...")
-        audio = sd.rec(int(timeout * 16000), samplerate=16000, channels=1, dtype="int16")
-        sd.wait()
+        with tracing.span("capture", audio_s=timeout), noise_tracker.paused():
+            audio = sd.rec(int(timeout * 16000), samplerate=16000, channels=1, dtype="int16")
+            sd.wait()
 
-        rec.AcceptWaveform(audio.tobytes())
-        result = json.loads(rec.Result())
-        text = result.get("text", "").strip()
+        with tracing.span("asr", backend="vosk"):
+            text = VoskPool.shared().transcribe(audio.tobytes())
         if text:
             print(f"User (Vosk): {text}")
             return text
@@ -90,6 +112,40 @@ def listen_once_vosk(timeout=5):
     return None
 
 
+def listen_language_choice(recognizer: sr.Recognizer, mic: sr.Microphone):
+    """Capture once, decode as en-US and hi-IN concurrently; first answer naming a language wins."""
+    with noise_tracker.paused(), mic as source:
+        use_noise_floor(recognizer, source)
+        print("🎙️ Listening...")
+        audio = recognizer.listen(source)
+    print("🔎 Processing...")
+
+    def recognize(language_code):
+        try:
+            return recognizer.recognize_google(audio, language=language_code)
+        except sr.UnknownValueError:
+            return None
+
+    # Don't wait on the slower request once one has answered.
+    pool = ThreadPoolExecutor(max_workers=2)
+    try:
+        futures = [pool.submit(recognize, code) for code in ("en-US", "hi-IN")]
+        for future in as_completed(futures):
+            try:
+                text = future.result()
+            except sr.RequestError as e:
+                print(f"Google STT error: {e}")
+                continue
+            chosen = detect_language_choice(text)
+            if chosen:
+                print(f"User: {text}")
+                return chosen
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+    print("Speech not understood.")
+    return None
+
+
 def detect_language_choice(text: str):
     """Detect if user said English or Hindi."""
     if not text:
@@ -139,22 +195,12 @@ def check_identity_question(text: str):
     return None
 
 
-def match_tab(user_text, tab_names):
-    """Fuzzy match user speech to a tab name."""
+@traced("match_tab")
+def match_tab(user_text, route_index: RouteIndex, cutoff=0.6):
+    """Match user speech to a tab name via the precompiled route index."""
     if not user_text:
         return None
-    user_text = user_text.lower()
-
-    for name in tab_names:
-        if name.lower() in user_text or user_text in name.lower():
-            return name
-
-    matches = difflib.get_close_matches(user_text, [t.lower() for t in tab_names], n=1, cutoff=0.6)
-    if matches:
-        for name in tab_names:
-            if name.lower() == matches[0]:
-                return name
-    return None
+    return route_index.best(user_text, cutoff=cutoff)
 
 
 PROMPTS = {
@@ -168,26 +214,29 @@ PROMPTS = {
 
 
 def main():
+    catalog = RoutesCatalog()  # OXLAND_ROUTES, else modules_routes.json next to the scripts
     try:
-        with open(MODULES_FILE, "r", encoding="utf-8") as f:
-            modules = json.load(f)
+        catalog.reload()
     except Exception as e:
         print(f"Error loading modules file: {e}")
         return
+    catalog.watch()
+    route_index = catalog.index
 
+    tts_cache.prewarm_async(PROMPTS, [("Please say English or Hindi.", "en")])
+    if HAS_VOSK:
+        # Load the fallback model once, in the background, instead of on every Google STT miss.
+        threading.Thread(target=lambda: VoskPool.shared().model, daemon=True).start()
     recognizer = sr.Recognizer()
     mic = sr.Microphone()
+    noise_tracker.start(recognizer)
 
     speak_and_print(PROMPTS["welcome"]["en"], "en")
     speak_and_print(PROMPTS["choose_lang"]["en"], "en")
 
     chosen = None
     while not chosen:
-        text = listen_once(recognizer, mic, "en-US")
-        chosen = detect_language_choice(text)
-        if not chosen:
-            text = listen_once(recognizer, mic, "hi-IN")
-            chosen = detect_language_choice(text)
+        chosen = listen_language_choice(recognizer, mic)
         if not chosen:
             speak_and_print("Please say English or Hindi.", "en")
 
@@ -210,8 +259,7 @@ def main():
     # --- Tab selection ---
     speak_and_print(PROMPTS["now_select_tab"][chosen], "hi" if chosen == "hi" else "en")
 
-    tab_names = list(modules.keys())
-    print("Available Tabs:", ", ".join(tab_names))
+    print("Available Tabs:", ", ".join(route_index.names()))
 
     selected_tab = None
     while not selected_tab:
@@ -234,11 +282,11 @@ def main():
             speak_and_print(identity_answer, "hi" if chosen == "hi" else "en")
             continue
 
-        selected_tab = match_tab(response, tab_names)
+        selected_tab = match_tab(response, route_index)
         if not selected_tab:
             speak_and_print("I didn't match that to any tab. Please say again.", "hi" if chosen == "hi" else "en")
 
-    url = modules.get(selected_tab)
+    url = catalog.url(selected_tab)
     if url:
         speak_and_print(PROMPTS["goodbye"][chosen], "hi" if chosen == "hi" else "en")
         print(f"Opening tab '{selected_tab}' -> {url}")